@@ -1,19 +1,65 @@
 import asyncio
+import importlib
 import logging
-from typing import Dict, Any, Optional
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
 
 from grok_team.event_bus import EventBus
+from grok_team.events import TaskFailed, evolve
+from grok_team.mailbox import Mailbox, OverflowReporter, CONTROL_MESSAGE_TYPES
+from grok_team.config import ACTOR_INBOX_MAXSIZE, ACTOR_INBOX_POLICY, ACTOR_PARKING_MAXSIZE, ACTOR_PARKING_TTL, LEADER_NAME
+from grok_team.session import make_address, split_address
 
 logger = logging.getLogger(__name__)
 
+
+def actor_class_path(cls: type) -> str:
+    """Importable 'module:QualName' reference to an actor class."""
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def resolve_actor_class(path: str) -> type:
+    """Inverse of `actor_class_path`."""
+    module_name, _, qualname = path.partition(":")
+    target = importlib.import_module(module_name)
+    for part in qualname.split("."):
+        target = getattr(target, part)
+    return target
+
+
 class Actor:
-    def __init__(self, name: str, event_bus: EventBus, start_budget: int = 10):
+    def __init__(self, name: str, event_bus: EventBus, start_budget: int = 10,
+                 inbox_maxsize: Optional[int] = None, inbox_policy: Optional[str] = None):
         self.name = name
+        # "Harper@conv-1" -> display name "Harper", session scope "conv-1"
+        self.display_name, self.scope = split_address(name)
+        self.session = None
         self.event_bus = event_bus
-        self.inbox = asyncio.Queue()
+        self.inbox = Mailbox(
+            maxsize=ACTOR_INBOX_MAXSIZE if inbox_maxsize is None else inbox_maxsize,
+            policy=inbox_policy or ACTOR_INBOX_POLICY,
+        )
+        self.inbox.on_overflow = OverflowReporter(event_bus, name, self.inbox)
+        self.metrics = event_bus.metrics
+        if self.metrics.enabled:
+            self.inbox.wait_histogram = self.metrics.histogram("actor.inbox_wait_seconds", name)
         self.running = False
         self._current_task: Optional[asyncio.Task] = None
+        # Set while a running step is being cancelled by a pre-emptive interrupt.
+        self.preempt_reason: Optional[str] = None
         self.budget = start_budget
+        # Last time this actor started or finished a message (idle detection)
+        self.last_active = time.monotonic()
+        # Work received while out of budget: (parked at, message), replayed on BudgetUpdate
+        self._parked: Deque[Tuple[float, Dict[str, Any]]] = deque()
+        self._exhaustion_reported = False
+        # State after the last successfully handled message; a supervised restart resumes from it
+        self.checkpoint: Optional[Dict[str, Any]] = None
+        # (message, parked_at) being handled when the actor crashed, redelivered once on restart
+        self.crashed_message: Optional[Tuple[Dict[str, Any], Optional[float]]] = None
+        # Called with the actor when it has drained its work (role pools steal work through it)
+        self.idle_hook: Optional[Callable[["Actor"], Any]] = None
 
         # Register inbox with the bus
         self.event_bus.register_actor(self.name, self.inbox)
@@ -21,75 +67,200 @@ class Actor:
     async def start(self):
         """Main event loop of the actor."""
         self.running = True
+        if self.checkpoint is None:
+            self.checkpoint = self.capture_checkpoint()
         logger.info(f"Actor '{self.name}' started with budget {self.budget}.")
         try:
             while self.running:
-                # Wait for next message
-                message = await self.inbox.get()
+                # Parked work is replayed (in order) once budget is back, ahead of
+                # new work but never ahead of pending control signals.
+                parked_at = None
+                if self.budget > 0 and self._parked and self.inbox.qsize() == self.inbox.work_size():
+                    parked_at, message = self._parked.popleft()
+                else:
+                    # Wait for next message (control signals are always served first)
+                    message = await self.inbox.get()
                 
                 # Check for control signals
                 msg_type = message.get("type")
                 
                 # 1. High Priority / System Signals (bypass budget check)
-                if msg_type == "InterruptSignal":
-                    await self._handle_interrupt(message)
-                    self.inbox.task_done()
-                    continue
-                elif msg_type == "PoisonPill":
-                    logger.info(f"Actor '{self.name}' received PoisonPill. Stopping.")
-                    break
-                elif msg_type == "BudgetUpdate":
-                    self.budget += int(message.get("amount", 0))
-                    logger.info(f"Actor '{self.name}' received budget update. New budget: {self.budget}")
-                    self.inbox.task_done()
-                    # If we were paused, this continues the loop
+                if msg_type in CONTROL_MESSAGE_TYPES:
+                    if not await self._handle_control(message):
+                        break
                     continue
 
-                # 2. Budget Check for Work Tasks
+                # 2. Budget Check for Work Tasks: park it until a BudgetUpdate arrives
                 if self.budget <= 0:
-                    logger.warning(f"Actor '{self.name}' budget exhausted. Pausing task {msg_type}.")
-                    # Publish exhaustion event ONLY ONCE per exhaustion state?
-                    # For now we publish and then maybe put message back or holding pattern.
-                    await self.event_bus.publish({
-                        "type": "BudgetExhausted",
-                        "actor": self.name,
-                        "content": "I have run out of budget. Please allocate more.",
-                        "target": "Grok" # Notify Leader
-                    })
-                    # Re-queue message to head? or just hold it?
-                    # Queue doesn't support push-back easily. 
-                    # We should probably process it but return error/status? or Wait?
-                    # Better: Put it back in a secondary "pending" queue or just wait for budget update.
-                    # Simple approach: Wait here until budget > 0?
-                    # But we need to process BudgetUpdate messages.
-                    # So we cannot block. We must re-queue this message? 
-                    # Actually, if we re-queue, we busy-loop.
-                    # Let's drop it or handle as "Failed due to budget".
-                    # Real OS: Context Switch / Suspend.
-                    # User-friendly: "I'm out of budget" response.
-                    await self.send(message.get("from"), {
-                        "type": "TaskFailed",
-                        "error": "BudgetExhausted"
-                    })
-                    self.inbox.task_done()
+                    await self._park(message, parked_at)
+                    if parked_at is None:
+                        self.inbox.task_done()
                     continue
 
-                # 3. Process Message
+                # 3. Process Message (control signals keep being served meanwhile)
+                started = time.perf_counter()
                 try:
-                    await self.handle_message(message)
+                    await self._process(message)
                 except Exception as e:
                     logger.error(f"Actor '{self.name}' failed to handle message {msg_type}: {e}", exc_info=True)
+                    self.crashed_message = (message, parked_at)
                     raise e 
+                finally:
+                    self.metrics.observe("actor.processing_seconds", (self.name, msg_type), time.perf_counter() - started)
                 
-                self.inbox.task_done()
+                self.checkpoint = self.capture_checkpoint()
+                self.last_active = time.monotonic()
+                if parked_at is None:
+                    self.inbox.task_done()
+                if self.budget <= 0 and self._parked:
+                    # Ran dry while replaying: the rest stays parked, tell the leader.
+                    await self._report_exhaustion()
+                elif self.idle_hook is not None and self.inbox.work_size() == 0 and not self._parked:
+                    self.idle_hook(self)
         finally:
+            if self._current_task is not None and not self._current_task.done():
+                self._current_task.cancel()
             self.running = False
             logger.info(f"Actor '{self.name}' stopped.")
 
+    async def _handle_control(self, message: Dict[str, Any]) -> bool:
+        """Applies a control signal. Returns False when the actor should stop."""
+        msg_type = message.get("type")
+        if msg_type == "InterruptSignal":
+            await self._handle_interrupt(message)
+            if message.get("preempt"):
+                self._preempt(message.get("content") or "Interrupted")
+            self.inbox.task_done()
+            return True
+        elif msg_type == "PoisonPill":
+            logger.info(f"Actor '{self.name}' received PoisonPill. Stopping.")
+            return False
+        elif msg_type == "BudgetUpdate":
+            self.budget += int(message.get("amount", 0))
+            logger.info(f"Actor '{self.name}' received budget update. New budget: {self.budget}")
+            self.inbox.task_done()
+            if self.budget > 0:
+                # Ends the exhaustion episode; parked work is replayed by the main loop.
+                self._exhaustion_reported = False
+                await self.expire_parked()
+                if self._parked:
+                    logger.info(f"Actor '{self.name}' resuming {len(self._parked)} parked messages.")
+            return True
+        return True
+
+    async def _park(self, message: Dict[str, Any], parked_at: Optional[float] = None):
+        """Holds work that arrived without budget. Replayed work that is parked again keeps its place."""
+        await self.expire_parked()
+        if parked_at is not None:
+            self._parked.appendleft((parked_at, message))
+        else:
+            if len(self._parked) >= ACTOR_PARKING_MAXSIZE:
+                _, evicted = self._parked.popleft()
+                await self._fail_parked(evicted, "BudgetExhausted: parking area full")
+            self._parked.append((time.monotonic(), message))
+        logger.warning(f"Actor '{self.name}' budget exhausted. Parked task {message.get('type')} ({len(self._parked)} parked).")
+
+        await self._report_exhaustion()
+
+    async def _report_exhaustion(self):
+        """Publishes BudgetExhausted once per exhaustion episode, not per message."""
+        if not self._exhaustion_reported:
+            self._exhaustion_reported = True
+            await self.event_bus.publish({
+                "type": "BudgetExhausted",
+                "actor": self.name,
+                "from": self.name,
+                "content": "I have run out of budget. Please allocate more.",
+                "parked": len(self._parked),
+                "target": self.resolve(LEADER_NAME) # Notify Leader
+            })
+
+    async def expire_parked(self) -> int:
+        """
+        Fails parked messages older than ACTOR_PARKING_TTL. Also run by the
+        Kernel's housekeeping, so expiry does not depend on further traffic.
+        Returns how many expired.
+        """
+        deadline = time.monotonic() - ACTOR_PARKING_TTL
+        expired = 0
+        while self._parked and self._parked[0][0] < deadline:
+            _, message = self._parked.popleft()
+            expired += 1
+            await self._fail_parked(message, "BudgetExhausted: expired while waiting for budget")
+        return expired
+
+    async def _fail_parked(self, message: Dict[str, Any], error: str):
+        logger.warning(f"Actor '{self.name}' dropping parked task {message.get('type')}: {error}")
+        if message.get("from"):
+            await self.send(message["from"], TaskFailed(correlation_id=message.get("correlation_id"), error=error))
+
+    async def _process(self, message: Dict[str, Any]):
+        """Runs handle_message as a task while still serving the control lane."""
+        task = asyncio.create_task(self.handle_message(message), name=f"ActorStep-{self.name}")
+        self._current_task = task
+        control = None
+        try:
+            while not task.done():
+                control = asyncio.ensure_future(self.inbox.get_control())
+                await asyncio.wait({task, control}, return_when=asyncio.FIRST_COMPLETED)
+                if not control.done():
+                    control.cancel()
+                    break
+                if not await self._handle_control(control.result()):
+                    # PoisonPill: let the current message finish, then stop.
+                    self.running = False
+            control = None
+            if task.cancelled():
+                if self.preempt_reason is None:
+                    raise asyncio.CancelledError()
+                logger.info(f"Actor '{self.name}' pre-empted: {self.preempt_reason}")
+                return
+            task.result()
+        finally:
+            if control is not None and not control.done():
+                control.cancel()
+            if not task.done():
+                task.cancel()
+            self._current_task = None
+            self.preempt_reason = None
+
+    def _preempt(self, reason: str):
+        """Cancels the message currently being handled, if any."""
+        task = self._current_task
+        if task is None or task.done():
+            return
+        logger.info(f"Actor '{self.name}' pre-empting current step: {reason}")
+        self.preempt_reason = reason
+        task.cancel()
+
     async def handle_message(self, message: Dict[str, Any]):
         """Override this method to implement actor logic."""
         pass
 
+    def load(self) -> int:
+        """Queued work plus the message being handled, if any."""
+        running = self._current_task is not None and not self._current_task.done()
+        return self.inbox.work_size() + len(self._parked) + (1 if running else 0)
+
+    def is_idle(self, idle_for: float) -> bool:
+        """Nothing queued, parked or running, and no message handled for `idle_for` seconds."""
+        if not self.inbox.empty() or self._parked:
+            return False
+        if self._current_task is not None and not self._current_task.done():
+            return False
+        return time.monotonic() - self.last_active >= idle_for
+
+    def capture_checkpoint(self) -> Dict[str, Any]:
+        """State a supervised restart goes back to. Subclasses add their own state."""
+        return {"budget": self.budget}
+
+    def restore_checkpoint(self, checkpoint: Dict[str, Any]):
+        self.budget = checkpoint.get("budget", self.budget)
+
+    def pending_work(self) -> List[Dict[str, Any]]:
+        """Work received but not handled yet: parked messages, then the inbox."""
+        return [message for _, message in self._parked] + self.inbox.peek_work()
+
     async def _handle_interrupt(self, message: Dict[str, Any]):
         """Handle graceful interruption."""
         logger.info(f"Actor '{self.name}' interrupted.")
@@ -97,10 +268,16 @@ class Actor:
         # For now, we just log.
 
     async def send(self, target: str, message: Dict[str, Any]):
-        """Convenience method to send a message to another actor."""
-        message["target"] = target
-        message["from"] = self.name
-        await self.event_bus.publish(message)
+        """Convenience method to send a message to another actor. The caller's message is not modified."""
+        await self.event_bus.publish(evolve(message, {"target": self.resolve(target), "from": self.name}))
+
+    def resolve(self, target: Optional[str]) -> Optional[str]:
+        """Plain names resolve to this actor's session peer when one is registered."""
+        if target and self.scope:
+            scoped = make_address(target, self.scope)
+            if self.event_bus.is_registered(scoped):
+                return scoped
+        return target
 
     def stop(self):
         """Signal the actor to stop gracefully."""
@@ -1,9 +1,9 @@
-
 import os
 import random
 import json
 import logging
 import asyncio
+import contextvars
 from typing import List, Dict, Any, Optional
 from openai import AsyncOpenAI
 from grok_team.config import (
@@ -11,32 +11,149 @@ from grok_team.config import (
     LEADER_NAME, 
     OPENAI_API_KEY, 
     OPENAI_BASE_URL, 
-    OPENAI_MODEL_NAME
+    OPENAI_MODEL_NAME,
+    SYSTEM_CALL_TIMEOUT,
+    AGENT_BATCH_MESSAGES,
+    AGENT_TOOL_CONCURRENCY,
+    EARLY_DISPATCH_TOOLS,
+    CONTEXT_COMPRESS_AT,
+    CONTEXT_WARN_AT,
+    LLM_STREAMING
 )
 from grok_team.prompts_loader import get_system_prompt
-from grok_team.tools import get_tools_for_agent
-from grok_team.actor import Actor
+from grok_team.tools import get_tools_for_agent, SYSTEM_TOOL_NAMES
+from grok_team.actor import Actor, actor_class_path
 from grok_team.event_bus import EventBus
+from grok_team.events import TaskSubmitted, TaskCompleted, TaskFailed, ToolUse, SystemCall, AssistantDelta
+from grok_team.session import display_name
+from grok_team.llm_governor import estimate_request_tokens, PRIORITY_INTERACTIVE, PRIORITY_NORMAL, PRIORITY_BACKGROUND
+from grok_team.tokens import counted, message_tokens, json_tokens, context_window
 
 logger = logging.getLogger(__name__)
 
+# Message types that can be merged into a single step when batching is on.
+BATCHABLE_MESSAGE_TYPES = {"TaskSubmitted", "TaskCompleted"}
+
+# Set while a tool runs concurrently with others: its results are collected here
+# and appended to the history in call order once the whole batch is done.
+_tool_results: contextvars.ContextVar[Optional[List[Dict[str, Any]]]] = contextvars.ContextVar("tool_results", default=None)
+
+
+class ArgumentsScanner:
+    """
+    Incremental scanner over a tool call's streamed `arguments`: reports when
+    the top-level JSON object is complete without re-parsing the prefix.
+    """
+    __slots__ = ("depth", "in_string", "escaped", "complete")
+
+    def __init__(self):
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.complete = False
+
+    def feed(self, text: str) -> bool:
+        """Consumes the next fragment; True once the object has closed."""
+        for char in text:
+            if self.complete:
+                break
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char in "{[":
+                self.depth += 1
+            elif char in "}]":
+                self.depth -= 1
+                self.complete = self.depth == 0
+        return self.complete
+
+
+SUMMARY_HEADER = "PREVIOUS CONTEXT (Summarized):\n"
+# Tool output beyond this is cut from the transcript sent for summarization
+TRANSCRIPT_MAX_CONTENT = 1500
+
+
+def summary_message(summary: str) -> Dict[str, Any]:
+    """The system message holding an agent's rolling summary (right after the system prompt)."""
+    return counted({"role": "system", "content": SUMMARY_HEADER + summary})
+
+
+def rolling_summary(messages: List[Dict[str, Any]]) -> Optional[str]:
+    """The rolling summary in `messages`, or None if the history has none yet."""
+    if len(messages) > 1 and messages[1].get("role") == "system":
+        content = messages[1].get("content") or ""
+        if content.startswith(SUMMARY_HEADER):
+            return content[len(SUMMARY_HEADER):]
+    return None
+
+
+def compact_transcript(messages: List[Dict[str, Any]]) -> str:
+    """One line per message ("role: content"), tool calls as name(arguments), long outputs cut."""
+    lines = []
+    for m in messages:
+        content = str(m.get("content") or "")
+        if len(content) > TRANSCRIPT_MAX_CONTENT:
+            content = content[:TRANSCRIPT_MAX_CONTENT] + " [...]"
+        role = m.get("role")
+        if role == "tool":
+            role = f"tool {m.get('name')}"
+        calls = ", ".join(f"{c['function']['name']}({c['function'].get('arguments') or ''})" for c in m.get("tool_calls") or [])
+        if calls:
+            content = f"{content} [calls {calls}]" if content else f"[calls {calls}]"
+        lines.append(f"{role}: {content}")
+    return "\n".join(lines)
+
+
+class StreamedCompletion:
+    """Assembled result of a streamed completion; `usage` lets the governor settle tokens."""
+    def __init__(self, message: Dict[str, Any], usage: Any = None):
+        self.message = message
+        self.usage = usage
+
+
+def _message_data(message) -> Dict[str, Any]:
+    """History entry for an OpenAI response message."""
+    msg_data = {"role": "assistant"}
+    if message.content:
+        msg_data["content"] = message.content
+    if message.tool_calls:
+        msg_data["tool_calls"] = [
+            {
+                "id": tc.id,
+                "type": tc.type,
+                "function": {
+                    "name": tc.function.name,
+                    "arguments": tc.function.arguments
+                }
+            } for tc in message.tool_calls
+        ]
+    return msg_data
+
 class Agent(Actor):
-    def __init__(self, name: str, event_bus: EventBus, system_prompt: Optional[str] = None, temperature: Optional[float] = None, start_budget: int = 10):
-        super().__init__(name, event_bus, start_budget)
+    def __init__(self, name: str, event_bus: EventBus, system_prompt: Optional[str] = None, temperature: Optional[float] = None, start_budget: int = 10,
+                 inbox_maxsize: Optional[int] = None, inbox_policy: Optional[str] = None, batch_messages: Optional[bool] = None,
+                 priority_class: Optional[str] = None):
+        super().__init__(name, event_bus, start_budget, inbox_maxsize=inbox_maxsize, inbox_policy=inbox_policy)
         
         if system_prompt:
             self.system_prompt = system_prompt
         else:
-            self.system_prompt = get_system_prompt(name, ALL_AGENT_NAMES)
+            self.system_prompt = get_system_prompt(self.display_name, ALL_AGENT_NAMES)
             
         self.messages: List[Dict[str, Any]] = [
-            {"role": "system", "content": self.system_prompt}
+            counted({"role": "system", "content": self.system_prompt})
         ]
         
         # Temperature Setting
         if temperature is not None:
              self.temperature = temperature
-        elif self.name == LEADER_NAME:
+        elif self.display_name == LEADER_NAME:
             self.temperature = 0.6
         else:
             self.temperature = round(random.uniform(0.0, 1.0), 2)
@@ -48,7 +165,33 @@ class Agent(Actor):
             base_url=OPENAI_BASE_URL
         )
         self.model = OPENAI_MODEL_NAME
+        self.context_window = context_window(self.model)
+        # Reply tokens reserved in every step request
+        self.max_tokens = 4096
+        self._tools_tokens: Optional[int] = None
+        # Background memory compression in progress, if any
+        self.compression_task: Optional[asyncio.Task] = None
+        # Set by the Kernel; coordinates LLM calls across all agents
+        self.governor = None
+        # LLM scheduling class: the leader answers users, so it goes first by default
+        if priority_class is None:
+            priority_class = PRIORITY_INTERACTIVE if self.display_name == LEADER_NAME else PRIORITY_NORMAL
+        self.priority_class = priority_class
         self.active_correlation_id: Optional[str] = None
+        # Correlation of the request the step loop is serving (request-scoped parameters).
+        self.step_correlation_id: Optional[str] = None
+        # Who the running step loop answers (a `wait` resumes answering them)
+        self.step_sender: Optional[str] = None
+        # Interrupt reason to surface to the model at the start of the next step.
+        self.pending_interrupt: Optional[str] = None
+        # Drain-and-merge: fold queued messages of the same request into the next step.
+        self.batch_messages = AGENT_BATCH_MESSAGES if batch_messages is None else batch_messages
+        # Stream completions, publishing AssistantDelta events as text arrives
+        self.stream_completions = LLM_STREAMING
+        # Bounds the tool calls of one step that run at the same time
+        self.tool_slots = asyncio.Semaphore(max(1, AGENT_TOOL_CONCURRENCY))
+        # tool_call_id -> (task, result buffer) of calls started while the step was streaming
+        self.early_tools: Dict[str, Any] = {}
 
     async def handle_message(self, message: Dict[str, Any]):
         """Event handler for the Agent logic."""
@@ -57,13 +200,9 @@ class Agent(Actor):
         correlation_id = message.get("correlation_id") or message.get("id")
         
         if msg_type == "TaskSubmitted":
-            content = message.get("content")
             sender = message.get("from")
-            conversation_id = message.get("conversation_id")
-            if conversation_id:
-                self.active_correlation_id = conversation_id
             # Archive user/sender message
-            self.add_message("user", f"[Message from {sender}]: {content}" if sender else content)
+            self._archive_message(message)
             
             # Execute step loop (think -> tool -> think ...)
             await self._run_step_loop(sender, correlation_id)
@@ -71,12 +210,16 @@ class Agent(Actor):
         elif msg_type == "TaskCompleted":
             # Handle reply from another agent
             sender = message.get("from")
-            content = message.get("content")
-            self.add_message("user", f"[Result from {sender}]: {content}")
+            self._archive_message(message)
             await self._run_step_loop(sender, correlation_id) # Continue thinking with new info and answer request initiator
 
+        elif msg_type == "WakeUp":
+            # A `wait` ended (timer, process exit or log match): resume the turn
+            self.add_message("user", f"[Wake-up: {message.get('reason')}]: {message.get('content')}")
+            await self._run_step_loop(message.get("reply_to"), correlation_id)
+
         elif msg_type == "SystemCallResult":
-            # Handle result of spawn/kill etc
+            # Handle results delivered as events (SystemCall published without request/reply)
             content = message.get("content")
             tool_call_id = message.get("tool_call_id")
             # System calls might need their own correlation tracking via tool_call_id
@@ -84,24 +227,63 @@ class Agent(Actor):
                 self.add_tool_call_result(tool_call_id, str(content), "system")
                 await self._run_step_loop(None, correlation_id)
 
+    def _archive_message(self, message: Dict[str, Any]):
+        """Appends an incoming TaskSubmitted/TaskCompleted to the conversation."""
+        sender = display_name(message.get("from"))
+        content = message.get("content")
+        if message.get("type") == "TaskCompleted":
+            self.add_message("user", f"[Result from {sender}]: {content}")
+            return
+        conversation_id = message.get("conversation_id")
+        if conversation_id:
+            self.active_correlation_id = conversation_id
+        self.add_message("user", f"[Message from {sender}]: {content}" if sender else content)
+
+    def _absorb_pending(self, correlation_id: Optional[str], sender: Optional[str] = None) -> int:
+        """
+        Batching mode: moves queued messages of the same request from the inbox
+        into the history so the next step sees all of them at once. Only replies
+        and follow-ups from `sender` are merged: the turn answers `sender` alone,
+        so a task from anyone else keeps its own turn (and its own answer).
+        """
+        if not self.batch_messages:
+            return 0
+        pending = self.inbox.take_work(
+            lambda m: m.get("type") in BATCHABLE_MESSAGE_TYPES and m.get("correlation_id") == correlation_id
+            and (m.get("type") != "TaskSubmitted" or m.get("from") == sender)
+        )
+        for message in pending:
+            self._archive_message(message)
+            self.inbox.task_done()
+        if pending:
+            self.metrics.inc("agent.batched_messages", self.name, len(pending))
+            logger.info(f"[{self.name}] Merged {len(pending)} queued messages into the next step")
+        return len(pending)
+
     async def _run_step_loop(self, initial_sender: Optional[str], correlation_id: Optional[str] = None):
         """Runs the Think -> Act -> Observe loop until final answer or stop."""
+        self.step_correlation_id = correlation_id
+        self.step_sender = initial_sender
         try:
             while True:
                 if correlation_id and await self._is_cancelled(correlation_id):
                     logger.info(f"[{self.name}] Stop loop for cancelled correlation {correlation_id}")
                     return
 
+                if self.pending_interrupt:
+                    self.add_message("system", f"INTERRUPT: {self.pending_interrupt}")
+                    self.pending_interrupt = None
+
+                self._absorb_pending(correlation_id, initial_sender)
                 response = await self.step()
 
                 # 1. If we have content, send it to sender (streaming logic replacement)
                 if response.get("content") and initial_sender:
-                    await self.send(initial_sender, {
-                        "type": "TaskCompleted",
-                        "from": self.name,
-                        "correlation_id": correlation_id,
-                        "content": response["content"]
-                    })
+                    await self.send(initial_sender, TaskCompleted(
+                        from_=self.name,
+                        correlation_id=correlation_id,
+                        content=response["content"]
+                    ))
 
                 # 2. Handle Tool Calls
                 tool_calls = response.get("tool_calls")
@@ -109,20 +291,89 @@ class Agent(Actor):
                     break
 
                 logger.info(f"[{self.name}] Executing {len(tool_calls)} tools...")
-                for tool_call in tool_calls:
-                    should_continue = await self._execute_tool(tool_call, correlation_id)
-                    if not should_continue:
-                        return
+                if not await self._execute_tools(tool_calls, correlation_id):
+                    return
+
+        except asyncio.CancelledError:
+            reason = self.preempt_reason
+            if reason is None:
+                raise
+            # Pre-empted by an interrupt: leave the history valid for the next step.
+            self._close_dangling_tool_calls(f"Cancelled: {reason}")
+            self.add_message("system", f"INTERRUPT: {reason}")
+            self.pending_interrupt = None
+            if initial_sender:
+                await self.send(initial_sender, TaskFailed(
+                    from_=self.name,
+                    correlation_id=correlation_id,
+                    error=f"Interrupted: {reason}"
+                ))
 
         except Exception as e:
             logger.error(f"Agent {self.name} step failed: {e}")
             if initial_sender:
-                await self.send(initial_sender, {
-                    "type": "TaskFailed",
-                    "from": self.name,
-                    "correlation_id": correlation_id,
-                    "error": str(e)
-                })
+                await self.send(initial_sender, TaskFailed(
+                    from_=self.name,
+                    correlation_id=correlation_id,
+                    error=str(e)
+                ))
+        finally:
+            self._cancel_early_tools()
+
+    def _dispatch_early(self, tool_call: Dict[str, Any]):
+        """Starts a complete tool call while the rest of the response is still streaming."""
+        if tool_call["function"]["name"] not in EARLY_DISPATCH_TOOLS or not tool_call["id"]:
+            return
+        call = {**tool_call, "function": dict(tool_call["function"])}
+        buffer: List[Dict[str, Any]] = []
+        task = asyncio.create_task(self._execute_buffered(call, self.step_correlation_id, buffer))
+        self.early_tools[call["id"]] = (task, buffer)
+        logger.info(f"[{self.name}] Started {call['function']['name']} early ({call['id']})")
+
+    def _cancel_early_tools(self):
+        """Drops tool calls started by a step whose response was never acted on."""
+        for task, _ in self.early_tools.values():
+            task.cancel()
+        self.early_tools.clear()
+
+    async def _execute_tools(self, tool_calls: List[Dict], correlation_id: Optional[str] = None) -> bool:
+        """
+        Runs the tool calls of one step concurrently (at most `tool_slots` at a
+        time) and appends their results in call order. Every call is executed,
+        even after one that ends the turn (chatroom_send, wait). Returns True if
+        the step loop should continue, i.e. every tool asked for it.
+        """
+        buffers: List[List[Dict[str, Any]]] = []
+        runs = []
+        for tool_call in tool_calls:
+            # Calls already started while the response streamed are awaited, not re-run
+            started = self.early_tools.pop(tool_call.get("id"), None)
+            if started is not None:
+                task, buffer = started
+                runs.append(task)
+            else:
+                buffer = []
+                runs.append(self._execute_buffered(tool_call, correlation_id, buffer))
+            buffers.append(buffer)
+        self._cancel_early_tools()
+        try:
+            outcomes = await asyncio.gather(*runs)
+        finally:
+            # Also on pre-emption: keep the results of the calls that finished
+            for buffer in buffers:
+                self.messages.extend(buffer)
+        return all(outcomes)
+
+    async def _execute_buffered(self, tool_call: Dict, correlation_id: Optional[str], buffer: List[Dict[str, Any]]) -> bool:
+        async with self.tool_slots:
+            _tool_results.set(buffer)
+            try:
+                return bool(await self._execute_tool(tool_call, correlation_id))
+            except Exception as e:
+                # e.g. malformed arguments: report it to the model instead of failing the batch
+                name = tool_call.get("function", {}).get("name")
+                self.add_tool_call_result(tool_call["id"], f"Error executing {name}: {e}", name)
+                return True
 
     async def _execute_tool(self, tool_call: Dict, correlation_id: Optional[str] = None) -> bool:
         func = tool_call["function"]
@@ -131,15 +382,14 @@ class Agent(Actor):
         tool_id = tool_call["id"]
         
         # Publish ToolUse event for Kernel monitoring (Loop Detection, etc.)
-        await self.event_bus.publish({
-            "type": "ToolUse",
-            "actor": self.name, # Legacy field
-            "from": self.name,
-            "correlation_id": correlation_id,
-            "tool": name,
-            "args": args,
-            "tool_call_id": tool_id
-        })
+        await self.event_bus.publish(ToolUse(
+            actor=self.name, # Legacy field
+            from_=self.name,
+            correlation_id=correlation_id,
+            tool=name,
+            args=args,
+            tool_call_id=tool_id
+        ))
         
         from grok_team.tools import execute_web_search, execute_python_run
         
@@ -149,12 +399,12 @@ class Agent(Actor):
             if name == "chatroom_send":
                 target = args.get("to")
                 msg = args.get("message")
-                payload = {
-                    "type": "TaskSubmitted", 
-                    "content": msg, 
-                    "from": self.name,
-                    "correlation_id": correlation_id
-                }
+                # One immutable envelope shared by every recipient
+                payload = TaskSubmitted(
+                    content=msg,
+                    from_=self.name,
+                    correlation_id=correlation_id
+                )
                 if isinstance(target, list):
                     for t in target:
                         await self.send(t, payload)
@@ -187,19 +437,40 @@ class Agent(Actor):
                 from grok_team.tools import stop_process
                 result = await stop_process(args["pid"])
                 
-            elif name in ["spawn_agent", "kill_agent", "list_agents", "allocate_budget"]:
-                # System calls delegated to Kernel via Bus
-                await self.event_bus.publish({
-                    "type": "SystemCall",
-                    "command": name,
-                    "args": args,
-                    "tool_call_id": tool_id,
-                    "sender": self.name,
-                    "from": self.name,
-                    "correlation_id": correlation_id
-                })
-                # Result will arrive as a separate SystemCallResult event and continue loop there.
-                return False
+            elif name == "wait":
+                if not args:
+                    # Plain wait: end the turn until a teammate replies
+                    self.add_tool_call_result(tool_id, "Waiting for replies.", name)
+                    return False
+                try:
+                    result = str(await self.event_bus.request(SystemCall(
+                        command="wait",
+                        args={**args, "reply_to": self.step_sender},
+                        tool_call_id=tool_id,
+                        sender=self.name,
+                        from_=self.name,
+                        correlation_id=correlation_id
+                    ), timeout=SYSTEM_CALL_TIMEOUT))
+                except asyncio.TimeoutError:
+                    result = "Error: system call wait timed out"
+                self.add_tool_call_result(tool_id, result, name)
+                # Sleeping: the kernel sends a WakeUp when the condition is met
+                return result.startswith("Error")
+
+            elif name in SYSTEM_TOOL_NAMES:
+                # System calls delegated to Kernel via Bus; the reply resumes this same loop.
+                try:
+                    result = await self.event_bus.request(SystemCall(
+                        command=name,
+                        args=args,
+                        tool_call_id=tool_id,
+                        sender=self.name,
+                        from_=self.name,
+                        correlation_id=correlation_id
+                    ), timeout=SYSTEM_CALL_TIMEOUT)
+                    result = str(result)
+                except asyncio.TimeoutError:
+                    result = f"Error: system call {name} timed out"
 
             elif name == "set_conversation_title":
                 title = (args.get("title") or "").strip()
@@ -229,6 +500,139 @@ class Agent(Actor):
         return True
             
 
+    async def _handle_interrupt(self, message: Dict[str, Any]):
+        """Remember the interrupt so the model sees it before its next step."""
+        await super()._handle_interrupt(message)
+        content = message.get("content")
+        if content:
+            self.pending_interrupt = content
+
+    def _close_dangling_tool_calls(self, content: str):
+        """Answers tool calls of the last assistant message that never got a result."""
+        for index in range(len(self.messages) - 1, 0, -1):
+            msg = self.messages[index]
+            if msg.get("role") != "assistant":
+                continue
+            if not msg.get("tool_calls"):
+                return
+            answered = {m.get("tool_call_id") for m in self.messages[index + 1:] if m.get("role") == "tool"}
+            for tool_call in msg["tool_calls"]:
+                if tool_call["id"] not in answered:
+                    self.messages.append({
+                        "role": "tool",
+                        "tool_call_id": tool_call["id"],
+                        "name": tool_call["function"]["name"],
+                        "content": content
+                    })
+            return
+
+    def export_state(self) -> Dict[str, Any]:
+        """Everything needed to rebuild this agent later (see `restore_state`)."""
+        return {
+            "class": actor_class_path(type(self)),
+            "name": self.name,
+            "system_prompt": self.system_prompt,
+            "temperature": self.temperature,
+            "priority_class": self.priority_class,
+            "batch_messages": self.batch_messages,
+            "budget": self.budget,
+            "messages": self.messages,
+            "active_correlation_id": self.active_correlation_id,
+        }
+
+    def restore_state(self, state: Dict[str, Any]):
+        """Applies a state produced by `export_state` to a freshly constructed agent."""
+        self.messages = list(state.get("messages") or self.messages)
+        self.budget = state.get("budget", self.budget)
+        self.active_correlation_id = state.get("active_correlation_id")
+
+    def capture_checkpoint(self) -> Dict[str, Any]:
+        return {
+            "budget": self.budget,
+            "messages": list(self.messages),
+            "active_correlation_id": self.active_correlation_id,
+        }
+
+    def restore_checkpoint(self, checkpoint: Dict[str, Any]):
+        self.restore_state(checkpoint)
+
+    def replay_event(self, event: Dict[str, Any]):
+        """Applies a logged event to the conversation without reacting to it (recovery)."""
+        if event.get("type") not in BATCHABLE_MESSAGE_TYPES:
+            return
+        if event.get("target") == self.name:
+            self._archive_message(event)
+        elif event.get("from") == self.name and event.get("type") == "TaskCompleted":
+            self.add_message("assistant", event.get("content"))
+
+    async def _chat_completion(self, priority: Optional[str] = None, **request):
+        """chat.completions.create, routed through the kernel's LLM governor when attached."""
+        return await self._governed(lambda: self.client.chat.completions.create(**request), request, priority)
+
+    async def _governed(self, fn, request: Dict[str, Any], priority: Optional[str] = None):
+        """Runs `fn` (an LLM call for `request`) under the governor when attached, in the agent's class by default."""
+        if self.governor is None:
+            return await fn()
+        return await self.governor.call(
+            fn,
+            key=self.scope or self.name,  # fairness across conversations
+            estimated_tokens=estimate_request_tokens(request),
+            priority=priority or self.priority_class,
+        )
+
+    async def _streamed_completion(self, request: Dict[str, Any]) -> "StreamedCompletion":
+        """
+        Consumes a streamed completion, publishing each content piece as an
+        AssistantDelta, and assembles the assistant message (content and tool
+        calls) from the chunks.
+        """
+        response = await self.client.chat.completions.create(**request)
+        if hasattr(response, "choices"):
+            # The provider answered in one piece
+            return StreamedCompletion(_message_data(response.choices[0].message), getattr(response, "usage", None))
+
+        content: List[str] = []
+        tool_calls: Dict[int, Dict[str, Any]] = {}
+        scanners: Dict[int, ArgumentsScanner] = {}
+        usage = None
+        async for chunk in response:
+            usage = getattr(chunk, "usage", None) or usage
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta
+            if delta.content:
+                content.append(delta.content)
+                await self.event_bus.publish(AssistantDelta(
+                    from_=self.name,
+                    correlation_id=self.step_correlation_id,
+                    content=delta.content
+                ))
+            for piece in delta.tool_calls or []:
+                call = tool_calls.setdefault(piece.index, {"id": None, "type": "function", "function": {"name": "", "arguments": ""}})
+                if piece.id:
+                    call["id"] = piece.id
+                if piece.function is not None:
+                    call["function"]["name"] += piece.function.name or ""
+                    call["function"]["arguments"] += piece.function.arguments or ""
+                    scanner = scanners.setdefault(piece.index, ArgumentsScanner())
+                    if not scanner.complete and scanner.feed(piece.function.arguments or ""):
+                        self._dispatch_early(call)
+
+        msg_data = {"role": "assistant"}
+        if content:
+            msg_data["content"] = "".join(content)
+        if tool_calls:
+            msg_data["tool_calls"] = [tool_calls[index] for index in sorted(tool_calls)]
+        return StreamedCompletion(msg_data, usage)
+
+    def current_temperature(self) -> float:
+        """Temperature for the request being served: a request-scoped override, else the agent default."""
+        if self.session is not None:
+            override = self.session.temperature_for(self.display_name, self.step_correlation_id)
+            if override is not None:
+                return override
+        return self.temperature
+
     async def _is_cancelled(self, correlation_id: str) -> bool:
         from grok_team.server_runtime import CANCELLED_REQUESTS
         return correlation_id in CANCELLED_REQUESTS
@@ -237,7 +641,7 @@ class Agent(Actor):
         msg = {"role": role, "content": content}
         if name:
             msg["name"] = name
-        self.messages.append(msg)
+        self.messages.append(counted(msg))
     
     def add_tool_call_result(self, tool_call_id: str, content: str, name: str):
         # Auto-archive large outputs
@@ -257,13 +661,46 @@ class Agent(Actor):
             
             content = f"[Large Output Stored. Artifact ID: {artifact_id}. Use `read_artifact` to view.]\nPreview:\n{content[:200]}..."
 
-        self.messages.append({
+        results = _tool_results.get()
+        (self.messages if results is None else results).append(counted({
             "role": "tool",
             "tool_call_id": tool_call_id,
             "name": name,
             "content": content
-        })
+        }))
+
 
+    def context_tokens(self) -> int:
+        """Tokens of the current history. Messages are counted once, when first seen."""
+        total = 0
+        for index, msg in enumerate(self.messages):
+            msg = counted(msg)
+            self.messages[index] = msg
+            total += msg.tokens
+        return total
+
+    def prompt_budget(self) -> int:
+        """Prompt tokens a step may use: the context window minus the reply and the tool schemas."""
+        if self._tools_tokens is None:
+            self._tools_tokens = json_tokens(get_tools_for_agent(self.display_name == LEADER_NAME))
+        return self.context_window - self.max_tokens - self._tools_tokens
+
+    def _truncate_to_fit(self, limit: int) -> int:
+        """
+        Drops the oldest messages after the system prompt and rolling summary (never orphaning tool
+        results) until the history fits in `limit` tokens. Returns how many were dropped.
+        """
+        total = self.context_tokens()
+        start = end = self._history_start()
+        last = len(self.messages) - 1
+        while end < last and total > limit:
+            total -= message_tokens(self.messages[end])
+            end += 1
+        # Results whose call was dropped would be rejected by the API, even as the newest message
+        while end < len(self.messages) and self.messages[end].get("role") == "tool":
+            end += 1
+        del self.messages[start:end]
+        return end - start
 
     def _safe_tail_index(self, min_tail: int) -> int:
         """Find a split index that keeps the latest messages while preserving tool-call pairs."""
@@ -296,61 +733,73 @@ class Agent(Actor):
 
         return min(split_idx, len(self.messages))
 
-    async def compress_memory(self):
-        """Compresses history and generates reflection."""
-        if len(self.messages) < 15:
-            return
+    async def summarize_transcript(self, transcript: List[Dict[str, Any]], previous_summary: str = "") -> str:
+        """Summarizes `transcript` (chat messages), extending `previous_summary` if given."""
+        text = compact_transcript(transcript)
+        if previous_summary:
+            text = f"Summary so far:\n{previous_summary}\n\nLater messages:\n{text}"
+        # Summaries (memory compression, hydration) never hold up an answer
+        response = await self._chat_completion(
+            priority=PRIORITY_BACKGROUND,
+            model=self.model,
+            messages=[
+                {"role": "system", "content": "You are a memory manager. Summarize the key facts, decisions and open questions of this conversation, and the current plan (what is finished, what is next), in a few paragraphs."},
+                {"role": "user", "content": text},
+            ],
+        )
+        return response.choices[0].message.content or ""
 
-        logger.info(f"[{self.name}] Compressing memory...")
-        
+    def _history_start(self) -> int:
+        """Index of the first message after the system prompt and the rolling summary."""
+        return 2 if rolling_summary(self.messages) is not None else 1
+
+    def schedule_compression(self) -> Optional[asyncio.Task]:
+        """Starts `compress_memory` in the background unless a run is already in progress."""
+        if self.compression_task is None or self.compression_task.done():
+            self.compression_task = asyncio.create_task(self.compress_memory(), name=f"{self.name}-compress")
+        return self.compression_task
+
+    async def compress_memory(self) -> bool:
+        """
+        Folds the messages that fell out of the kept tail into the rolling
+        summary. The agent keeps working meanwhile; the new history is swapped
+        in only if the folded messages are still where they were. Returns True
+        if the history was compressed.
+        """
         # Keep System Prompt (0) and a safe tail that doesn't split tool-call pairs
-        preserve_tail = self._safe_tail_index(5)
-        to_compress = self.messages[1:preserve_tail]
-        keep = self.messages[preserve_tail:]
-        
-        if not to_compress:
-            return
+        start = self._history_start()
+        split = self._safe_tail_index(5)
+        evicted = self.messages[start:split]
+        if not evicted:
+            return False
 
-        # Prepare summarization prompt
-        text_to_compress = json.dumps(to_compress, indent=2)
-        summary_prompt = (
-            "Analyze the above conversation history.\n"
-            "1. Summarize the key facts and decisions derived so far.\n"
-            "2. REFLECTION: What is the current plan? What have we finished? What is next?\n"
-            "Output JSON: {\"summary\": \"...\", \"reflection\": \"...\"}"
-        )
-        
+        logger.info(f"[{self.name}] Compressing {len(evicted)} messages...")
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a memory manager."},
-                    {"role": "user", "content": f"History:\n{text_to_compress}\n\n{summary_prompt}"}
-                ],
-                response_format={"type": "json_object"}
-            )
-            result = json.loads(response.choices[0].message.content)
-            summary = result.get("summary", "")
-            reflection = result.get("reflection", "")
-            
-            # Reconstruct history
-            new_history = [self.messages[0]] # System Prompt
-            new_history.append({"role": "system", "content": f"PREVIOUS CONTEXT (Summarized):\n{summary}"})
-            new_history.append({"role": "system", "content": f"REFLECTION (Current Plan):\n{reflection}"})
-            new_history.extend(keep)
-            
-            self.messages = new_history
-            logger.info(f"[{self.name}] Memory compressed. History size: {len(self.messages)}")
-            
-            await self.event_bus.publish({
-                "type": "MemoryCompressed",
-                "actor": self.name,
-                "from": self.name,
-                "summary": summary[:100] + "..."
-            })
-            
+            summary = await self.summarize_transcript(evicted, rolling_summary(self.messages) or "")
         except Exception as e:
             logger.error(f"[{self.name}] Memory compression failed: {e}")
+            return False
+
+        # No awaits from here on: the check and the swap are atomic for this agent
+        current = self.messages[start:split]
+        if len(current) != len(evicted) or any(a is not b for a, b in zip(current, evicted)):
+            logger.info(f"[{self.name}] History changed during compression; discarding the summary.")
+            return False
+        self.messages = [self.messages[0], summary_message(summary), *self.messages[split:]]
+        logger.info(f"[{self.name}] Memory compressed. History size: {len(self.messages)}")
+
+        await self.event_bus.publish({
+            "type": "MemoryCompressed",
+            "actor": self.name,
+            "from": self.name,
+            "summary": summary[:100] + "..."
+        })
+        return True
+
+    def stop(self):
+        super().stop()
+        if self.compression_task is not None:
+            self.compression_task.cancel()
 
     async def step(self, extra_system_context: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -361,51 +810,57 @@ class Agent(Actor):
             return {"role": "assistant", "content": "Error: Budget exhausted."}
 
         # Check for context limit and compress if needed
-        if len(self.messages) > 20:
-             await self.compress_memory()
-
+        budget = self.prompt_budget()
+        if self.context_tokens() > CONTEXT_COMPRESS_AT * budget:
+             self.schedule_compression()
+
+        extra = counted({"role": "system", "content": extra_system_context}) if extra_system_context else None
+        limit = budget - (extra.tokens if extra else 0)
+        used = self.context_tokens()
+        if used > limit and self.compression_task is not None and not self.compression_task.done():
+            # Let the running compression make room rather than dropping what it is summarizing
+            await asyncio.shield(self.compression_task)
+            used = self.context_tokens()
+        if used > limit:
+            dropped = self._truncate_to_fit(limit)
+            used = self.context_tokens()
+            logger.warning(f"[{self.name}] Context overflow: dropped the {dropped} oldest messages ({used}/{limit} tokens).")
+            if used > limit:
+                raise ValueError(f"Context overflow: {used} prompt tokens exceed the {limit} available for {self.model}")
+        elif used > CONTEXT_WARN_AT * limit:
+             logger.warning(f"[{self.name}] CRITICAL: Context window dangerously full ({used}/{limit} tokens). Performance may degrade.")
+
+        # Charged only for a step that is actually sent
         self.budget -= 1
         logger.info(f"[{self.name}] Thinking... (Budget remaining: {self.budget})")
-        
-        if len(self.messages) > 40:
-             logger.warning(f"[{self.name}] CRITICAL: Context window dangerously full ({len(self.messages)} msgs). Performance may degrade.")
 
         try:
             request_messages = list(self.messages)
-            if extra_system_context:
-                request_messages.append({"role": "system", "content": extra_system_context})
+            if extra:
+                request_messages.append(extra)
 
-            response_obj = await self.client.chat.completions.create(
+            request = dict(
                 model=self.model,
                 messages=request_messages,
-                tools=get_tools_for_agent(self.name == LEADER_NAME),
+                tools=get_tools_for_agent(self.display_name == LEADER_NAME),
                 tool_choice="auto",
-                stream=False,
-                temperature=self.temperature,
-                max_tokens=4096
+                stream=self.stream_completions,
+                temperature=self.current_temperature(),
+                max_tokens=self.max_tokens
             )
-            
-            message = response_obj.choices[0].message
-            
-            # Store response
-            msg_data = {"role": "assistant"}
-            if message.content:
-                msg_data["content"] = message.content
-            if message.tool_calls:
-                msg_data["tool_calls"] = [
-                    {
-                        "id": tc.id,
-                        "type": tc.type,
-                        "function": {
-                            "name": tc.function.name,
-                            "arguments": tc.function.arguments
-                        }
-                    } for tc in message.tool_calls
-                ]
+            if self.stream_completions:
+                # The final chunk then reports usage, which settles the governor's token budget
+                request["stream_options"] = {"include_usage": True}
+                completion = await self._governed(lambda: self._streamed_completion(request), request)
+                msg_data = completion.message
+            else:
+                response_obj = await self._chat_completion(**request)
+                msg_data = _message_data(response_obj.choices[0].message)
+            msg_data = counted(msg_data)
             self.messages.append(msg_data)
 
-            if message.content:
-                logger.info(f"[{self.name}] Says: {message.content[:100]}...")
+            if msg_data.get("content"):
+                logger.info(f"[{self.name}] Says: {msg_data['content'][:100]}...")
 
             return msg_data
 
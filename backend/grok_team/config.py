@@ -1,4 +1,5 @@
 
+import json
 import os
 
 
@@ -22,10 +23,131 @@ AGENTS_START_PROMPT = os.path.join(PROMPTS_DIR, "agents_start.txt")
 ALL_PROMPT = os.path.join(PROMPTS_DIR, "all.txt")
 TOOLS_PROMPT = os.path.join(PROMPTS_DIR, "tools.txt")
 
+# Mailboxes / Backpressure
+# Work capacity of each actor inbox (0 = unbounded) and what happens when it is full:
+# block | drop_oldest | drop_newest | coalesce
+ACTOR_INBOX_MAXSIZE = int(os.getenv("ACTOR_INBOX_MAXSIZE", "1000"))
+ACTOR_INBOX_POLICY = os.getenv("ACTOR_INBOX_POLICY", "block")
+# Per-request SSE queue; dropping old thoughts beats stalling the agents on a slow client.
+SSE_QUEUE_MAXSIZE = int(os.getenv("SSE_QUEUE_MAXSIZE", "500"))
+SSE_QUEUE_POLICY = os.getenv("SSE_QUEUE_POLICY", "drop_oldest")
+
+# Work that reaches an actor with no budget is parked (up to this many messages,
+# each for at most this many seconds) and replayed once budget is allocated.
+ACTOR_PARKING_MAXSIZE = int(os.getenv("ACTOR_PARKING_MAXSIZE", "100"))
+ACTOR_PARKING_TTL = float(os.getenv("ACTOR_PARKING_TTL", "600"))
+
+# Conversation sessions: a session's agents are stopped after this many idle
+# seconds (checked every HOUSEKEEPING_INTERVAL seconds).
+SESSION_IDLE_TTL = float(os.getenv("SESSION_IDLE_TTL", "1800"))
+HOUSEKEEPING_INTERVAL = float(os.getenv("HOUSEKEEPING_INTERVAL", os.getenv("SESSION_SWEEP_INTERVAL", "60")))
+
+# Spawned agents idle for HIBERNATE_AFTER seconds are saved to HIBERNATION_DIR and
+# woken on their next message (0 disables hibernation).
+HIBERNATE_AFTER = float(os.getenv("HIBERNATE_AFTER", "600"))
+HIBERNATION_DIR = os.getenv("HIBERNATION_DIR", "data/hibernation")
+
+# Resuming a stored conversation: the leader gets the last HYDRATE_TAIL_MESSAGES
+# messages verbatim; older ones come from a cached summary.
+HYDRATE_TAIL_MESSAGES = int(os.getenv("HYDRATE_TAIL_MESSAGES", "20"))
+
+# Crashed actors are restarted from their last checkpoint ("one_for_one") or left
+# dead ("temporary"). More than SUPERVISOR_MAX_RESTARTS crashes within
+# SUPERVISOR_RESTART_WINDOW seconds gives up; restarts back off exponentially.
+SUPERVISOR_STRATEGY = os.getenv("SUPERVISOR_STRATEGY", "one_for_one")
+SUPERVISOR_MAX_RESTARTS = int(os.getenv("SUPERVISOR_MAX_RESTARTS", "5"))
+SUPERVISOR_RESTART_WINDOW = float(os.getenv("SUPERVISOR_RESTART_WINDOW", "60"))
+SUPERVISOR_BACKOFF_BASE = float(os.getenv("SUPERVISOR_BACKOFF_BASE", "0.01"))
+SUPERVISOR_BACKOFF_MAX = float(os.getenv("SUPERVISOR_BACKOFF_MAX", "5"))
+
+# Role pools (opt-in, e.g. ROLE_POOLS=Harper,Benjamin): work for these session roles goes to
+# the least-loaded member. Clones start with an empty history, so only stateless roles should
+# be pooled. A pool clones its role when every member has POOL_SCALE_UP_DEPTH queued messages
+# (up to POOL_MAX_SIZE members; 1 disables pools) and retires clones idle for POOL_IDLE_SHRINK seconds.
+ROLE_POOLS = [name.strip() for name in os.getenv("ROLE_POOLS", "").split(",") if name.strip()]
+POOL_MAX_SIZE = int(os.getenv("POOL_MAX_SIZE", "3"))
+POOL_SCALE_UP_DEPTH = int(os.getenv("POOL_SCALE_UP_DEPTH", "2"))
+POOL_IDLE_SHRINK = float(os.getenv("POOL_IDLE_SHRINK", "120"))
+
+# Kernel timer wheel (agent wake-ups): tick length in seconds and number of slots.
+TIMER_TICK = float(os.getenv("TIMER_TICK", "0.05"))
+TIMER_SLOTS = int(os.getenv("TIMER_SLOTS", "512"))
+
+# Loop detection: each agent's last LOOP_WINDOW tool calls are kept. LOOP_REPEATS consecutive
+# near-identical calls of one tool (argument similarity >= LOOP_SIMILARITY), or the
+# same 2..LOOP_MAX_PERIOD calls repeated LOOP_CYCLE_REPEATS times, interrupt the agent.
+# LOOP_TOOL_THRESHOLDS overrides repeats/similarity/cycles per tool (JSON; 0 disables a rule).
+LOOP_WINDOW = int(os.getenv("LOOP_WINDOW", "16"))
+LOOP_REPEATS = int(os.getenv("LOOP_REPEATS", "3"))
+LOOP_SIMILARITY = float(os.getenv("LOOP_SIMILARITY", "0.85"))
+LOOP_CYCLE_REPEATS = int(os.getenv("LOOP_CYCLE_REPEATS", "2"))
+LOOP_MAX_PERIOD = int(os.getenv("LOOP_MAX_PERIOD", "4"))
+LOOP_TOOL_THRESHOLDS = json.loads(os.getenv(
+    "LOOP_TOOL_THRESHOLDS",
+    '{"wait": {"repeats": 0, "cycles": 0}, "read_process_logs": {"repeats": 6}}',
+))
+
+# Kernel snapshots (roster, messages, budgets, tool history) are written next to the
+# event log at most every SNAPSHOT_INTERVAL seconds; the events they cover move to archive.jsonl
+# (0 disables).
+SNAPSHOT_INTERVAL = float(os.getenv("SNAPSHOT_INTERVAL", "300"))
+
+# Where Kernel.spawn_agent places new actors: "local" (kernel event loop)
+# or "process" (dedicated worker process bridged to the EventBus).
+ACTOR_PLACEMENT = os.getenv("ACTOR_PLACEMENT", "local")
+
+# Agents fold queued TaskSubmitted/TaskCompleted messages of the same request
+# into the next LLM step instead of running one step per message.
+AGENT_BATCH_MESSAGES = os.getenv("AGENT_BATCH_MESSAGES", "false").lower() in ("1", "true", "yes")
+
+# Tool calls from one LLM step run concurrently, at most this many at a time per agent.
+AGENT_TOOL_CONCURRENCY = int(os.getenv("AGENT_TOOL_CONCURRENCY", "4"))
+# Tools started as soon as their call is complete in the streamed response, while
+# the model is still generating the rest (empty disables early dispatch).
+EARLY_DISPATCH_TOOLS = {name.strip() for name in os.getenv(
+    "EARLY_DISPATCH_TOOLS", "web_search,python_run,read_artifact,read_process_logs"
+).split(",") if name.strip()}
+
+# Agents stream LLM completions and publish the text as AssistantDelta events
+# while it is generated (the chat endpoint forwards the leader's as tokens).
+LLM_STREAMING = os.getenv("LLM_STREAMING", "true").lower() not in ("0", "false", "no")
+
+# Runtime metrics (EventBus publish/dispatch, inbox wait, processing time); see Kernel.metrics_snapshot()
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() not in ("0", "false", "no")
+
+# Seconds an agent waits for the kernel to answer a system call
+SYSTEM_CALL_TIMEOUT = float(os.getenv("SYSTEM_CALL_TIMEOUT", "30"))
+
+# LLM call governor: provider limits (0 = unlimited) and the AIMD concurrency range.
+LLM_RPM = float(os.getenv("LLM_RPM", "0"))
+LLM_TPM = float(os.getenv("LLM_TPM", "0"))
+LLM_INITIAL_CONCURRENCY = int(os.getenv("LLM_INITIAL_CONCURRENCY", "4"))
+LLM_MIN_CONCURRENCY = int(os.getenv("LLM_MIN_CONCURRENCY", "1"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "32"))
+# Calls slower than this (seconds) count as congestion; 0 disables the latency signal
+LLM_LATENCY_TARGET = float(os.getenv("LLM_LATENCY_TARGET", "60"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+# Weighted fair queueing of LLM calls: relative share of each priority class
+LLM_PRIORITY_WEIGHTS = {
+    "interactive": float(os.getenv("LLM_WEIGHT_INTERACTIVE", "8")),
+    "normal": float(os.getenv("LLM_WEIGHT_NORMAL", "4")),
+    "background": float(os.getenv("LLM_WEIGHT_BACKGROUND", "1")),
+}
+
 # OpenAI API Configuration
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
 OPENAI_MODEL_NAME = os.getenv("OPENAI_MODEL_NAME", "gpt-4-turbo-preview")
 
+# Context accounting: token counter ("approximate" offline estimate, or "tiktoken")
+# and the model's context window (0 = look it up by OPENAI_MODEL_NAME). Agents
+# compress their memory once the prompt uses CONTEXT_COMPRESS_AT of the window
+# left after the reply (max_tokens) and tool schemas; requests that would still
+# overflow are truncated (oldest messages first) before they are sent.
+TOKENIZER = os.getenv("TOKENIZER", "approximate")
+MODEL_CONTEXT_WINDOW = int(os.getenv("MODEL_CONTEXT_WINDOW", "0"))
+CONTEXT_COMPRESS_AT = float(os.getenv("CONTEXT_COMPRESS_AT", "0.6"))
+CONTEXT_WARN_AT = float(os.getenv("CONTEXT_WARN_AT", "0.9"))
+
 if not OPENAI_API_KEY:
     print("Warning: OPENAI_API_KEY is not set. Please set it in your environment or .env file.")
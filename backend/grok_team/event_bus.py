@@ -1,74 +1,415 @@
 import asyncio
-from typing import Any, Dict, List, Callable, Awaitable
+import time
+import uuid
+from typing import Any, Dict, List, Callable, Awaitable, Optional, Iterable, Union, FrozenSet
 from collections import defaultdict
 import logging
 
+from grok_team.events import evolve
+from grok_team.metrics import MetricsRegistry
+
 logger = logging.getLogger(__name__)
 
+Handler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+# Delivery modes for subscriptions.
+# - sync: the handler is awaited inside `publish`, in the publisher's coroutine.
+# - async: the handler gets its own delivery queue and worker task; `publish`
+#   only enqueues. Events are delivered to each subscriber in publish order.
+DELIVERY_SYNC = "sync"
+DELIVERY_ASYNC = "async"
+DELIVERY_MODES = {DELIVERY_SYNC, DELIVERY_ASYNC}
+
+_STOP = object()
+
+# Returned by a responder that cannot answer a request inline; the request is
+# then published and waits for an explicit `reply()`.
+NO_REPLY = object()
+
+
+class _DeliveryWorker:
+    """Per-subscriber mailbox that delivers events to one handler in order."""
+
+    def __init__(self, handler: Handler, metrics: MetricsRegistry):
+        self.handler = handler
+        self.metrics = metrics
+        self.name = _handler_name(handler)
+        self.refs = 0
+        self.unfinished = 0
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.task: Optional[asyncio.Task] = None
+
+    def put(self, event: Dict[str, Any]):
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run(), name=f"Delivery-{self.name}")
+        self.unfinished += 1
+        self.queue.put_nowait((time.perf_counter(), event))
+
+    def stop(self):
+        """Stops the worker after already queued events have been delivered."""
+        if self.task is not None and not self.task.done():
+            self.queue.put_nowait((0.0, _STOP))
+
+    def cancel(self):
+        """Stops the worker immediately and drops undelivered events."""
+        if self.task is not None and not self.task.done():
+            self.task.cancel()
+        self.task = None
+        self.unfinished = 0
+        self.queue = asyncio.Queue()
+
+    async def _run(self):
+        while True:
+            enqueued_at, event = await self.queue.get()
+            try:
+                if event is _STOP:
+                    return
+                if self.metrics.enabled:
+                    started = time.perf_counter()
+                    self.metrics.observe("bus.delivery_lag_seconds", self.name, started - enqueued_at)
+                    await self.handler(event)
+                    self.metrics.observe("bus.handler_seconds", self.name, time.perf_counter() - started)
+                else:
+                    await self.handler(event)
+            except Exception as e:
+                logger.error(f"Error in async subscriber {self.name}: {e}")
+            finally:
+                if event is not _STOP:
+                    self.unfinished -= 1
+                self.queue.task_done()
+
+
+class Subscription:
+    """
+    A handler attached to the bus with a delivery mode.
+    Correlated subscriptions only receive events carrying their `correlation_id`,
+    optionally restricted to `topics`. Call `cancel()` (or use it as a context
+    manager) to detach it.
+    """
+    __slots__ = ("handler", "delivery", "topics", "correlation_id", "_bus")
+
+    def __init__(self, handler: Handler, delivery: str, topics: Optional[FrozenSet[str]] = None,
+                 correlation_id: Optional[str] = None, bus: Optional["EventBus"] = None):
+        self.handler = handler
+        self.delivery = delivery
+        self.topics = topics
+        self.correlation_id = correlation_id
+        self._bus = bus
+
+    def matches(self, topic: str) -> bool:
+        return self.topics is None or topic in self.topics
+
+    def cancel(self):
+        """Detaches the subscription from the bus. Safe to call twice."""
+        bus, self._bus = self._bus, None
+        if bus is not None:
+            bus._remove_subscription(self)
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.cancel()
+
+
+def _normalize_topics(topic: Union[str, Iterable[str], None]) -> Optional[FrozenSet[str]]:
+    if topic is None:
+        return None
+    if isinstance(topic, str):
+        return frozenset((topic,))
+    return frozenset(topic)
+
+
+def _handler_name(handler: Handler) -> str:
+    return getattr(handler, "__qualname__", None) or repr(handler)
+
+
 class EventBus:
-    def __init__(self):
-        self._subscribers: Dict[str, List[Callable[[Dict[str, Any]], Awaitable[None]]]] = defaultdict(list)
+    def __init__(self, default_delivery: str = DELIVERY_SYNC, metrics: Optional[MetricsRegistry] = None):
+        if default_delivery not in DELIVERY_MODES:
+            raise ValueError(f"Unknown delivery mode: {default_delivery}")
+        self.default_delivery = default_delivery
+        # Shared with the actors on this bus (inbox wait, processing time)
+        self.metrics = metrics or MetricsRegistry()
+        self._subscribers: Dict[str, List[Subscription]] = defaultdict(list)
         self._actor_inboxes: Dict[str, asyncio.Queue] = {}
-        self._global_subscribers: List[Callable[[Dict[str, Any]], Awaitable[None]]] = []
+        self._global_subscribers: List[Subscription] = []
+        # correlation_id -> subscriptions interested only in that correlation
+        self._correlated: Dict[str, List[Subscription]] = {}
+        self._workers: Dict[Handler, _DeliveryWorker] = {}
+        # reply_to id -> future of an outstanding `request()`
+        self._pending_replies: Dict[str, asyncio.Future] = {}
+        # topic -> synchronous fast-path responder
+        self._responders: Dict[str, Callable[[Dict[str, Any]], Any]] = {}
+        # Wakes actors that have no inbox right now (e.g. hibernated ones)
+        self._target_resolver: Optional[Callable[[str], Awaitable[Optional[asyncio.Queue]]]] = None
+        self._resolvable: Optional[Callable[[str], bool]] = None
+        # address -> picks the actual recipient of each event (e.g. role pools)
+        self._dispatchers: Dict[str, Callable[[Dict[str, Any]], str]] = {}
 
     def register_actor(self, actor_name: str, inbox: asyncio.Queue):
         """Registers an actor's inbox for direct message delivery."""
         self._actor_inboxes[actor_name] = inbox
         logger.info(f"Actor '{actor_name}' registered with EventBus.")
 
-    def subscribe(self, topic: str, handler: Callable[[Dict[str, Any]], Awaitable[None]]):
-        """Subscribes a handler to a specific topic (Pub/Sub pattern)."""
-        self._subscribers[topic].append(handler)
+    def unregister_actor(self, actor_name: str):
+        """Removes an actor's inbox; later messages addressed to it are dropped with a warning."""
+        if self._actor_inboxes.pop(actor_name, None) is not None:
+            logger.info(f"Actor '{actor_name}' unregistered from EventBus.")
+
+    def is_registered(self, actor_name: str) -> bool:
+        """True if messages to `actor_name` can be delivered (now, or after a wake-up)."""
+        if actor_name in self._actor_inboxes:
+            return True
+        return self._resolvable is not None and self._resolvable(actor_name)
+
+    def set_target_resolver(self, resolver: Callable[[str], Awaitable[Optional[asyncio.Queue]]],
+                            resolvable: Callable[[str], bool]):
+        """
+        Installs a fallback for targets without a registered inbox: `resolver(name)`
+        brings the actor back and returns its inbox (or None). `resolvable(name)`
+        tells, without side effects, whether the resolver knows the name.
+        """
+        self._target_resolver = resolver
+        self._resolvable = resolvable
+
+    def set_dispatcher(self, address: str, dispatcher: Callable[[Dict[str, Any]], str]):
+        """Events targeted at `address` are delivered to `dispatcher(event)` instead."""
+        self._dispatchers[address] = dispatcher
+
+    def remove_dispatcher(self, address: str):
+        self._dispatchers.pop(address, None)
+
+    def subscribe(self, topic: Union[str, Iterable[str], None], handler: Handler,
+                  delivery: Optional[str] = None, correlation_id: Optional[str] = None) -> Subscription:
+        """
+        Subscribes a handler to a topic or set of topics (Pub/Sub pattern).
+        `delivery` selects sync (awaited by the publisher) or async (own queue
+        and worker task) delivery; defaults to the bus `default_delivery`.
+        With `correlation_id`, the handler is indexed by that key and only sees
+        matching events; `topic=None` then means every topic.
+        """
+        topics = _normalize_topics(topic)
+        if topics is None and correlation_id is None:
+            raise ValueError("A topic is required for uncorrelated subscriptions")
+
+        subscription = self._make_subscription(handler, delivery, topics, correlation_id)
+        if correlation_id is not None:
+            self._correlated.setdefault(correlation_id, []).append(subscription)
+        else:
+            for name in topics:
+                self._subscribers[name].append(subscription)
+        return subscription
 
-    def unsubscribe(self, topic: str, handler: Callable[[Dict[str, Any]], Awaitable[None]]):
+    def unsubscribe(self, topic: str, handler: Handler):
         """Removes a handler from a topic if it exists."""
-        handlers = self._subscribers.get(topic)
-        if not handlers:
+        subscriptions = self._subscribers.get(topic)
+        if not subscriptions:
             return
-        try:
-            handlers.remove(handler)
-        except ValueError:
+        subscription = self._find(subscriptions, handler)
+        if subscription is None:
             return
-        if not handlers:
+        subscriptions.remove(subscription)
+        if not subscriptions:
             self._subscribers.pop(topic, None)
+        if not any(subscription in subs for subs in self._subscribers.values()):
+            subscription._bus = None
+            self._release(subscription)
 
     async def publish(self, event: Dict[str, Any]):
         """
         Publishes an event.
         - If 'target' is specified in the event, routes to that actor's inbox.
         - Also distributes to all topic subscribers (e.g., logger, monitor).
+          Async subscribers are only enqueued here; sync ones are awaited.
         """
         topic = event.get("type", "unknown")
         target = event.get("target")
+        self.metrics.inc("bus.published", topic)
 
         # 1. Direct Routing (Inbox Pattern)
+        if target and self._dispatchers:
+            dispatcher = self._dispatchers.get(target)
+            if dispatcher is not None:
+                target = dispatcher(event)
         if target and target in self._actor_inboxes:
              await self._actor_inboxes[target].put(event)
         elif target:
-             logger.warning(f"EventBus: Target actor '{target}' not found for event {topic}.")
+             inbox = await self._resolve_target(target)
+             if inbox is not None:
+                 await inbox.put(event)
+             else:
+                 logger.warning(f"EventBus: Target actor '{target}' not found for event {topic}.")
 
         # 2. Pub/Sub Routing (Observers)
         if topic in self._subscribers:
-            for handler in list(self._subscribers[topic]):
+            for subscription in list(self._subscribers[topic]):
                 try:
-                    await handler(event)
+                    await self._deliver(subscription, event)
                 except Exception as e:
                     logger.error(f"Error in subscriber handler for topic {topic}: {e}")
 
-        # 3. Global/Wildcard subscribers
-        for handler in self._global_subscribers:
+        # 3. Correlation-indexed subscribers (only the matching request is visited)
+        correlation_id = event.get("correlation_id")
+        if correlation_id is not None and correlation_id in self._correlated:
+            for subscription in list(self._correlated[correlation_id]):
+                if not subscription.matches(topic):
+                    continue
+                try:
+                    await self._deliver(subscription, event)
+                except Exception as e:
+                    logger.error(f"Error in correlated subscriber for {correlation_id}: {e}")
+
+        # 4. Global/Wildcard subscribers
+        for subscription in list(self._global_subscribers):
             try:
-                await handler(event)
+                await self._deliver(subscription, event)
             except Exception as e:
                 logger.error(f"Error in global subscriber: {e}")
 
-    def subscribe_globally(self, handler: Callable[[Dict[str, Any]], Awaitable[None]]):
+    def subscribe_globally(self, handler: Handler, delivery: Optional[str] = None) -> Subscription:
         """Subscribes a handler to all events."""
-        self._global_subscribers.append(handler)
+        subscription = self._make_subscription(handler, delivery)
+        self._global_subscribers.append(subscription)
+        return subscription
 
-    def unsubscribe_globally(self, handler: Callable[[Dict[str, Any]], Awaitable[None]]):
+    def unsubscribe_globally(self, handler: Handler):
         """Removes a global subscriber if it exists."""
+        subscription = self._find(self._global_subscribers, handler)
+        if subscription is None:
+            return
+        self._global_subscribers.remove(subscription)
+        subscription._bus = None
+        self._release(subscription)
+
+    def register_responder(self, topic: str, responder: Callable[[Dict[str, Any]], Any]):
+        """
+        Registers a synchronous fast-path responder for requests on `topic`.
+        It returns the reply directly, or NO_REPLY to fall back to publishing.
+        """
+        self._responders[topic] = responder
+
+    async def request(self, event: Dict[str, Any], timeout: Optional[float] = None) -> Any:
+        """
+        Publishes `event` and waits for the matching `reply()`.
+        Requests a registered responder can answer inline never touch the bus.
+        Raises asyncio.TimeoutError if no reply arrives within `timeout`.
+        """
+        responder = self._responders.get(event.get("type", "unknown"))
+        if responder is not None:
+            result = responder(event)
+            if result is not NO_REPLY:
+                return result
+
+        reply_to = uuid.uuid4().hex
+        future = asyncio.get_running_loop().create_future()
+        self._pending_replies[reply_to] = future
+        try:
+            await self.publish(evolve(event, {"reply_to": reply_to}))
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self._pending_replies.pop(reply_to, None)
+
+    def reply(self, reply_to: str, result: Any = None, error: Optional[BaseException] = None) -> bool:
+        """Resolves an outstanding request. Returns False if nobody is waiting anymore."""
+        future = self._pending_replies.get(reply_to)
+        if future is None or future.done():
+            return False
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+        return True
+
+    async def _resolve_target(self, target: str) -> Optional[asyncio.Queue]:
+        if self._target_resolver is None or not self._resolvable(target):
+            return None
         try:
-            self._global_subscribers.remove(handler)
-        except ValueError:
+            return await self._target_resolver(target)
+        except Exception as e:
+            logger.error(f"EventBus: Failed to wake actor '{target}': {e}")
+            return None
+
+    def queue_depths(self) -> Dict[str, int]:
+        """Current queue depth of every actor inbox and async delivery worker."""
+        depths = {f"inbox:{name}": inbox.qsize() for name, inbox in self._actor_inboxes.items()}
+        for worker in self._workers.values():
+            depths[f"delivery:{worker.name}"] = worker.queue.qsize()
+        return depths
+
+    async def drain(self):
+        """Waits until every async subscriber has processed its queued events."""
+        while True:
+            busy = [
+                worker for worker in self._workers.values()
+                if worker.unfinished and worker.task is not None and not worker.task.done()
+            ]
+            if not busy:
+                return
+            await asyncio.gather(*(worker.queue.join() for worker in busy))
+
+    async def shutdown(self):
+        """Drains async subscribers and stops their worker tasks."""
+        await self.drain()
+        for worker in self._workers.values():
+            worker.cancel()
+
+    async def _deliver(self, subscription: Subscription, event: Dict[str, Any]):
+        if subscription.delivery == DELIVERY_ASYNC:
+            self._workers[subscription.handler].put(event)
+        elif self.metrics.enabled:
+            started = time.perf_counter()
+            await subscription.handler(event)
+            self.metrics.observe("bus.handler_seconds", _handler_name(subscription.handler), time.perf_counter() - started)
+        else:
+            await subscription.handler(event)
+
+    def _make_subscription(self, handler: Handler, delivery: Optional[str],
+                           topics: Optional[FrozenSet[str]] = None,
+                           correlation_id: Optional[str] = None) -> Subscription:
+        delivery = delivery or self.default_delivery
+        if delivery not in DELIVERY_MODES:
+            raise ValueError(f"Unknown delivery mode: {delivery}")
+        if delivery == DELIVERY_ASYNC:
+            # One worker per handler keeps ordering across all of its topics.
+            worker = self._workers.get(handler)
+            if worker is None:
+                worker = self._workers[handler] = _DeliveryWorker(handler, self.metrics)
+            worker.refs += 1
+        return Subscription(handler, delivery, topics, correlation_id, self)
+
+    def _remove_subscription(self, subscription: Subscription):
+        if subscription.correlation_id is not None:
+            subscriptions = self._correlated.get(subscription.correlation_id, [])
+            if subscription in subscriptions:
+                subscriptions.remove(subscription)
+            if not subscriptions:
+                self._correlated.pop(subscription.correlation_id, None)
+        elif subscription in self._global_subscribers:
+            self._global_subscribers.remove(subscription)
+        else:
+            for topic in list(subscription.topics or ()):
+                subscriptions = self._subscribers.get(topic)
+                if subscriptions and subscription in subscriptions:
+                    subscriptions.remove(subscription)
+                    if not subscriptions:
+                        self._subscribers.pop(topic, None)
+        self._release(subscription)
+
+    def _release(self, subscription: Subscription):
+        if subscription.delivery != DELIVERY_ASYNC:
+            return
+        worker = self._workers.get(subscription.handler)
+        if worker is None:
             return
+        worker.refs -= 1
+        if worker.refs <= 0:
+            self._workers.pop(subscription.handler, None)
+            worker.stop()
+
+    @staticmethod
+    def _find(subscriptions: List[Subscription], handler: Handler) -> Optional[Subscription]:
+        for subscription in subscriptions:
+            if subscription.handler == handler:
+                return subscription
+        return None
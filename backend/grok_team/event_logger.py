@@ -1,45 +1,134 @@
 import json
 import logging
 import asyncio
-from typing import Dict, Any, List
+import os
+from collections import deque
+from typing import Dict, Any, Iterator, List, Optional
 from pathlib import Path
 from datetime import datetime
 
+from grok_team.events import encode_event
+
 logger = logging.getLogger(__name__)
 
 class EventLogger:
+    """
+    Append-only event log. Every logged event gets a monotonically increasing
+    `seq`. A snapshot (see `write_snapshot`) records the state as of a `seq`;
+    `compact` then moves the events it covers to an archive, so recovery only
+    replays the tail while `recent_events` still sees the whole history.
+    """
+
     def __init__(self, storage_dir: str = "data/sessions"):
         self.storage_dir = Path(storage_dir)
         self.storage_dir.mkdir(parents=True, exist_ok=True)
         self.current_session_file = self.storage_dir / "current_session.jsonl"
+        self.snapshot_file = self.storage_dir / "snapshot.json"
+        self.archive_file = self.storage_dir / "archive.jsonl"
         self._lock = asyncio.Lock()
+        # seq of the last logged event
+        self.sequence = self._last_sequence()
 
     async def log_event(self, event: Dict[str, Any]):
-        """Logs an event to the append-only file."""
-        # Add timestamp if not present
-        if "timestamp" not in event:
-            event["timestamp"] = datetime.utcnow().isoformat()
-            
+        """Logs an event to the append-only file. The event itself is never modified."""
+        # Typed events reuse their cached encoding; `seq` (and a timestamp if
+        # missing) is spliced in last, so it wins over any key the event carries.
+        body = encode_event(event)
+        extra = "" if "timestamp" in event else f', "timestamp": "{datetime.utcnow().isoformat()}"'
         async with self._lock:
-            with open(self.current_session_file, "a") as f:
-                f.write(json.dumps(event) + "\n")
+            self.sequence += 1
+            suffix = f'{extra}, "seq": {self.sequence}}}'
+            line = body[:-1] + suffix if body != "{}" else "{" + suffix[2:]
+            with open(self.current_session_file, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    def iter_events(self, after_seq: int = 0) -> Iterator[Dict[str, Any]]:
+        """Streams logged events with a `seq` greater than `after_seq`, oldest first."""
+        for event in self._read(self.current_session_file):
+            # Events logged before sequencing existed precede every snapshot
+            if event.get("seq", 0) > after_seq or ("seq" not in event and not after_seq):
+                yield event
 
     def get_all_events(self) -> List[Dict[str, Any]]:
-        """Retrieves all events from the log."""
-        events = []
+        """Retrieves all events still in the log (compacted events are archived)."""
+        return list(self.iter_events())
+
+    def recent_events(self, limit: int) -> List[Dict[str, Any]]:
+        """The last `limit` events logged, including those compaction archived."""
+        recent = deque(self._read(self.archive_file), maxlen=limit)
+        recent.extend(self._read(self.current_session_file))
+        return list(recent)
+
+    async def write_snapshot(self, snapshot: Dict[str, Any]):
+        """Atomically replaces the snapshot file."""
+        await asyncio.to_thread(self._write_snapshot, snapshot)
+
+    def load_snapshot(self) -> Optional[Dict[str, Any]]:
+        if not self.snapshot_file.exists():
+            return None
+        try:
+            with open(self.snapshot_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"Failed to read snapshot: {e}")
+            return None
+
+    async def compact(self, upto_seq: int) -> int:
+        """Drops the events with `seq <= upto_seq` from the log. Returns how many were dropped."""
+        async with self._lock:
+            return await asyncio.to_thread(self._compact, upto_seq)
+
+    def clear_log(self):
+        """Clears the log and its snapshot (for testing or new session)."""
+        for path in (self.current_session_file, self.snapshot_file, self.archive_file):
+            if path.exists():
+                path.unlink()
+        self.sequence = 0
+
+    def _write_snapshot(self, snapshot: Dict[str, Any]):
+        tmp = self.snapshot_file.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, ensure_ascii=False, default=str)
+        os.replace(tmp, self.snapshot_file)
+
+    def _compact(self, upto_seq: int) -> int:
         if not self.current_session_file.exists():
-            return []
-            
-        with open(self.current_session_file, "r") as f:
+            return 0
+        dropped = 0
+        tmp = self.current_session_file.with_suffix(".tmp")
+        with open(self.current_session_file, "r", encoding="utf-8") as src, \
+                open(tmp, "w", encoding="utf-8") as dst, \
+                open(self.archive_file, "a", encoding="utf-8") as archive:
+            for line in src:
+                try:
+                    covered = json.loads(line).get("seq", 0) <= upto_seq
+                except json.JSONDecodeError:
+                    covered = True
+                if covered:
+                    dropped += 1
+                    archive.write(line)
+                else:
+                    dst.write(line)
+        os.replace(tmp, self.current_session_file)
+        return dropped
+
+    def _read(self, path: Path) -> Iterator[Dict[str, Any]]:
+        if not path.exists():
+            return
+        with open(path, "r", encoding="utf-8") as f:
             for line in f:
-                if line.strip():
-                    try:
-                        events.append(json.loads(line))
-                    except json.JSONDecodeError:
-                        logger.error("Failed to decode event line")
-        return events
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    logger.error("Failed to decode event line")
 
-    def clear_log(self):
-        """Clears the log (for testing or new session)."""
-        if self.current_session_file.exists():
-            self.current_session_file.unlink()
+    def _last_sequence(self) -> int:
+        last = 0
+        snapshot = self.load_snapshot()
+        if snapshot:
+            last = snapshot.get("seq", 0)
+        for event in self.iter_events(after_seq=last):
+            last = max(last, event.get("seq", 0))
+        return last
@@ -0,0 +1,168 @@
+"""
+Typed, immutable event envelopes for the core actor messages.
+
+Events are read-only `Mapping`s, so every consumer that treats events as
+dicts (`event.get("type")`, `event["from"]`) keeps working. They are never
+mutated after creation: routing changes go through `evolve`, which returns a
+new envelope. Because of that the JSON encoding can be computed once and
+shared by every consumer (event log, process bridge, ...).
+"""
+import json
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+# type name -> Event subclass
+EVENT_TYPES: Dict[str, type] = {}
+
+
+class Event(Mapping):
+    """Base envelope. Subclasses set `type` and list their payload fields in `__slots__`."""
+    __slots__ = ("target", "from_", "correlation_id", "timestamp", "_encoded")
+
+    type = "Event"
+    fields: Tuple[str, ...] = ()
+    _keys: Tuple[str, ...] = ("type", "target", "from", "correlation_id", "timestamp")
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        own = tuple(cls.__dict__.get("__slots__", ()))
+        cls.fields = tuple(getattr(cls.__mro__[1], "fields", ())) + own
+        cls._keys = Event._keys + cls.fields
+        EVENT_TYPES[cls.type] = cls
+
+    def __init__(self, *, target: Optional[str] = None, from_: Optional[str] = None,
+                 correlation_id: Optional[str] = None, timestamp: Optional[str] = None, **payload: Any):
+        unknown = set(payload) - set(self.fields)
+        if unknown:
+            raise TypeError(f"{type(self).__name__} got unexpected fields: {sorted(unknown)}")
+        init = object.__setattr__
+        init(self, "target", target)
+        init(self, "from_", from_)
+        init(self, "correlation_id", correlation_id)
+        init(self, "timestamp", timestamp or datetime.utcnow().isoformat())
+        init(self, "_encoded", None)
+        for name in self.fields:
+            init(self, name, payload.get(name))
+
+    # --- Mapping protocol (dict-compatible read access) ---
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "type":
+            return self.type
+        if key not in self._keys:
+            raise KeyError(key)
+        value = getattr(self, "from_" if key == "from" else key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self._keys:
+            if key == "type" or getattr(self, "from_" if key == "from" else key) is not None:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    # --- Immutability ---
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f"{type(self).__name__} is immutable; use evolve()")
+
+    def __delattr__(self, name: str):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self):
+        return (event_from_dict, (self.to_dict(),))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    # --- Serialization ---
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: self[key] for key in self}
+
+    def to_json(self) -> str:
+        """JSON encoding, computed on first use and cached."""
+        if self._encoded is None:
+            object.__setattr__(self, "_encoded", json.dumps(self.to_dict(), ensure_ascii=False))
+        return self._encoded
+
+
+class TaskSubmitted(Event):
+    __slots__ = ("content", "conversation_id")
+    type = "TaskSubmitted"
+
+
+class TaskCompleted(Event):
+    __slots__ = ("content",)
+    type = "TaskCompleted"
+
+
+class TaskFailed(Event):
+    __slots__ = ("error",)
+    type = "TaskFailed"
+
+
+class ToolUse(Event):
+    __slots__ = ("actor", "tool", "args", "tool_call_id")
+    type = "ToolUse"
+
+
+class SystemCall(Event):
+    __slots__ = ("command", "args", "tool_call_id", "sender", "reply_to")
+    type = "SystemCall"
+
+
+class SystemCallResult(Event):
+    __slots__ = ("content", "tool_call_id")
+    type = "SystemCallResult"
+
+
+class WakeUp(Event):
+    """Ends an agent's `wait`; `reply_to` is who the resumed turn answers."""
+    __slots__ = ("content", "reason", "reply_to")
+    type = "WakeUp"
+
+
+class AssistantDelta(Event):
+    """A piece of an agent's answer while the LLM is still generating it."""
+    __slots__ = ("content",)
+    type = "AssistantDelta"
+
+
+# High-volume events that are only useful live: not written to the event log.
+EPHEMERAL_EVENT_TYPES = {"AssistantDelta"}
+
+
+def _kwargs(data: Mapping) -> Dict[str, Any]:
+    kwargs = {key: value for key, value in data.items() if key not in ("type", "from")}
+    if "from" in data:
+        kwargs["from_"] = data["from"]
+    return kwargs
+
+
+def event_from_dict(data: Mapping) -> Mapping:
+    """Builds the typed envelope for `data`, or returns a plain dict for other event shapes."""
+    cls = EVENT_TYPES.get(data.get("type"))
+    if cls is not None and set(data) <= set(cls._keys):
+        return cls(**_kwargs(data))
+    return dict(data)
+
+
+def evolve(event: Mapping, changes: Dict[str, Any]) -> Mapping:
+    """Returns a copy of `event` with `changes` applied; the original is left untouched."""
+    if isinstance(event, Event) and set(changes) <= set(event._keys):
+        merged = event.to_dict()
+        merged.update(changes)
+        return type(event)(**_kwargs(merged))
+    return {**event, **changes}
+
+
+def encode_event(event: Mapping) -> str:
+    """JSON line for an event; typed events reuse their cached encoding."""
+    if isinstance(event, Event):
+        return event.to_json()
+    return json.dumps(event, ensure_ascii=False, default=str)
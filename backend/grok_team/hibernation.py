@@ -0,0 +1,61 @@
+import asyncio
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import quote, unquote
+
+logger = logging.getLogger(__name__)
+
+
+class HibernationStore:
+    """
+    Dormant actor state on local disk, one JSON file per actor.
+    Writes go through a temp file and `os.replace`, so a crash never leaves a
+    half-written state behind.
+    """
+
+    def __init__(self, storage_dir: str = "data/hibernation"):
+        self.storage_dir = Path(storage_dir)
+
+    def _path(self, name: str) -> Path:
+        # Actor names may contain '@' and other characters; keep file names safe and reversible.
+        return self.storage_dir / f"{quote(name, safe='')}.json"
+
+    async def save(self, name: str, state: Dict[str, Any]):
+        await asyncio.to_thread(self._write, name, state)
+
+    async def load(self, name: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self._read, name)
+
+    def delete(self, name: str):
+        try:
+            self._path(name).unlink()
+        except FileNotFoundError:
+            pass
+
+    def names(self) -> List[str]:
+        """Actors that currently have a hibernated state."""
+        if not self.storage_dir.exists():
+            return []
+        return [unquote(path.stem) for path in self.storage_dir.glob("*.json")]
+
+    def _write(self, name: str, state: Dict[str, Any]):
+        self.storage_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(name)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, default=str)
+        os.replace(tmp, path)
+
+    def _read(self, name: str) -> Optional[Dict[str, Any]]:
+        path = self._path(name)
+        if not path.exists():
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"Failed to read hibernated state of '{name}': {e}")
+            return None
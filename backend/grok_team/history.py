@@ -53,6 +53,14 @@ class Conversation:
         }
 
 
+@dataclass
+class ConversationSummary:
+    """Cached compressed context of a conversation's first `covered_messages` messages."""
+    summary: str
+    covered_messages: int
+    updated_at: str = field(default_factory=utc_now_iso)
+
+
 class SQLiteHistoryStore:
     def __init__(self, db_path: Path):
         self._db_path = db_path
@@ -89,6 +97,17 @@ class SQLiteHistoryStore:
                     )
                     """
                 )
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS conversation_summaries (
+                        conversation_id TEXT PRIMARY KEY,
+                        summary TEXT NOT NULL,
+                        covered_messages INTEGER NOT NULL,
+                        updated_at TEXT NOT NULL,
+                        FOREIGN KEY(conversation_id) REFERENCES conversations(id) ON DELETE CASCADE
+                    )
+                    """
+                )
                 conn.execute("CREATE INDEX IF NOT EXISTS idx_conversations_updated_at ON conversations(updated_at DESC)")
                 conn.execute("CREATE INDEX IF NOT EXISTS idx_messages_conversation_id ON messages(conversation_id, id)")
                 conn.commit()
@@ -309,6 +328,53 @@ class SQLiteHistoryStore:
 
         return await asyncio.to_thread(_add)
 
+    async def get_summary(self, conversation_id: str) -> Optional[ConversationSummary]:
+        def _get_summary() -> Optional[ConversationSummary]:
+            conn = sqlite3.connect(self._db_path)
+            conn.row_factory = sqlite3.Row
+            try:
+                row = conn.execute(
+                    "SELECT summary, covered_messages, updated_at FROM conversation_summaries WHERE conversation_id = ?",
+                    (conversation_id,),
+                ).fetchone()
+                if row is None:
+                    return None
+                return ConversationSummary(
+                    summary=row["summary"],
+                    covered_messages=int(row["covered_messages"]),
+                    updated_at=row["updated_at"],
+                )
+            finally:
+                conn.close()
+
+        return await asyncio.to_thread(_get_summary)
+
+    async def save_summary(self, conversation_id: str, summary: ConversationSummary) -> bool:
+        def _save_summary() -> bool:
+            conn = sqlite3.connect(self._db_path)
+            try:
+                conn.execute("PRAGMA foreign_keys=ON;")
+                existing = conn.execute("SELECT id FROM conversations WHERE id = ?", (conversation_id,)).fetchone()
+                if existing is None:
+                    return False
+                conn.execute(
+                    """
+                    INSERT INTO conversation_summaries (conversation_id, summary, covered_messages, updated_at)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT(conversation_id) DO UPDATE SET
+                        summary = excluded.summary,
+                        covered_messages = excluded.covered_messages,
+                        updated_at = excluded.updated_at
+                    """,
+                    (conversation_id, summary.summary, summary.covered_messages, summary.updated_at),
+                )
+                conn.commit()
+                return True
+            finally:
+                conn.close()
+
+        return await asyncio.to_thread(_save_summary)
+
     async def update_title(self, conversation_id: str, title: str) -> bool:
         safe_title = title[:120].strip()
         if not safe_title:
@@ -0,0 +1,73 @@
+"""
+Rebuilds a session leader's context from the conversation stored in SQLite.
+
+The last HYDRATE_TAIL_MESSAGES messages are replayed verbatim; everything
+before them is represented by a summary cached in `conversation_summaries`.
+The cached summary is only extended when the uncovered part has grown past
+the tail, so resuming a conversation is usually a single lookup.
+"""
+import asyncio
+import logging
+from typing import Any, Dict, List
+
+from grok_team.agent import summary_message
+from grok_team.config import HYDRATE_TAIL_MESSAGES
+from grok_team.history import Conversation, ConversationSummary, SQLiteHistoryStore
+from grok_team.session import AgentSession
+
+logger = logging.getLogger(__name__)
+
+
+async def hydrate_session(session: AgentSession, store: SQLiteHistoryStore, conversation: Conversation,
+                          tail: int = HYDRATE_TAIL_MESSAGES) -> bool:
+    """
+    Loads earlier messages of `conversation` into the leader of a freshly opened
+    session. Concurrent callers wait for the first one's rebuild. Returns False
+    if there was nothing to do (already hydrated, no history, or the leader
+    already has context).
+    """
+    if session.hydration is not None:
+        await asyncio.shield(session.hydration)
+        return False
+    session.hydration = asyncio.create_task(_hydrate(session, store, conversation, tail))
+    # Shielded: a cancelled request must not abort the rebuild other requests wait for
+    return await asyncio.shield(session.hydration)
+
+
+async def _hydrate(session: AgentSession, store: SQLiteHistoryStore, conversation: Conversation, tail: int) -> bool:
+    try:
+        return await _load_context(session.leader, store, conversation, tail)
+    finally:
+        session.hydrated = True
+
+
+async def _load_context(leader, store: SQLiteHistoryStore, conversation: Conversation, tail: int) -> bool:
+    if not conversation.messages or len(leader.messages) > 1:
+        return False
+
+    history = [{"role": m.role, "content": m.content} for m in conversation.messages if m.role in ("user", "assistant")]
+    cached = await store.get_summary(conversation.id)
+    summary = cached.summary if cached else ""
+    covered = min(cached.covered_messages, len(history)) if cached else 0
+
+    # Fold messages that fell out of the tail into the cached summary
+    boundary = max(covered, len(history) - tail)
+    if boundary > covered:
+        try:
+            summary = await leader.summarize_transcript(history[covered:boundary], summary)
+            covered = boundary
+            await store.save_summary(conversation.id, ConversationSummary(summary=summary, covered_messages=covered))
+        except Exception as e:
+            logger.error(f"Failed to summarize conversation {conversation.id}: {e}")
+
+    leader.messages.extend(_context_messages(summary, history[covered:]))
+    logger.info(f"Hydrated {leader.name} with {len(history) - covered} messages (+{covered} summarized).")
+    return True
+
+
+def _context_messages(summary: str, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    context = []
+    if summary:
+        context.append(summary_message(summary))
+    context.extend(messages)
+    return context
@@ -1,25 +1,72 @@
 import asyncio
 import logging
 import json
+import re
+import time
+from datetime import datetime
 from typing import Dict, Any, Type, Optional
-from grok_team.event_bus import EventBus
-from grok_team.actor import Actor
-from grok_team.config import ALL_AGENT_NAMES
+from grok_team.event_bus import EventBus, DELIVERY_ASYNC, NO_REPLY
+from grok_team.actor import Actor, resolve_actor_class
+from grok_team.config import (
+    ALL_AGENT_NAMES,
+    ACTOR_PLACEMENT,
+    LEADER_NAME,
+    SESSION_IDLE_TTL,
+    HOUSEKEEPING_INTERVAL,
+    HIBERNATE_AFTER,
+    HIBERNATION_DIR,
+    SNAPSHOT_INTERVAL,
+    ROLE_POOLS,
+    POOL_MAX_SIZE,
+    POOL_IDLE_SHRINK,
+)
 from grok_team.event_logger import EventLogger
+from grok_team.events import SystemCallResult, TaskFailed, WakeUp, evolve, EPHEMERAL_EVENT_TYPES
+from grok_team.session import AgentSession, make_address, split_address
+from grok_team.llm_governor import LLMGovernor
+from grok_team.hibernation import HibernationStore
+from grok_team.supervisor import Supervisor
+from grok_team.pools import RolePool
+from grok_team.timers import TimerWheel
+from grok_team.loop_detector import LoopDetector
 
 logger = logging.getLogger(__name__)
 
+# System calls that complete without awaiting anything; answered inline on `bus.request`.
+INLINE_SYSTEM_CALLS = {"list_agents", "allocate_budget"}
+
 class Kernel:
     def __init__(self):
         self.event_bus = EventBus()
         self.actors: Dict[str, Actor] = {}
         self.tasks: Dict[str, asyncio.Task] = {}
         self.running = False
-        self.tool_history: Dict[str, list] = {}
+        self.loop_detector = LoopDetector()
         self.event_logger = EventLogger()
+        # Shared by every local agent's LLM calls
+        self.llm_governor = LLMGovernor(metrics=self.event_bus.metrics)
+        # conversation_id -> its agent team, created on first use
+        self.sessions: Dict[str, AgentSession] = {}
+        self._session_lock = asyncio.Lock()
+        self._housekeeping: Optional[asyncio.Task] = None
+        # Agents created by spawn_agent (the ones that may hibernate) and the dormant ones
+        self.spawned: set = set()
+        self.dormant: set = set()
+        self.hibernation = HibernationStore(HIBERNATION_DIR)
+        self._waking: Dict[str, asyncio.Future] = {}
+        self.event_bus.set_target_resolver(self.wake_agent, lambda name: name in self.dormant)
+        self._last_snapshot = time.monotonic()
+        self.supervisor = Supervisor()
+        # Agent wake-ups (wait tool)
+        self.timers = TimerWheel()
+        # role address -> pool of agents serving it
+        self.pools: Dict[str, RolePool] = {}
+        self._restarts: set = set()
 
     def register_actor(self, actor: Actor):
         self.actors[actor.name] = actor
+        if hasattr(actor, "governor") and actor.governor is None:
+            actor.governor = self.llm_governor
 
     async def start(self):
         self.running = True
@@ -27,6 +74,7 @@ class Kernel:
         
         # Subscribe to System Calls and Tool Use
         self.event_bus.subscribe("SystemCall", self._handle_system_call)
+        self.event_bus.register_responder("SystemCall", self._answer_system_call_inline)
         self.event_bus.subscribe("ToolUse", self._handle_tool_use)
         
         # Subscribe Logger to EVERYTHING (Mocking wildcard by explicit sub or modifying EventBus)
@@ -40,13 +88,21 @@ class Kernel:
         # Assuming EventBus update is coming, I will use a private method or update EventBus first.
         # Let's stick to modifying EventBus in next step.
         # For now, I'll assume I can attach it.
-        self.event_bus.subscribe_globally(self._handle_global_logging)
+        # The file write runs on its own delivery worker so it never delays publishers.
+        self.event_bus.subscribe_globally(self._handle_global_logging, delivery=DELIVERY_ASYNC)
 
         # Start all registered actors
         for name, actor in self.actors.items():
             self._spawn_actor_task(actor)
+
+        # Agents hibernated by a previous run wake up when addressed
+        self.dormant.update(name for name in self.hibernation.names() if name not in self.actors)
+
+        self._housekeeping = asyncio.create_task(self._run_housekeeping(), name="KernelHousekeeping")
             
     async def _handle_global_logging(self, event: Dict[str, Any]):
+        if event.get("type") in EPHEMERAL_EVENT_TYPES:
+            return
         await self.event_logger.log_event(event)
 
     async def _handle_tool_use(self, event: Dict[str, Any]):
@@ -55,24 +111,12 @@ class Kernel:
         tool_name = event.get("tool")
         args = event.get("args")
         
-        # Simple Loop Detection: 3 identical calls in a row
-        history = self.tool_history.setdefault(actor_name, [])
-        
-        # Store simplified signature
-        call_sig = (tool_name, json.dumps(args, sort_keys=True))
-        history.append(call_sig)
-        
-        # Keep last 10
-        if len(history) > 10:
-            history.pop(0)
-            
-        # Check last 3
-        if len(history) >= 3:
-            if history[-1] == history[-2] == history[-3]:
-                logger.warning(f"Loop detected for {actor_name}: {tool_name} called 3 times with same args.")
-                await self.interrupt_agent(actor_name, f"Loop Detected: You are repeating {tool_name} with same arguments. Stop.")
-                # Clear history to avoid continuous interruption?
-                self.tool_history[actor_name] = []
+        reason = self.loop_detector.observe(actor_name, tool_name, args)
+        if reason:
+            logger.warning(f"Loop detected for {actor_name}: {reason}.")
+            await self.interrupt_agent(actor_name, f"Loop Detected: You are {reason}. Stop and try a different approach.", preempt=True)
+            # Start over so the agent is not interrupted again by the same calls
+            self.loop_detector.reset(actor_name)
 
     async def _handle_system_call(self, event: Dict[str, Any]):
         """Processes system calls from agents."""
@@ -83,6 +127,39 @@ class Kernel:
 
         logger.info(f"Kernel handling system call '{command}' from {sender}")
         
+        result = await self._execute_system_call(command, args, sender, event.get("correlation_id"))
+
+        # Request/reply: resolve the caller's future directly
+        reply_to = event.get("reply_to")
+        if reply_to:
+            self.event_bus.reply(reply_to, result)
+            return
+
+        # Send result back
+        if sender:
+             await self.event_bus.publish(SystemCallResult(
+                 target=sender,
+                 content=result,
+                 tool_call_id=tool_id
+             ))
+
+    def _answer_system_call_inline(self, event: Dict[str, Any]) -> Any:
+        """Fast path for `bus.request`: answers non-blocking system calls without a bus round trip."""
+        command = event.get("command")
+        if command == "wait":
+            return self.schedule_wakeup(event.get("sender"), event.get("args", {}), event.get("correlation_id"))
+        if command not in INLINE_SYSTEM_CALLS:
+            return NO_REPLY
+        logger.info(f"Kernel answering system call '{command}' from {event.get('sender')} inline")
+        return self._execute_inline_system_call(command, event.get("args", {}), event.get("sender"))
+
+    async def _execute_system_call(self, command: str, args: Dict[str, Any], sender: Optional[str] = None,
+                                   correlation_id: Optional[str] = None) -> str:
+        """Runs a system call. Agent names in `args` are relative to the sender's session."""
+        if command in INLINE_SYSTEM_CALLS:
+            return self._execute_inline_system_call(command, args, sender)
+        scope = split_address(sender)[1] if sender else None
+
         result = "Unknown command"
         
         if command == "spawn_agent":
@@ -92,55 +169,382 @@ class Kernel:
             # In real dynamic spawning, we'd need to dynamically create the class or instance
             # For now, we reuse the base Agent class
             from grok_team.agent import Agent
-            success, msg = await self.spawn_agent(name, role, Agent, temperature=temp)
+            success, msg = await self.spawn_agent(make_address(name, scope), role, Agent, temperature=temp)
             result = msg
             
+        elif command == "wait":
+            result = self.schedule_wakeup(sender, args, correlation_id)
+
         elif command == "kill_agent":
             name = args.get("name")
-            success, msg = await self.kill_agent(name)
+            success, msg = await self.kill_agent(self._resolve_actor_name(name, sender))
             result = msg
-            
-        elif command == "list_agents":
-            result = json.dumps(list(self.actors.keys())) # JSON string for tool output
 
-        elif command == "allocate_budget":
+        return result
+
+    def _execute_inline_system_call(self, command: str, args: Dict[str, Any], sender: Optional[str] = None) -> str:
+        if command == "list_agents":
+            # Only the sender's own session (or the unscoped agents) is visible
+            scope = split_address(sender)[1] if sender else None
+            names = [actor.display_name for actor in self.actors.values() if getattr(actor, "scope", None) == scope]
+            names += [display for display, dormant_scope in map(split_address, sorted(self.dormant)) if dormant_scope == scope]
+            return json.dumps(names) # JSON string for tool output
+
+        if command == "allocate_budget":
             target_agent = args.get("agent_name")
             amount = args.get("amount")
-            if target_agent in self.actors:
-                await self.actors[target_agent].inbox.put({
+            address = self._resolve_actor_name(target_agent, sender)
+            if address in self.actors:
+                # Control lane: never blocks, even when the inbox is full.
+                self.actors[address].inbox.put_nowait({
                     "type": "BudgetUpdate",
                     "amount": amount
                 })
-                result = f"Allocated {amount} budget to {target_agent}"
-            else:
-                result = f"Agent {target_agent} not found"
+                return f"Allocated {amount} budget to {target_agent}"
+            return f"Agent {target_agent} not found"
 
-        # Send result back
-        if sender:
-             await self.event_bus.publish({
-                 "type": "SystemCallResult",
-                 "target": sender,
-                 "content": result,
-                 "tool_call_id": tool_id
-             })
+        return "Unknown command"
+
+    def _resolve_actor_name(self, name: Optional[str], sender: Optional[str]) -> Optional[str]:
+        """Resolves a display name against the sender's session, falling back to the global name."""
+        if not name or not sender:
+            return name
+        scoped = make_address(name, split_address(sender)[1])
+        return scoped if scoped in self.actors else name
+
+    # --- Conversation sessions ---
+
+    async def open_session(self, conversation_id: str) -> AgentSession:
+        """Returns the agent session of a conversation, creating its team on first use."""
+        async with self._session_lock:
+            session = self.sessions.get(conversation_id)
+            if session is not None:
+                session.touch()
+                return session
+
+            from grok_team.agent import Agent
+            session = AgentSession(conversation_id)
+            for name in ALL_AGENT_NAMES:
+                agent = Agent(session.address(name), self.event_bus)
+                self._add_to_session(session, agent)
+                if name in ROLE_POOLS and POOL_MAX_SIZE > 1:
+                    self.create_pool(agent)
+            self.sessions[conversation_id] = session
+            logger.info(f"Kernel opened session for conversation '{conversation_id}'.")
+            return session
+
+    async def close_session(self, conversation_id: str) -> bool:
+        """Stops and unregisters every actor of a conversation session."""
+        session = self.sessions.pop(conversation_id, None)
+        if session is None:
+            return False
+        tasks = []
+        for actor in session.actors.values():
+            actor.stop()
+            task = self.tasks.pop(actor.name, None)
+            if task is not None:
+                tasks.append(task)
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        for actor in session.actors.values():
+            self.actors.pop(actor.name, None)
+            self.loop_detector.reset(actor.name)
+            self.supervisor.forget(actor.name)
+            self.event_bus.unregister_actor(actor.name)
+            self.spawned.discard(actor.name)
+        for actor in session.actors.values():
+            if self.pools.pop(actor.name, None) is not None:
+                self.event_bus.remove_dispatcher(actor.name)
+        for name in [n for n in self.dormant if split_address(n)[1] == conversation_id]:
+            self.dormant.discard(name)
+            self.hibernation.delete(name)
+        logger.info(f"Kernel closed session for conversation '{conversation_id}'.")
+        return True
+
+    async def evict_idle_sessions(self, idle_ttl: float = SESSION_IDLE_TTL) -> list:
+        """Closes sessions that have been idle for `idle_ttl` seconds. Returns their ids."""
+        idle = [cid for cid, session in self.sessions.items() if session.is_idle(idle_ttl)]
+        for conversation_id in idle:
+            await self.close_session(conversation_id)
+        return idle
+
+    def _add_to_session(self, session: AgentSession, actor: Actor):
+        actor.session = session
+        session.actors[actor.display_name] = actor
+        self.register_actor(actor)
+        if self.running:
+            self._spawn_actor_task(actor)
+
+    async def _run_housekeeping(self):
+        """Periodically evicts idle sessions, expires parked work and hibernates idle spawned agents."""
+        while self.running:
+            await asyncio.sleep(HOUSEKEEPING_INTERVAL)
+            try:
+                evicted = await self.evict_idle_sessions()
+                if evicted:
+                    logger.info(f"Kernel evicted idle sessions: {evicted}")
+                await self.expire_parked_work()
+                if HIBERNATE_AFTER > 0:
+                    await self.hibernate_idle_agents(HIBERNATE_AFTER)
+                if self.pools:
+                    await self.shrink_pools(POOL_IDLE_SHRINK)
+                if SNAPSHOT_INTERVAL > 0 and time.monotonic() - self._last_snapshot >= SNAPSHOT_INTERVAL:
+                    await self.checkpoint()
+            except Exception as e:
+                logger.error(f"Kernel housekeeping failed: {e}")
+
+    # --- Wake-ups ---
+
+    def schedule_wakeup(self, target: str, args: Dict[str, Any], correlation_id: Optional[str] = None) -> str:
+        """
+        Implements the `wait` tool: sends `target` a WakeUp after `seconds`, or
+        when process `pid` exits / prints a line matching `pattern` (bounded by
+        `timeout`). Nothing runs in between, so waiting costs no LLM calls.
+        """
+        from grok_team.tools import PROCESS_REGISTRY, watch_process
+
+        seconds, pid, pattern = args.get("seconds"), args.get("pid"), args.get("pattern")
+        timeout = args.get("timeout") or (seconds if pid is not None else None)
+        if seconds is None and pid is None:
+            return "Error: wait needs `seconds` or `pid`"
+        if target is None:
+            return "Error: wait needs a sender"
+        try:
+            regex = re.compile(pattern) if pattern else None
+        except re.error as e:
+            return f"Error: invalid pattern: {e}"
+        entry = PROCESS_REGISTRY.get(pid) if pid is not None else None
+        if pid is not None and entry is None:
+            return "Error: PID not found."
+
+        handles = {"timer": None, "unwatch": None, "fired": False}
+
+        def recent_logs() -> str:
+            return "\n".join(entry["logs"][-20:]) if entry else ""
+
+        def fire(reason: str, content: str):
+            if handles["fired"]:
+                return
+            handles["fired"] = True
+            if handles["timer"] is not None:
+                handles["timer"].cancel()
+            if handles["unwatch"] is not None:
+                handles["unwatch"]()
+            asyncio.create_task(self.event_bus.publish(WakeUp(
+                target=target, from_="Kernel", correlation_id=correlation_id,
+                reason=reason, content=content, reply_to=args.get("reply_to"),
+            )))
+
+        if pid is None:
+            handles["timer"] = self.timers.call_later(float(seconds), fire, "timer", f"{seconds}s elapsed.")
+            return f"Sleeping for {seconds}s."
+
+        def on_output(kind: str, text: str):
+            if kind == "exit":
+                fire("process exited", f"Process {pid} exited with code {text}. Last logs:\n{recent_logs()}")
+            elif regex is not None and regex.search(text):
+                fire("pattern matched", f"Process {pid} printed: {text}\nLast logs:\n{recent_logs()}")
+
+        # The condition may already hold (fast output, or a process that is gone)
+        if regex is not None:
+            for line in entry["logs"]:
+                if regex.search(line):
+                    on_output("line", line)
+                    return f"Pattern already matched in the logs of process {pid}."
+        if entry["proc"].returncode is not None:
+            on_output("exit", str(entry["proc"].returncode))
+            return f"Process {pid} already exited."
+
+        handles["unwatch"] = watch_process(pid, on_output)
+        if timeout:
+            handles["timer"] = self.timers.call_later(
+                float(timeout), lambda: fire("timeout", f"Still waiting on process {pid} after {timeout}s. Last logs:\n{recent_logs()}"))
+        condition = f"a line matching {pattern!r}" if regex is not None else "its exit"
+        return f"Watching process {pid} for {condition}."
+
+    # --- Role pools ---
+
+    def create_pool(self, base: Actor, max_size: int = POOL_MAX_SIZE) -> RolePool:
+        """Turns `base`'s address into a role served by a pool of clones of it."""
+        pool = RolePool(base, self._clone_pool_member, max_size=max_size)
+        self.pools[base.name] = pool
+        self.event_bus.set_dispatcher(base.name, pool.dispatch)
+        return pool
+
+    def _clone_pool_member(self, pool: RolePool) -> Actor:
+        base = pool.base
+        display, scope = split_address(base.name)
+        clone = type(base)(
+            make_address(f"{display}-{pool.next_clone_id()}", scope), self.event_bus,
+            system_prompt=base.system_prompt,
+            temperature=base.temperature,
+            priority_class=base.priority_class,
+            batch_messages=base.batch_messages,
+        )
+        session = self.sessions.get(scope) if scope else None
+        if session is not None:
+            clone.session = session
+            session.actors[clone.display_name] = clone
+        self.register_actor(clone)
+        if self.running:
+            self._spawn_actor_task(clone)
+        return clone
+
+    async def shrink_pools(self, idle_for: float = POOL_IDLE_SHRINK) -> list:
+        """Retires pool clones idle for `idle_for` seconds. Returns their names."""
+        retired = []
+        for pool in list(self.pools.values()):
+            for clone in pool.idle_clones(idle_for):
+                pool.retire(clone)
+                await self._remove_actor(clone)
+                retired.append(clone.name)
+        return retired
+
+    async def expire_parked_work(self) -> int:
+        """Fails work parked (out of budget) for longer than ACTOR_PARKING_TTL, on every actor."""
+        expired = 0
+        for actor in list(self.actors.values()):
+            if hasattr(actor, "expire_parked"):
+                expired += await actor.expire_parked()
+        if expired:
+            logger.info(f"Kernel expired {expired} parked messages.")
+        return expired
+
+    async def _remove_actor(self, actor: Actor, cancel: bool = False):
+        """Stops (or with `cancel`, kills) an actor and forgets it everywhere (kernel, bus, session)."""
+        actor.stop()
+        task = self.tasks.pop(actor.name, None)
+        if task is not None:
+            if cancel:
+                task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        self.actors.pop(actor.name, None)
+        self.loop_detector.reset(actor.name)
+        self.supervisor.forget(actor.name)
+        self.event_bus.unregister_actor(actor.name)
+        if actor.session is not None:
+            actor.session.actors.pop(actor.display_name, None)
+        logger.info(f"Kernel removed actor '{actor.name}'.")
+
+    # --- Hibernation ---
+
+    async def hibernate_idle_agents(self, idle_for: float = HIBERNATE_AFTER) -> list:
+        """Hibernates spawned agents that have been idle for `idle_for` seconds. Returns their names."""
+        hibernated = []
+        for name in list(self.spawned):
+            actor = self.actors.get(name)
+            task = self.tasks.get(name)
+            # Agents whose task has ended (killed, crashed for good) are not parked for later
+            if task is None or task.done():
+                continue
+            if actor is not None and hasattr(actor, "is_idle") and actor.is_idle(idle_for):
+                if await self.hibernate_agent(name):
+                    hibernated.append(name)
+        return hibernated
+
+    async def hibernate_agent(self, name: str) -> bool:
+        """
+        Stops an agent and moves its state (messages, budget, temperature, tool
+        history) to disk. The next message addressed to it wakes it up again.
+        """
+        actor = self.actors.get(name)
+        task = self.tasks.get(name)
+        if actor is None or not hasattr(actor, "export_state") or task is None or task.done():
+            return False
+
+        actor.stop()
+        task = self.tasks.pop(name, None)
+        if task is not None:
+            await asyncio.gather(task, return_exceptions=True)
+        state = actor.export_state()
+        state["tool_history"] = self.loop_detector.export(name)
+        await self.hibernation.save(name, state)
+
+        if actor.inbox.work_size() > 0:
+            # Work arrived while we were saving: keep the agent awake.
+            self.hibernation.delete(name)
+            self._spawn_actor_task(actor)
+            return False
+
+        self.actors.pop(name, None)
+        self.loop_detector.reset(name)
+        self.event_bus.unregister_actor(name)
+        self.dormant.add(name)
+        logger.info(f"Kernel hibernated idle agent '{name}'.")
+        await self.event_bus.publish({"type": "AgentHibernated", "actor": name, "from": "Kernel"})
+        return True
+
+    async def wake_agent(self, name: str) -> Optional[Any]:
+        """Returns the inbox of `name`, rehydrating it from disk if it is dormant."""
+        if name in self.actors:
+            return self.actors[name].inbox
+        if name not in self.dormant:
+            return None
+        waking = self._waking.get(name)
+        if waking is None:
+            # Concurrent messages to the same dormant agent share one wake-up.
+            waking = self._waking[name] = asyncio.ensure_future(self._rehydrate(name))
+            waking.add_done_callback(lambda _: self._waking.pop(name, None))
+        actor = await asyncio.shield(waking)
+        return actor.inbox if actor is not None else None
+
+    async def _rehydrate(self, name: str) -> Optional[Actor]:
+        state = await self.hibernation.load(name)
+        if state is None:
+            self.dormant.discard(name)
+            return None
+        actor = self._actor_from_state(state)
+        self.loop_detector.restore(name, state.get("tool_history") or [])
+        self.dormant.discard(name)
+        self.hibernation.delete(name)
+        self._spawn_actor_task(actor)
+        logger.info(f"Kernel woke hibernated agent '{name}'.")
+        await self.event_bus.publish({"type": "AgentWoken", "actor": name, "from": "Kernel"})
+        return actor
+
+    def metrics_snapshot(self) -> Dict[str, Any]:
+        """
+        Point-in-time runtime metrics: publish counts/rates per topic, handler
+        latency per subscriber, inbox wait per actor, processing time per
+        actor/message type and current queue depths.
+        """
+        snapshot = self.event_bus.metrics.snapshot()
+        snapshot["queue_depths"] = self.event_bus.queue_depths()
+        snapshot["llm_governor"] = self.llm_governor.snapshot()
+        return snapshot
 
     async def stop(self):
         self.running = False
         logger.info("Kernel stopping...")
+        if self._housekeeping is not None:
+            self._housekeeping.cancel()
+            self._housekeeping = None
+        for restart in list(self._restarts):
+            restart.cancel()
+        self.timers.stop()
         for name, actor in self.actors.items():
             actor.stop()
         
         if self.tasks:
             await asyncio.gather(*self.tasks.values(), return_exceptions=True)
+        self.tasks.clear()
+
+        # Session teams do not outlive the kernel run; they are rebuilt on demand.
+        for conversation_id in list(self.sessions):
+            await self.close_session(conversation_id)
+
+        # Flush observers (event log etc.) and release their worker tasks.
+        await self.event_bus.shutdown()
 
     def _spawn_actor_task(self, actor: Actor):
         task = asyncio.create_task(actor.start(), name=f"ActorTask-{actor.name}")
         self.tasks[actor.name] = task
-        task.add_done_callback(lambda t: self._handle_actor_exit(actor.name, t))
+        task.add_done_callback(lambda t: self._handle_actor_exit(actor, t))
         logger.info(f"Kernel spawned process for actor '{actor.name}'.")
 
-    def _handle_actor_exit(self, name: str, task: asyncio.Task):
-        """Zombie Reaper logic."""
+    def _handle_actor_exit(self, actor: Actor, task: asyncio.Task):
+        """Zombie Reaper logic: reports crashes and hands them to the supervisor."""
+        name = actor.name
         try:
             exc = task.exception()
             if exc:
@@ -150,25 +554,147 @@ class Kernel:
                     "type": "ActorCrashed",
                     "actor": name,
                     "error": str(exc),
-                    "target": "Grok" # Notify Leader? Or a system supervisor?
+                    "target": make_address(LEADER_NAME, split_address(name)[1]) # Notify Leader? Or a system supervisor?
                 }))
+                if self.running and self.actors.get(name) is actor and self.tasks.get(name) is task:
+                    restart = asyncio.create_task(self._supervise_crash(actor, str(exc)), name=f"Restart-{name}")
+                    self._restarts.add(restart)
+                    restart.add_done_callback(self._restarts.discard)
             else:
                 logger.info(f"Actor '{name}' exited normally.")
         except asyncio.CancelledError:
             logger.info(f"Actor '{name}' was cancelled.")
 
+    async def _supervise_crash(self, actor: Actor, error: str):
+        """Restarts a crashed actor from its last checkpoint, redelivering the failed message once."""
+        name = actor.name
+        crashed = getattr(actor, "crashed_message", None)
+        if hasattr(actor, "crashed_message"):
+            actor.crashed_message = None
+        message, parked_at = crashed if crashed else (None, None)
+        if message is not None and parked_at is None:
+            actor.inbox.task_done()
+
+        delay = self.supervisor.restart_delay(name)
+        if delay is None:
+            logger.error(f"Supervisor: giving up on actor '{name}'.")
+            await self._fail_crashed_message(name, message, error)
+            return
+        await asyncio.sleep(delay)
+        if not self.running or self.actors.get(name) is not actor:
+            return
+
+        checkpoint = getattr(actor, "checkpoint", None)
+        if checkpoint is not None:
+            actor.restore_checkpoint(checkpoint)
+        if message is not None:
+            if message.get("redelivered"):
+                # It already crashed the actor once: do not let it crash-loop.
+                await self._fail_crashed_message(name, message, error)
+            else:
+                # Back at the head, so newer work does not overtake it
+                actor.inbox.put_front(evolve(message, {"redelivered": True}))
+        self._spawn_actor_task(actor)
+        logger.info(f"Supervisor restarted actor '{name}' after {delay:.2f}s.")
+        await self.event_bus.publish({"type": "ActorRestarted", "actor": name, "from": "Kernel"})
+
+    async def _fail_crashed_message(self, name: str, message: Optional[Dict[str, Any]], error: str):
+        """Tells the sender of a message that crashed its handler, so it does not wait forever."""
+        if message is None or not message.get("from"):
+            return
+        await self.event_bus.publish(TaskFailed(
+            target=message["from"],
+            from_=name,
+            correlation_id=message.get("correlation_id"),
+            error=f"Actor crashed: {error}",
+        ))
+
+    def _actor_from_state(self, state: Dict[str, Any]) -> Actor:
+        """Rebuilds and registers a spawned agent from `export_state()` output (its task is not started)."""
+        name = state["name"]
+        actor_cls = resolve_actor_class(state["class"])
+        actor = actor_cls(
+            name, self.event_bus,
+            system_prompt=state.get("system_prompt"),
+            temperature=state.get("temperature"),
+            priority_class=state.get("priority_class"),
+            batch_messages=state.get("batch_messages"),
+        )
+        actor.restore_state(state)
+        scope = split_address(name)[1]
+        session = self.sessions.get(scope) if scope else None
+        if session is not None:
+            actor.session = session
+            session.actors[actor.display_name] = actor
+        self.register_actor(actor)
+        self.spawned.add(name)
+        return actor
+
+    # --- Snapshots ---
+
+    def snapshot_state(self) -> Dict[str, Any]:
+        """Roster, agent state (messages, budget, undelivered work) and tool history."""
+        actors = []
+        for name, actor in self.actors.items():
+            if not hasattr(actor, "export_state"):
+                continue
+            state = actor.export_state()
+            state["spawned"] = name in self.spawned
+            state["pending"] = [dict(message) for message in actor.pending_work()]
+            actors.append(state)
+        return {
+            "actors": actors,
+            "sessions": list(self.sessions),
+            "tool_history": {name: self.loop_detector.export(name) for name in self.loop_detector.histories},
+        }
+
+    async def checkpoint(self) -> int:
+        """
+        Writes a snapshot next to the event log and compacts the events it
+        covers. Returns the sequence number the snapshot is valid for.
+        """
+        # Every event published so far must be in the log before the sequence
+        # number is read; nothing may run between reading it and capturing state.
+        await self.event_bus.drain()
+        seq = self.event_logger.sequence
+        snapshot = {"seq": seq, "taken_at": datetime.utcnow().isoformat(), **self.snapshot_state()}
+        self._last_snapshot = time.monotonic()
+        await self.event_logger.write_snapshot(snapshot)
+        dropped = await self.event_logger.compact(seq)
+        logger.info(f"Kernel snapshot at seq {seq}; compacted {dropped} events.")
+        return seq
+
+    async def _restore_snapshot(self, snapshot: Dict[str, Any]):
+        for conversation_id in snapshot.get("sessions", []):
+            await self.open_session(conversation_id)
+        for state in snapshot.get("actors", []):
+            name = state["name"]
+            actor = self.actors.get(name)
+            if actor is None:
+                actor = self._actor_from_state(state)
+                if self.running:
+                    self._spawn_actor_task(actor)
+            else:
+                actor.restore_state(state)
+                if state.get("spawned"):
+                    self.spawned.add(name)
+            for message in state.get("pending", []):
+                actor.replay_event({**message, "target": name})
+        for name, history in snapshot.get("tool_history", {}).items():
+            self.loop_detector.restore(name, history)
+
     # --- System Calls for Leader ---
 
-    async def spawn_agent(self, name: str, system_prompt: str, agent_cls=None, **kwargs):
-        if name in self.actors:
+    async def spawn_agent(self, name: str, system_prompt: str, agent_cls=None, placement: Optional[str] = None, **kwargs):
+        """
+        Creates and starts an agent. `placement` is "local" (this event loop) or
+        "process" (a worker process bridged to the bus); defaults to ACTOR_PLACEMENT.
+        """
+        if name in self.actors or name in self.dormant:
             return False, "Agent already exists"
-            
-        if agent_cls is None:
-             from grok_team.agent import Agent
-             agent_cls = Agent
-
-        new_agent = agent_cls(name, self.event_bus, system_prompt=system_prompt, **kwargs)  # Create instance
-        self.register_actor(new_agent)
+        new_agent, error = self._build_agent(name, system_prompt, agent_cls, placement, **kwargs)
+        if new_agent is None:
+            return False, error
         self._spawn_actor_task(new_agent)
         
         # Publish Event
@@ -181,20 +707,60 @@ class Kernel:
         
         return True, "Spawned"
 
-    async def interrupt_agent(self, name: str, reason: str = None):
+    def _build_agent(self, name: str, system_prompt: str, agent_cls=None, placement: Optional[str] = None, **kwargs):
+        """Creates and registers a spawned agent without starting it. Returns (agent, error)."""
+        if agent_cls is None:
+             from grok_team.agent import Agent
+             agent_cls = Agent
+
+        placement = placement or ACTOR_PLACEMENT
+        if placement == "process":
+            from grok_team.process_placement import RemoteActor
+            new_agent = RemoteActor(name, self.event_bus, agent_cls, dict(system_prompt=system_prompt, **kwargs))
+        elif placement == "local":
+            new_agent = agent_cls(name, self.event_bus, system_prompt=system_prompt, **kwargs)  # Create instance
+        else:
+            return None, f"Unknown placement: {placement}"
+        # Agents spawned from inside a conversation belong to its session
+        display, scope = split_address(name)
+        session = self.sessions.get(scope) if scope else None
+        if session is not None:
+            new_agent.session = session
+            session.actors[display] = new_agent
+        self.register_actor(new_agent)
+        self.spawned.add(name)
+        return new_agent, None
+
+    async def interrupt_agent(self, name: str, reason: str = None, preempt: bool = False):
+        """Sends an InterruptSignal; with `preempt` the agent's running step is cancelled."""
         if name in self.actors:
             payload = {"type": "InterruptSignal"}
             if reason:
                 payload["content"] = reason
+            if preempt:
+                payload["preempt"] = True
             await self.actors[name].inbox.put(payload)
             return True, "Interrupted"
         return False, "Agent not found"
 
     async def kill_agent(self, name: str):
-        if name in self.tasks:
-            task = self.tasks[name]
-            task.cancel()
-            
+        if name in self.dormant:
+            self.dormant.discard(name)
+            self.hibernation.delete(name)
+            await self.event_bus.publish({
+                "type": "AgentStopped",
+                "actor": name,
+                "from": "Kernel",
+                "reason": "Killed by User/System"
+            })
+            return True, "Killed"
+        actor = self.actors.get(name)
+        if actor is not None:
+            for pool in self.pools.values():
+                pool.retire(actor)
+            await self._remove_actor(actor, cancel=True)
+            self.spawned.discard(name)
+
             await self.event_bus.publish({
                 "type": "AgentStopped",
                 "actor": name,
@@ -206,63 +772,44 @@ class Kernel:
         return False, "Agent not found"
 
     async def recover_session(self):
-        """Reconstructs state from the event log."""
+        """Reconstructs state from the latest snapshot plus the events logged after it."""
         logger.info("Recovering session from event log...")
-        events = self.event_logger.get_all_events()
-        if not events:
+        snapshot = self.event_logger.load_snapshot()
+        after_seq = 0
+        if snapshot:
+            await self._restore_snapshot(snapshot)
+            after_seq = snapshot.get("seq", 0)
+
+        replayed = 0
+        for event in self.event_logger.iter_events(after_seq=after_seq):
+            await self._replay_event(event)
+            replayed += 1
+        if not snapshot and not replayed:
             logger.info("No events found. Starting fresh.")
             return
+        logger.info(f"Session recovered: snapshot at seq {after_seq}, {replayed} events replayed.")
 
-        # Clear current state (if any)
-        # self.stop() # Should be called before
-        self.actors.clear()
-        
-        # We need to replay "structural" events first to ensure actors exist?
-        # Or just replay in order.
-        
-        for event in events:
-            etype = event.get("type")
-            
-            if etype == "SystemCall":
-                # Check for spawn
-                cmd = event.get("command")
-                if cmd == "spawn_agent":
-                    args = event.get("args", {})
-                    name = args.get("name")
-                    prompt = args.get("system_prompt")
-                    temp = args.get("temperature", 0.7)
-                    if name and name not in self.actors:
-                        from grok_team.agent import Agent
-                        # We spawn but maybe NOT start the task yet? Or start it.
-                        await self.spawn_agent(name, prompt, Agent, temperature=temp)
-                        
-            elif etype == "TaskSubmitted":
-                # User sent message to Agent
-                target = event.get("target") # or is it routed via 'to'? 
-                # Wait, TaskSubmitted usually has 'target' (inbox) or handled by someone.
-                # In `handle_message`: "TaskSubmitted" content is archived as "user" message.
-                # We need to manually append to agent's memory if we want to restore state.
-                sender = event.get("from", "User")
-                content = event.get("content")
-                
-                # We need to know who received it. The event bus routing logic uses 'target'.
-                # But `TaskSubmitted` might be broadcast.
-                # Let's assume we can inhibit the *logic* triggering if we are recovering.
-                # The Actors are running! If we send them messages, they will REACT.
-                # We do NOT want them to react during recovery. 
-                # We just want to fill their state.
-                
-                # CRITICAL: We need a way to silent-load state.
-                # Access actors directly.
-                target_actor = event.get("target") # Currently our events might not have 'target' if broadcast?
-                # Usage: sender sends TaskSubmitted. 
-                # If we modify Agent to expose `restore_message`...
-                pass # Complex to fully replay without side effects without refactoring Agent.
-                
-                # MVP Strategy:
-                # 1. Re-spawn agents.
-                # 2. We skip message replay for now in this iteration unless we refactor Agent to support "hydration".
-                #    Ideally, Agent state snapshots should be logged.
-                #    Event Sourcing usually requires "apply" methods.
-                
-        logger.info("Session recovery: Agents respawned (MVP). Full state restoration requires Agent hydration.")
+    async def _replay_event(self, event: Dict[str, Any]):
+        """Applies one logged event to the kernel's state without triggering any reaction."""
+        etype = event.get("type")
+        if etype == "SystemCall" and event.get("command") == "spawn_agent":
+            args = event.get("args", {})
+            sender = event.get("sender")
+            # Scoped like the live spawn (see _execute_system_call), and rebuilt
+            # without publishing AgentSpawned again
+            name = make_address(args.get("name"), split_address(sender)[1] if sender else None) if args.get("name") else None
+            if name and name not in self.actors and name not in self.dormant:
+                from grok_team.agent import Agent
+                actor, _ = self._build_agent(name, args.get("system_prompt"), Agent, temperature=args.get("temperature", 0.7))
+                if actor is not None and self.running:
+                    self._spawn_actor_task(actor)
+        elif etype == "ToolUse":
+            actor_name = event.get("actor")
+            if self.loop_detector.observe(actor_name, event.get("tool"), event.get("args")):
+                # The live kernel interrupted the agent and started over here
+                self.loop_detector.reset(actor_name)
+        else:
+            for name in (event.get("target"), event.get("from")):
+                actor = self.actors.get(name) if name else None
+                if actor is not None and hasattr(actor, "replay_event"):
+                    actor.replay_event(event)
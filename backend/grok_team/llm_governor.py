@@ -0,0 +1,267 @@
+"""
+Kernel-wide governor for LLM API calls.
+
+Every chat completion goes through `LLMGovernor.call`, which
+  1. waits for a concurrency slot; waiting calls are ordered by weighted fair
+     queueing over (priority class, flow) pairs, where the flow is usually the
+     conversation, so interactive work goes first and one busy conversation
+     cannot starve the others,
+  2. waits until the requests-per-minute and tokens-per-minute buckets can
+     cover the call,
+  3. runs the call, retrying rate-limited (429) attempts with backoff.
+
+The concurrency limit follows AIMD: it grows by about one slot per limit's
+worth of fast successes and is halved on a 429 (or shrunk a little when a
+call is slower than LLM_LATENCY_TARGET).
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+from grok_team.config import (
+    LLM_RPM,
+    LLM_TPM,
+    LLM_INITIAL_CONCURRENCY,
+    LLM_MIN_CONCURRENCY,
+    LLM_MAX_CONCURRENCY,
+    LLM_LATENCY_TARGET,
+    LLM_MAX_RETRIES,
+    LLM_PRIORITY_WEIGHTS,
+)
+from grok_team.metrics import MetricsRegistry
+from grok_team.tokens import messages_tokens
+
+logger = logging.getLogger(__name__)
+
+# Priority classes of LLM work
+PRIORITY_INTERACTIVE = "interactive"  # the leader answering a user
+PRIORITY_NORMAL = "normal"            # collaborators
+PRIORITY_BACKGROUND = "background"    # shadow / critic / housekeeping work
+
+_BACKOFF_BASE = 1.0
+_BACKOFF_MAX = 60.0
+
+
+class TokenBucket:
+    """Continuously refilled bucket holding up to one minute of `per_minute` units (0 = unlimited)."""
+
+    def __init__(self, per_minute: float):
+        self.per_minute = per_minute
+        self.capacity = per_minute
+        self.tokens = per_minute
+        self._updated = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.per_minute <= 0
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.per_minute / 60.0)
+        self._updated = now
+
+    def delay_for(self, amount: float) -> float:
+        """Seconds until `amount` units are available (0 if they are now)."""
+        if self.unlimited:
+            return 0.0
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) * 60.0 / self.per_minute
+
+    def consume(self, amount: float):
+        """Takes `amount` units; a negative amount gives units back. The bucket may go into debt."""
+        if self.unlimited:
+            return
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - min(amount, self.capacity))
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    if getattr(error, "status_code", None) == 429:
+        return True
+    return type(error).__name__ == "RateLimitError"
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """Retry-After hint (seconds) of a rate limit error, if the provider sent one."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        value = headers.get("retry-after")
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def estimate_request_tokens(request: Dict[str, Any]) -> int:
+    """Rough token cost of a chat completion request: prompt (cached per message) plus max_tokens."""
+    return messages_tokens(request.get("messages", [])) + int(request.get("max_tokens") or 0)
+
+
+class LLMGovernor:
+    def __init__(self, rpm: float = LLM_RPM, tpm: float = LLM_TPM,
+                 initial_concurrency: float = LLM_INITIAL_CONCURRENCY,
+                 min_concurrency: int = LLM_MIN_CONCURRENCY,
+                 max_concurrency: int = LLM_MAX_CONCURRENCY,
+                 latency_target: float = LLM_LATENCY_TARGET,
+                 max_retries: int = LLM_MAX_RETRIES,
+                 weights: Optional[Dict[str, float]] = None,
+                 metrics: Optional[MetricsRegistry] = None):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.min_concurrency = max(1, min_concurrency)
+        self.max_concurrency = max(self.min_concurrency, max_concurrency)
+        self.limit = float(min(max(initial_concurrency, self.min_concurrency), self.max_concurrency))
+        self.latency_target = latency_target
+        self.max_retries = max_retries
+        self.metrics = metrics or MetricsRegistry()
+        self.weights = dict(weights or LLM_PRIORITY_WEIGHTS)
+        self.in_flight = 0
+        # Self-clocked fair queue: heap of (finish tag, seq, waiter, class). A flow's
+        # calls are spaced 1/weight apart in virtual time.
+        self._queue: List[Tuple[float, int, asyncio.Future, str]] = []
+        self._flow_finish: Dict[Tuple[str, Hashable], float] = {}
+        self._virtual_time = 0.0
+        self._seq = itertools.count()
+        # Nobody starts a call before this time (set after a 429)
+        self._cooldown_until = 0.0
+        self._consecutive_limited = 0
+
+    # --- public API ---
+
+    async def call(self, fn: Callable[[], Awaitable[Any]], key: Hashable = None, estimated_tokens: int = 0,
+                   priority: str = PRIORITY_NORMAL) -> Any:
+        """
+        Runs `fn` under the governor; `key` is the fairness flow (e.g. the conversation).
+        Rate-limited attempts are retried up to `max_retries` times.
+        """
+        attempt = 0
+        while True:
+            queued_at = time.monotonic()
+            await self.acquire(key, estimated_tokens, priority)
+            self.metrics.observe("llm.wait_seconds", priority, time.monotonic() - queued_at)
+            started = time.monotonic()
+            try:
+                result = await fn()
+            except Exception as e:
+                if not is_rate_limit_error(e):
+                    self.release()
+                    raise
+                self.release(rate_limited=True, hint=retry_after(e))
+                attempt += 1
+                if attempt > self.max_retries:
+                    raise
+                logger.warning(f"LLM rate limited (attempt {attempt}/{self.max_retries}); concurrency now {self.limit:.1f}")
+                continue
+            except BaseException:
+                self.release()
+                raise
+            latency = time.monotonic() - started
+            self.metrics.observe("llm.latency_seconds", key, latency)
+            self._settle_tokens(result, estimated_tokens)
+            self.release(latency=latency)
+            return result
+
+    async def acquire(self, key: Hashable = None, estimated_tokens: int = 0, priority: str = PRIORITY_NORMAL):
+        """Waits for a concurrency slot (fair-queued) and for rate budget. Pair with `release()`."""
+        if self.in_flight < int(self.limit) and not self._queue:
+            self.in_flight += 1
+        else:
+            await self._wait_for_slot(key, priority)
+        try:
+            await self._wait_for_budget(estimated_tokens)
+        except BaseException:
+            self.release()
+            raise
+
+    def release(self, latency: Optional[float] = None, rate_limited: bool = False, hint: Optional[float] = None):
+        """Frees a slot and feeds the outcome into the AIMD controller."""
+        self.in_flight -= 1
+        if rate_limited:
+            self.metrics.inc("llm.rate_limited")
+            self.limit = max(float(self.min_concurrency), self.limit / 2)
+            self._consecutive_limited += 1
+            pause = hint if hint is not None else _BACKOFF_BASE * 2 ** (self._consecutive_limited - 1)
+            self._cooldown_until = max(self._cooldown_until, time.monotonic() + min(pause, _BACKOFF_MAX))
+        elif latency is not None:
+            self._consecutive_limited = 0
+            if self.latency_target > 0 and latency > self.latency_target:
+                self.limit = max(float(self.min_concurrency), self.limit * 0.9)
+            else:
+                self.limit = min(float(self.max_concurrency), self.limit + 1.0 / self.limit)
+        self._grant()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "concurrency_limit": self.limit,
+            "in_flight": self.in_flight,
+            "queued": self._queued_by_class(),
+            "requests_available": None if self.requests.unlimited else self.requests.tokens,
+            "tokens_available": None if self.tokens.unlimited else self.tokens.tokens,
+            "cooldown": max(0.0, self._cooldown_until - time.monotonic()),
+        }
+
+    # --- internals ---
+
+    async def _wait_for_slot(self, key: Hashable, priority: str):
+        waiter = asyncio.get_running_loop().create_future()
+        flow = (priority, key)
+        weight = self.weights.get(priority) or self.weights.get(PRIORITY_NORMAL, 1.0)
+        finish = max(self._virtual_time, self._flow_finish.get(flow, 0.0)) + 1.0 / weight
+        self._flow_finish[flow] = finish
+        heapq.heappush(self._queue, (finish, next(self._seq), waiter, priority))
+        try:
+            await waiter
+        except BaseException:
+            # A cancelled waiter stays in the heap and is skipped by _grant().
+            if waiter.done() and not waiter.cancelled():
+                # Granted and cancelled in the same tick: hand the slot on.
+                self.release()
+            else:
+                waiter.cancel()
+            raise
+
+    def _grant(self):
+        while self.in_flight < int(self.limit) and self._queue:
+            finish, _, waiter, _ = heapq.heappop(self._queue)
+            if waiter.done():
+                continue
+            self._virtual_time = finish
+            self.in_flight += 1
+            waiter.set_result(None)
+        if not self._queue:
+            # Everyone idle: start the next busy period from a clean virtual clock.
+            self._flow_finish.clear()
+            self._virtual_time = 0.0
+
+    def _queued_by_class(self) -> Dict[str, int]:
+        queued: Dict[str, int] = {}
+        for _, _, waiter, priority in self._queue:
+            if not waiter.done():
+                queued[priority] = queued.get(priority, 0) + 1
+        return queued
+
+    async def _wait_for_budget(self, estimated_tokens: int):
+        while True:
+            delay = max(
+                self._cooldown_until - time.monotonic(),
+                self.requests.delay_for(1),
+                self.tokens.delay_for(estimated_tokens),
+            )
+            if delay <= 0:
+                self.requests.consume(1)
+                self.tokens.consume(estimated_tokens)
+                return
+            await asyncio.sleep(delay)
+
+    def _settle_tokens(self, result: Any, estimated_tokens: int):
+        """Corrects the token bucket with the usage the provider reported."""
+        usage = getattr(result, "usage", None)
+        total = getattr(usage, "total_tokens", None)
+        if isinstance(total, int):
+            self.tokens.consume(total - estimated_tokens)
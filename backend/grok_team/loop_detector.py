@@ -0,0 +1,181 @@
+"""
+Streaming detector for agents stuck in tool-call loops.
+
+Each actor has a fixed-size ring buffer of its recent calls. A call is kept as
+its tool name, normalized free-text arguments (string values only, lowercased,
+punctuation dropped), its other arguments (numbers, offsets, pids) verbatim, a
+hashed fingerprint of all three and a set of hashed character 3-gram shingles
+of the whole text. Two calls of the same tool are similar when their
+fingerprints match, or when their non-text arguments are equal and their
+shingle sets have a Jaccard similarity of at least `similarity` while differing
+in no more than a word or two (so long code sharing a preamble stays distinct).
+A loop is reported when
+  - the newest `repeats` calls are similar calls of one tool, or
+  - the newest calls repeat with a period of 2..LOOP_MAX_PERIOD (A,B,A,B)
+    `cycles` times over.
+Thresholds can be overridden per tool (LOOP_TOOL_THRESHOLDS); 0 disables a rule.
+"""
+import json
+import re
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from grok_team.config import (
+    LOOP_WINDOW,
+    LOOP_REPEATS,
+    LOOP_SIMILARITY,
+    LOOP_CYCLE_REPEATS,
+    LOOP_MAX_PERIOD,
+    LOOP_TOOL_THRESHOLDS,
+)
+
+_WORDS = re.compile(r"\w+")
+_SHINGLE = 3
+# Near-duplicates differ in at most this many shingles, however long the text
+_MAX_DIFFERENCE = 12
+
+
+def normalize_args(args: Any) -> Tuple[str, str]:
+    """
+    Splits arguments into (text, exact): free-text values as lowercase words,
+    and every other value (numbers, offsets, pids, flags) as it is. Only the
+    text is compared by similarity; the exact part has to match.
+    """
+    words: List[str] = []
+    exact: List[str] = []
+    _collect(args, words, exact)
+    return " ".join(words), json.dumps(exact)
+
+
+def _collect(value: Any, words: List[str], exact: List[str]):
+    if isinstance(value, dict):
+        for key in sorted(value):
+            _collect(value[key], words, exact)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _collect(item, words, exact)
+    elif isinstance(value, str):
+        words.extend(_WORDS.findall(value.lower()))
+    elif value is not None:
+        exact.append(str(value))
+
+
+class ToolCall:
+    __slots__ = ("tool", "text", "exact", "fingerprint", "shingles")
+
+    def __init__(self, tool: str, text: str, exact: str = "[]"):
+        self.tool = tool
+        self.text = text
+        self.exact = exact
+        self.fingerprint = hash((tool, exact, text))
+        if len(text) <= _SHINGLE:
+            self.shingles = frozenset((hash(text),))
+        else:
+            self.shingles = frozenset(hash(text[i:i + _SHINGLE]) for i in range(len(text) - _SHINGLE + 1))
+
+    def similar(self, other: "ToolCall", threshold: float) -> bool:
+        if self.fingerprint == other.fingerprint:
+            return True
+        if self.tool != other.tool or self.exact != other.exact or threshold >= 1.0:
+            return False
+        common = len(self.shingles & other.shingles)
+        total = len(self.shingles) + len(other.shingles)
+        return total - 2 * common <= _MAX_DIFFERENCE and common >= threshold * (total - common)
+
+
+class CallRing:
+    """Fixed-size ring buffer of an actor's most recent calls."""
+
+    def __init__(self, size: int):
+        self._items: List[Optional[ToolCall]] = [None] * size
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, call: ToolCall):
+        self._items[self._next] = call
+        self._next = (self._next + 1) % len(self._items)
+        self._count = min(self._count + 1, len(self._items))
+
+    def recent(self, n: Optional[int] = None) -> Iterator[ToolCall]:
+        """Newest first."""
+        size = len(self._items)
+        for back in range(1, min(self._count, n if n is not None else self._count) + 1):
+            yield self._items[(self._next - back) % size]
+
+    def __getitem__(self, back: int) -> ToolCall:
+        """ring[1] is the newest call, ring[2] the one before, ..."""
+        return self._items[(self._next - back) % len(self._items)]
+
+
+class LoopDetector:
+    def __init__(self, window: int = LOOP_WINDOW, max_period: int = LOOP_MAX_PERIOD,
+                 defaults: Optional[Dict[str, float]] = None,
+                 tool_thresholds: Optional[Dict[str, Dict[str, float]]] = None):
+        self.window = max(2, window)
+        self.max_period = max_period
+        self.defaults = defaults or {"repeats": LOOP_REPEATS, "similarity": LOOP_SIMILARITY, "cycles": LOOP_CYCLE_REPEATS}
+        self.tool_thresholds = LOOP_TOOL_THRESHOLDS if tool_thresholds is None else tool_thresholds
+        self.histories: Dict[str, CallRing] = {}
+
+    def thresholds(self, tool: str) -> Dict[str, float]:
+        override = self.tool_thresholds.get(tool)
+        return {**self.defaults, **override} if override else self.defaults
+
+    def observe(self, actor: str, tool: str, args: Any) -> Optional[str]:
+        """Records a call. Returns a description of the loop it completes, if any."""
+        call = ToolCall(tool, *normalize_args(args))
+        history = self.histories.get(actor)
+        if history is None:
+            history = self.histories[actor] = CallRing(self.window)
+        limits = self.thresholds(tool)
+        similarity = limits["similarity"]
+
+        reason = None
+        repeats = int(limits["repeats"])
+        if repeats > 0:
+            # Only an unbroken run counts: a call recurring between other work is not a loop
+            similar = 1
+            for previous in history.recent(repeats - 1):
+                if not call.similar(previous, similarity):
+                    break
+                similar += 1
+            if similar >= repeats:
+                reason = f"repeating {tool} with the same or near-identical arguments ({similar} times)"
+        history.append(call)
+
+        cycles = int(limits["cycles"])
+        if reason is None and cycles > 1:
+            period = self._cycle_period(history, cycles, similarity)
+            if period:
+                tools = ", ".join(history[back].tool for back in range(period, 0, -1))
+                reason = f"cycling through the same {period} calls ({tools}) {cycles} times"
+        return reason
+
+    def _cycle_period(self, history: CallRing, cycles: int, similarity: float) -> Optional[int]:
+        for period in range(2, self.max_period + 1):
+            span = period * cycles
+            if span > len(history):
+                break
+            # A single call repeated is not a cycle of this period (the repeats rule covers it)
+            if all(history[1].similar(history[back], similarity) for back in range(2, period + 1)):
+                continue
+            if all(history[back].similar(history[back + period], similarity) for back in range(1, span - period + 1)):
+                return period
+        return None
+
+    def reset(self, actor: str):
+        self.histories.pop(actor, None)
+
+    def export(self, actor: str) -> List[Tuple[str, str, str]]:
+        """The actor's recent calls, oldest first, as (tool, text args, exact args) triples."""
+        history = self.histories.get(actor)
+        if history is None:
+            return []
+        return [(call.tool, call.text, call.exact) for call in reversed(list(history.recent()))]
+
+    def restore(self, actor: str, calls: List[Tuple[str, ...]]):
+        history = self.histories[actor] = CallRing(self.window)
+        for call in calls[-self.window:]:
+            history.append(ToolCall(*call))
@@ -0,0 +1,331 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Overflow policies for bounded mailboxes.
+OVERFLOW_BLOCK = "block"              # publisher waits for free space (backpressure)
+OVERFLOW_DROP_OLDEST = "drop_oldest"  # evict the oldest queued message
+OVERFLOW_DROP_NEWEST = "drop_newest"  # reject the incoming message
+OVERFLOW_COALESCE = "coalesce"        # replace a queued message with the same key
+OVERFLOW_POLICIES = {OVERFLOW_BLOCK, OVERFLOW_DROP_OLDEST, OVERFLOW_DROP_NEWEST, OVERFLOW_COALESCE}
+
+# Control signals never count against capacity, are never dropped and are
+# delivered ahead of queued work.
+CONTROL_MESSAGE_TYPES = {"InterruptSignal", "PoisonPill", "BudgetUpdate"}
+
+# Mailbox lanes, lowest index is served first.
+CONTROL_LANE = 0
+WORK_LANE = 1
+
+OverflowCallback = Callable[[Dict[str, Any], str], None]
+
+
+def default_coalesce_key(message: Dict[str, Any]) -> Optional[Hashable]:
+    """Messages opt into coalescing by carrying a `coalesce_key`."""
+    return message.get("coalesce_key")
+
+
+def default_lane(message: Dict[str, Any]) -> int:
+    """Control signals go to lane 0; everything else is work (lane 1)."""
+    return CONTROL_LANE if message.get("type") in CONTROL_MESSAGE_TYPES else WORK_LANE
+
+
+class Mailbox:
+    """
+    Bounded, multi-lane priority inbox with a selectable overflow policy.
+    Exposes the subset of the `asyncio.Queue` API actors rely on.
+
+    `get()` always serves the lowest non-empty lane first, so control signals
+    (lane 0) overtake queued work. Lane 0 is unbounded and never dropped; the
+    other lanes share `maxsize`. `on_overflow(message, action)` is called for
+    every blocked, dropped or coalesced message, where action is one of
+    "blocked", "dropped", "coalesced".
+
+    When `wait_histogram` is set, the time each message spent queued is
+    observed into it on dequeue.
+    """
+
+    def __init__(self, maxsize: int = 0, policy: str = OVERFLOW_BLOCK,
+                 coalesce_key: Callable[[Dict[str, Any]], Optional[Hashable]] = default_coalesce_key,
+                 on_overflow: Optional[OverflowCallback] = None,
+                 lanes: int = 2, lane_of: Callable[[Dict[str, Any]], int] = default_lane):
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        if lanes < 2:
+            raise ValueError("A mailbox needs a control lane and at least one work lane")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.coalesce_key = coalesce_key
+        self.on_overflow = on_overflow
+        self.lane_of = lane_of
+        self.wait_histogram = None
+        # Entries are (enqueue time, message)
+        self._lanes: List[Deque[Tuple[float, Dict[str, Any]]]] = [deque() for _ in range(lanes)]
+        self._work_count = 0
+        self._getters: Deque[asyncio.Future] = deque()
+        self._control_getters: Deque[asyncio.Future] = deque()
+        self._putters: Deque[asyncio.Future] = deque()
+        self._unfinished = 0
+        self._finished = asyncio.Event()
+        self._finished.set()
+
+    # --- asyncio.Queue compatible API ---
+
+    def qsize(self) -> int:
+        return self._work_count + len(self._lanes[CONTROL_LANE])
+
+    def empty(self) -> bool:
+        return self.qsize() == 0
+
+    def full(self) -> bool:
+        return 0 < self.maxsize <= self._work_count
+
+    def work_size(self) -> int:
+        """Number of queued work (non-control) messages."""
+        return self._work_count
+
+    async def put(self, message: Dict[str, Any]) -> bool:
+        """Enqueues a message, applying the overflow policy. Returns False if it was dropped."""
+        lane = self._lane(message)
+        if lane == CONTROL_LANE or not self.full():
+            self._append(message, lane)
+            return True
+
+        if self.policy != OVERFLOW_BLOCK:
+            return self._overflow(message, lane)
+
+        self._notify_overflow(message, "blocked")
+        loop = asyncio.get_running_loop()
+        while self.full():
+            putter = loop.create_future()
+            self._putters.append(putter)
+            try:
+                await putter
+            except BaseException:
+                putter.cancel()
+                try:
+                    self._putters.remove(putter)
+                except ValueError:
+                    pass
+                if not self.full() and not putter.cancelled():
+                    self._wakeup_next(self._putters)
+                raise
+        self._append(message, lane)
+        return True
+
+    def put_nowait(self, message: Dict[str, Any]) -> bool:
+        """Like `put`, but raises `asyncio.QueueFull` instead of blocking."""
+        lane = self._lane(message)
+        if lane == CONTROL_LANE or not self.full():
+            self._append(message, lane)
+            return True
+        if self.policy == OVERFLOW_BLOCK:
+            raise asyncio.QueueFull
+        return self._overflow(message, lane)
+
+    def put_front(self, message: Dict[str, Any]):
+        """Puts a message back at the head of its lane (e.g. a redelivery), regardless of capacity."""
+        self._append(message, self._lane(message), front=True)
+
+    async def get(self) -> Dict[str, Any]:
+        """Returns the next message, control signals first."""
+        while self.empty():
+            await self._wait(self._getters, self.empty)
+        return self.get_nowait()
+
+    def get_nowait(self) -> Dict[str, Any]:
+        for lane, items in enumerate(self._lanes):
+            if items:
+                entry = items.popleft()
+                self._removed(lane)
+                return self._dequeued(entry)
+        raise asyncio.QueueEmpty
+
+    def take_work(self, predicate: Callable[[Dict[str, Any]], bool]) -> List[Dict[str, Any]]:
+        """
+        Removes and returns every queued work message matching `predicate`, in
+        arrival order, without waiting. Call `task_done()` for each of them.
+        """
+        taken: List[Dict[str, Any]] = []
+        for items in self._lanes[WORK_LANE:]:
+            if not items:
+                continue
+            kept = deque()
+            for entry in items:
+                if predicate(entry[1]):
+                    taken.append(self._dequeued(entry))
+                else:
+                    kept.append(entry)
+            items.clear()
+            items.extend(kept)
+        for _ in taken:
+            self._removed(WORK_LANE)
+        return taken
+
+    def peek_work(self) -> List[Dict[str, Any]]:
+        """Queued work messages in serving order, without removing them."""
+        return [message for items in self._lanes[WORK_LANE:] for _, message in items]
+
+    async def get_control(self) -> Dict[str, Any]:
+        """Waits for the next control signal only, leaving work messages queued."""
+        control = self._lanes[CONTROL_LANE]
+        while not control:
+            await self._wait(self._control_getters, lambda: not control)
+        return self._dequeued(control.popleft())
+
+    def task_done(self):
+        if self._unfinished <= 0:
+            raise ValueError("task_done() called too many times")
+        self._unfinished -= 1
+        if self._unfinished == 0:
+            self._finished.set()
+
+    async def join(self):
+        if self._unfinished > 0:
+            await self._finished.wait()
+
+    # --- internals ---
+
+    def _lane(self, message: Dict[str, Any]) -> int:
+        return max(CONTROL_LANE, min(self.lane_of(message), len(self._lanes) - 1))
+
+    def _append(self, message: Dict[str, Any], lane: int, front: bool = False):
+        entry = (time.monotonic(), message)
+        if front:
+            self._lanes[lane].appendleft(entry)
+        else:
+            self._lanes[lane].append(entry)
+        self._unfinished += 1
+        self._finished.clear()
+        if lane == CONTROL_LANE:
+            if self._wakeup_next(self._control_getters):
+                return
+        else:
+            self._work_count += 1
+        self._wakeup_next(self._getters)
+
+    def _dequeued(self, entry: Tuple[float, Dict[str, Any]]) -> Dict[str, Any]:
+        enqueued_at, message = entry
+        if self.wait_histogram is not None:
+            self.wait_histogram.observe(time.monotonic() - enqueued_at)
+        return message
+
+    def _removed(self, lane: int):
+        if lane != CONTROL_LANE:
+            self._work_count -= 1
+            self._wakeup_next(self._putters)
+
+    async def _wait(self, waiters: Deque[asyncio.Future], still_empty: Callable[[], bool]):
+        waiter = asyncio.get_running_loop().create_future()
+        waiters.append(waiter)
+        try:
+            await waiter
+        except BaseException:
+            waiter.cancel()
+            try:
+                waiters.remove(waiter)
+            except ValueError:
+                pass
+            if not still_empty() and not waiter.cancelled():
+                self._wakeup_next(waiters)
+            raise
+
+    def _overflow(self, message: Dict[str, Any], lane: int) -> bool:
+        if self.policy == OVERFLOW_COALESCE:
+            key = self.coalesce_key(message)
+            if key is not None:
+                for items in self._lanes[WORK_LANE:]:
+                    for index, (enqueued_at, queued) in enumerate(items):
+                        if self.coalesce_key(queued) == key:
+                            items[index] = (enqueued_at, message)
+                            self._notify_overflow(queued, "coalesced")
+                            return True
+            # Nothing to merge with: fall back to evicting the oldest message.
+
+        if self.policy == OVERFLOW_DROP_NEWEST:
+            self._notify_overflow(message, "dropped")
+            return False
+
+        evicted = self._evict_oldest_work()
+        if evicted is not None:
+            self._notify_overflow(evicted, "dropped")
+        self._append(message, lane)
+        return True
+
+    def _evict_oldest_work(self) -> Optional[Dict[str, Any]]:
+        # Evict from the least important lane first.
+        for items in reversed(self._lanes[WORK_LANE:]):
+            if items:
+                _, queued = items.popleft()
+                self._work_count -= 1
+                # The evicted message will never be processed, so settle its join() count.
+                self.task_done()
+                return queued
+        return None
+
+    def _notify_overflow(self, message: Dict[str, Any], action: str):
+        if self.on_overflow is None:
+            return
+        try:
+            self.on_overflow(message, action)
+        except Exception as e:
+            logger.error(f"Mailbox overflow callback failed: {e}")
+
+    @staticmethod
+    def _wakeup_next(waiters: Deque[asyncio.Future]) -> bool:
+        while waiters:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return True
+        return False
+
+
+class OverflowReporter:
+    """
+    Mailbox overflow callback that publishes `InboxOverflow` events on the bus.
+    Overflows are aggregated so a flood produces one report per burst rather
+    than one event per dropped message.
+    """
+
+    def __init__(self, event_bus, owner: str, mailbox: Optional[Mailbox] = None):
+        self.event_bus = event_bus
+        self.owner = owner
+        self.mailbox = mailbox
+        self._counts: Dict[str, int] = {}
+        self._dropped_types: Dict[str, int] = {}
+        self._pending: Optional[asyncio.Task] = None
+
+    def __call__(self, message: Dict[str, Any], action: str):
+        self._counts[action] = self._counts.get(action, 0) + 1
+        if action != "blocked":
+            msg_type = str(message.get("type", "unknown"))
+            self._dropped_types[msg_type] = self._dropped_types.get(msg_type, 0) + 1
+        if self._pending is None or self._pending.done():
+            try:
+                self._pending = asyncio.get_running_loop().create_task(self._report())
+            except RuntimeError:
+                logger.warning(f"Inbox of '{self.owner}' overflowed outside an event loop: {self._counts}")
+
+    async def _report(self):
+        # Yield once so overflows from the same burst land in one report.
+        await asyncio.sleep(0)
+        counts, self._counts = self._counts, {}
+        dropped_types, self._dropped_types = self._dropped_types, {}
+        logger.warning(f"Inbox of '{self.owner}' overflowed: {counts}")
+        event = {
+            "type": "InboxOverflow",
+            "actor": self.owner,
+            "from": self.owner,
+            "counts": counts,
+            "message_types": dropped_types,
+        }
+        if self.mailbox is not None:
+            event["policy"] = self.mailbox.policy
+            event["capacity"] = self.mailbox.maxsize
+            event["depth"] = self.mailbox.qsize()
+        await self.event_bus.publish(event)
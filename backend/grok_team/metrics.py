@@ -0,0 +1,132 @@
+"""
+In-process runtime metrics (counters and histograms).
+
+Recording is a dict lookup plus an integer bump or a bisect into fixed
+buckets, so it can stay on in the hot path. Nothing is aggregated or
+formatted until somebody calls `snapshot()`.
+"""
+import time
+from bisect import bisect_left
+from typing import Any, Dict, Hashable, Tuple
+
+from grok_team.config import METRICS_ENABLED
+
+# Upper bounds (seconds) of the latency buckets: 100us .. ~105s, doubling.
+LATENCY_BUCKETS: Tuple[float, ...] = tuple(0.0001 * 2 ** i for i in range(21))
+
+
+def _label(label: Hashable) -> str:
+    if isinstance(label, tuple):
+        return "/".join(str(part) for part in label)
+    return str(label)
+
+
+class Counter:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: int = 1):
+        self.value += amount
+
+
+class Histogram:
+    """Fixed-bucket histogram; percentiles are estimated from bucket bounds."""
+    __slots__ = ("bounds", "buckets", "count", "total", "min", "max")
+
+    def __init__(self, bounds: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.buckets[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, hits in enumerate(self.buckets):
+            seen += hits
+            if seen >= rank and hits:
+                bound = self.bounds[index] if index < len(self.bounds) else self.max
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+            "p50": self.percentile(0.5),
+            "p90": self.percentile(0.9),
+            "p99": self.percentile(0.99),
+        }
+
+
+class MetricsRegistry:
+    """Named, labelled counters and histograms. Disabled registries record nothing."""
+
+    def __init__(self, enabled: bool = METRICS_ENABLED):
+        self.enabled = enabled
+        self.started_at = time.monotonic()
+        self._counters: Dict[Tuple[str, Hashable], Counter] = {}
+        self._histograms: Dict[Tuple[str, Hashable], Histogram] = {}
+
+    def counter(self, name: str, label: Hashable = "") -> Counter:
+        key = (name, label)
+        counter = self._counters.get(key)
+        if counter is None:
+            counter = self._counters[key] = Counter()
+        return counter
+
+    def histogram(self, name: str, label: Hashable = "") -> Histogram:
+        key = (name, label)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = Histogram()
+        return histogram
+
+    def inc(self, name: str, label: Hashable = "", amount: int = 1):
+        if self.enabled:
+            self.counter(name, label).inc(amount)
+
+    def observe(self, name: str, label: Hashable, value: float):
+        if self.enabled:
+            self.histogram(name, label).observe(value)
+
+    def reset(self):
+        self.started_at = time.monotonic()
+        self._counters.clear()
+        self._histograms.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        {"uptime": s, "counters": {name: {label: {"count", "rate"}}},
+         "histograms": {name: {label: {count, sum, mean, min, max, p50, p90, p99}}}}
+        Rates are per second since the registry started (or was reset).
+        """
+        uptime = max(time.monotonic() - self.started_at, 1e-9)
+        counters: Dict[str, Dict[str, Any]] = {}
+        for (name, label), counter in list(self._counters.items()):
+            counters.setdefault(name, {})[_label(label)] = {
+                "count": counter.value,
+                "rate": counter.value / uptime,
+            }
+        histograms: Dict[str, Dict[str, Any]] = {}
+        for (name, label), histogram in list(self._histograms.items()):
+            histograms.setdefault(name, {})[_label(label)] = histogram.summary()
+        return {"uptime": uptime, "counters": counters, "histograms": histograms}
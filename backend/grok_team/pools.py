@@ -0,0 +1,86 @@
+"""
+Role pools: several agents sharing one role address.
+
+Work sent to a pooled role (e.g. "Harper@conv") is dispatched by the EventBus
+to the least-loaded member. When even that member has POOL_SCALE_UP_DEPTH
+messages waiting, the pool clones the role (same class, prompt and
+temperature, fresh memory) up to POOL_MAX_SIZE members. Members that run out
+of work steal queued tasks from the busiest sibling, and clones idle for
+POOL_IDLE_SHRINK seconds are retired by the Kernel's housekeeping.
+"""
+import itertools
+import logging
+from typing import Any, Callable, Dict, List
+
+from grok_team.config import POOL_MAX_SIZE, POOL_SCALE_UP_DEPTH
+
+logger = logging.getLogger(__name__)
+
+# Only new work is load-balanced; replies and tool results belong to one member.
+POOLED_MESSAGE_TYPES = {"TaskSubmitted"}
+
+
+def _is_pooled(message: Dict[str, Any]) -> bool:
+    return message.get("type") in POOLED_MESSAGE_TYPES
+
+
+class RolePool:
+    def __init__(self, base, clone: Callable[["RolePool"], Any], max_size: int = POOL_MAX_SIZE,
+                 scale_up_depth: int = POOL_SCALE_UP_DEPTH):
+        # The base member keeps the role address itself and is never retired.
+        self.base = base
+        self.address = base.name
+        self.members: List[Any] = [base]
+        self.max_size = max(1, max_size)
+        self.scale_up_depth = scale_up_depth
+        self._clone = clone
+        self._clone_ids = itertools.count(2)
+        base.idle_hook = self.steal_for
+
+    def next_clone_id(self) -> int:
+        return next(self._clone_ids)
+
+    def dispatch(self, message: Dict[str, Any]) -> str:
+        """EventBus dispatcher: the address of the member that should get `message`."""
+        if not _is_pooled(message):
+            return self.address
+        member = min(self.members, key=lambda m: m.load())
+        if member.load() >= self.scale_up_depth and len(self.members) < self.max_size:
+            member = self.grow()
+        return member.name
+
+    def grow(self):
+        clone = self._clone(self)
+        clone.idle_hook = self.steal_for
+        self.members.append(clone)
+        logger.info(f"Pool '{self.address}' grew to {len(self.members)} members ({clone.name}).")
+        return clone
+
+    def retire(self, member) -> bool:
+        """Removes a clone from dispatch. The base member is never retired."""
+        if member is self.base or member not in self.members:
+            return False
+        self.members.remove(member)
+        member.idle_hook = None
+        return True
+
+    def idle_clones(self, idle_for: float) -> List[Any]:
+        return [m for m in self.members if m is not self.base and m.is_idle(idle_for)]
+
+    def steal_for(self, thief) -> int:
+        """Moves up to half of the busiest sibling's queued tasks to an idle member."""
+        victim = max((m for m in self.members if m is not thief), key=lambda m: m.inbox.work_size(), default=None)
+        if victim is None:
+            return 0
+        queued = sum(1 for m in victim.inbox.peek_work() if _is_pooled(m))
+        share = queued // 2
+        if share == 0:
+            return 0
+        # Keep the oldest tasks with the victim, which would serve them next anyway
+        seen = itertools.count()
+        stolen = victim.inbox.take_work(lambda m: _is_pooled(m) and next(seen) >= queued - share)
+        for message in stolen:
+            victim.inbox.task_done()
+            thief.inbox.put_nowait(message)
+        logger.info(f"{thief.name} stole {len(stolen)} tasks from {victim.name}.")
+        return len(stolen)
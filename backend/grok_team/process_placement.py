@@ -0,0 +1,349 @@
+"""
+Multi-process actor placement.
+
+A `RemoteActor` stands in for an actor that runs in a dedicated worker
+process. Messages put into its (parent-side) inbox are forwarded over a Unix
+socket pair; everything the worker publishes is re-published on the parent
+EventBus, and `bus.request()` calls made in the worker are answered by the
+parent bus. The actor class itself runs unchanged. When the kernel's LLM
+governor is attached, the worker's LLM calls are admitted by it too: the
+worker-side `BridgedGovernor` asks the parent for each slot and reports back
+how the call went.
+
+Frames are 4-byte big-endian length prefixed JSON objects with an "op" field:
+  parent -> worker: deliver, reply, granted, stop
+  worker -> parent: publish, request, acquire, cancel, release, settle, exited
+"""
+import asyncio
+import json
+import logging
+import multiprocessing
+import socket
+import struct
+import uuid
+from typing import Any, Dict, Hashable, Optional
+
+from grok_team.actor import actor_class_path, resolve_actor_class
+from grok_team.event_bus import EventBus
+from grok_team.events import encode_event, event_from_dict, evolve
+from grok_team.llm_governor import LLMGovernor, PRIORITY_NORMAL
+from grok_team.mailbox import Mailbox, OverflowReporter
+from grok_team.session import make_address, split_address
+from grok_team.config import ACTOR_INBOX_MAXSIZE, ACTOR_INBOX_POLICY
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct(">I")
+_STOP_TIMEOUT = 5.0
+
+
+class _Link:
+    """Framed JSON messages over an asyncio stream pair."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self._write_lock = asyncio.Lock()
+
+    async def send(self, frame: Dict[str, Any]):
+        event = frame.get("event")
+        if event is None:
+            payload = json.dumps(frame, ensure_ascii=False, default=str)
+        else:
+            # Splice in the event's own (cached, for typed events) encoding.
+            head = json.dumps({k: v for k, v in frame.items() if k != "event"}, ensure_ascii=False, default=str)
+            payload = f'{head[:-1]}, "event": {encode_event(event)}}}'
+        payload = payload.encode("utf-8")
+        async with self._write_lock:
+            self.writer.write(_HEADER.pack(len(payload)) + payload)
+            await self.writer.drain()
+
+    async def recv(self) -> Optional[Dict[str, Any]]:
+        """Returns the next frame, or None once the peer closed the link."""
+        try:
+            header = await self.reader.readexactly(_HEADER.size)
+            payload = await self.reader.readexactly(_HEADER.unpack(header)[0])
+        except (asyncio.IncompleteReadError, ConnectionError):
+            return None
+        frame = json.loads(payload.decode("utf-8"))
+        if "event" in frame:
+            frame["event"] = event_from_dict(frame["event"])
+        return frame
+
+    def close(self):
+        self.writer.close()
+
+
+class BridgedEventBus(EventBus):
+    """Worker-side bus: forwards publishes and requests to the parent process."""
+
+    def __init__(self, link: _Link):
+        super().__init__()
+        self._link = link
+
+    async def publish(self, event: Dict[str, Any]):
+        await self._link.send({"op": "publish", "event": event})
+
+    async def request(self, event: Dict[str, Any], timeout: Optional[float] = None) -> Any:
+        reply_to = uuid.uuid4().hex
+        future = asyncio.get_running_loop().create_future()
+        self._pending_replies[reply_to] = future
+        try:
+            await self._link.send({"op": "request", "id": reply_to, "event": event, "timeout": timeout})
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self._pending_replies.pop(reply_to, None)
+
+
+class BridgedGovernor(LLMGovernor):
+    """Worker-side governor: slots and rate budget are granted by the parent's governor."""
+
+    def __init__(self, link: _Link):
+        super().__init__()
+        self._link = link
+        self._grants: Dict[str, asyncio.Future] = {}
+        self._sends: set = set()
+
+    async def acquire(self, key: Hashable = None, estimated_tokens: int = 0, priority: str = PRIORITY_NORMAL):
+        grant_id = uuid.uuid4().hex
+        future = asyncio.get_running_loop().create_future()
+        self._grants[grant_id] = future
+        try:
+            await self._link.send({"op": "acquire", "id": grant_id, "key": key,
+                                   "estimated_tokens": estimated_tokens, "priority": priority})
+            await future
+        except BaseException:
+            if future.done() and not future.cancelled():
+                # Granted and cancelled in the same tick: hand the slot back.
+                self.release()
+            else:
+                self._send_soon({"op": "cancel", "id": grant_id})
+            raise
+        finally:
+            self._grants.pop(grant_id, None)
+
+    def granted(self, grant_id: str):
+        future = self._grants.get(grant_id)
+        if future is not None and not future.done():
+            future.set_result(None)
+        else:
+            # The acquire was cancelled while the grant was on its way.
+            self.release()
+
+    def release(self, latency: Optional[float] = None, rate_limited: bool = False, hint: Optional[float] = None):
+        self._send_soon({"op": "release", "latency": latency, "rate_limited": rate_limited, "hint": hint})
+
+    def _settle_tokens(self, result: Any, estimated_tokens: int):
+        total = getattr(getattr(result, "usage", None), "total_tokens", None)
+        if isinstance(total, int):
+            self._send_soon({"op": "settle", "tokens": total - estimated_tokens})
+
+    def _send_soon(self, frame: Dict[str, Any]):
+        task = asyncio.get_running_loop().create_task(self._link.send(frame))
+        self._sends.add(task)
+        task.add_done_callback(self._sends.discard)
+
+
+class RemoteActor:
+    """Parent-side proxy for an actor running in a worker process."""
+
+    def __init__(self, name: str, event_bus: EventBus, actor_cls: type, init_kwargs: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.display_name, self.scope = split_address(name)
+        self.session = None
+        self.event_bus = event_bus
+        self.actor_cls = actor_cls
+        self.init_kwargs = init_kwargs or {}
+        self.running = False
+        self.process: Optional[multiprocessing.Process] = None
+        # Set by the Kernel; admits the worker's LLM calls
+        self.governor: Optional[LLMGovernor] = None
+        # Governor slots the worker currently holds, and its pending acquires
+        self._slots = 0
+        self._admissions: Dict[str, asyncio.Task] = {}
+        self.inbox = Mailbox(maxsize=ACTOR_INBOX_MAXSIZE, policy=ACTOR_INBOX_POLICY)
+        self.inbox.on_overflow = OverflowReporter(event_bus, name, self.inbox)
+        self.event_bus.register_actor(self.name, self.inbox)
+
+    async def start(self):
+        """Starts the worker process and bridges it until it exits."""
+        self.running = True
+        parent_sock, child_sock = socket.socketpair()
+        ctx = multiprocessing.get_context("spawn")
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(child_sock, actor_class_path(self.actor_cls), self.name, self.init_kwargs, self.governor is not None),
+            name=f"Actor-{self.name}",
+            daemon=True,
+        )
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.process.start)
+        child_sock.close()
+        logger.info(f"Actor '{self.name}' placed in worker process {self.process.pid}.")
+
+        reader, writer = await asyncio.open_connection(sock=parent_sock)
+        link = _Link(reader, writer)
+        forward = asyncio.create_task(self._forward_inbox(link), name=f"Bridge-{self.name}-out")
+        pump = asyncio.create_task(self._pump_worker(link), name=f"Bridge-{self.name}-in")
+        try:
+            done, _ = await asyncio.wait({forward, pump}, return_when=asyncio.FIRST_COMPLETED)
+            if pump not in done:
+                # Stop was forwarded: give the worker a moment to finish its current message.
+                await asyncio.wait_for(asyncio.shield(pump), timeout=_STOP_TIMEOUT)
+            for task in done:
+                task.result()
+            pump.result()
+        finally:
+            self.running = False
+            for task in (forward, pump):
+                if not task.done():
+                    task.cancel()
+            link.close()
+            await loop.run_in_executor(None, self._reap_process)
+
+    def stop(self):
+        """Signal the remote actor to stop gracefully."""
+        self.running = False
+        self.inbox.put_nowait({"type": "PoisonPill"})
+
+    async def _forward_inbox(self, link: _Link):
+        while True:
+            message = await self.inbox.get()
+            if message.get("type") == "PoisonPill":
+                await link.send({"op": "stop"})
+                return
+            await link.send({"op": "deliver", "event": message})
+            self.inbox.task_done()
+
+    async def _pump_worker(self, link: _Link):
+        pending = set()
+        try:
+            while True:
+                frame = await link.recv()
+                if frame is None:
+                    raise RuntimeError(f"Worker process of '{self.name}' closed the bridge unexpectedly")
+                op = frame.get("op")
+                if op == "publish":
+                    await self.event_bus.publish(self._resolve_target(frame["event"]))
+                elif op == "request":
+                    task = asyncio.create_task(self._answer_request(link, frame))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+                elif op == "acquire":
+                    task = asyncio.create_task(self._admit(link, frame))
+                    self._admissions[frame["id"]] = task
+                    task.add_done_callback(lambda _, grant_id=frame["id"]: self._admissions.pop(grant_id, None))
+                elif op == "cancel":
+                    task = self._admissions.get(frame["id"])
+                    if task is not None:
+                        task.cancel()
+                elif op == "release":
+                    self._release_slot(frame.get("latency"), frame.get("rate_limited", False), frame.get("hint"))
+                elif op == "settle":
+                    if self.governor is not None:
+                        self.governor.tokens.consume(frame["tokens"])
+                elif op == "exited":
+                    if frame.get("error"):
+                        raise RuntimeError(f"Remote actor '{self.name}' crashed: {frame['error']}")
+                    return
+        finally:
+            for task in pending:
+                task.cancel()
+            for task in list(self._admissions.values()):
+                task.cancel()
+            # Slots a dead or stopped worker still held go back to the governor.
+            while self._slots:
+                self._release_slot()
+
+    def _resolve_target(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        The worker's bus only knows its own actor, so `Actor.resolve` leaves plain
+        names unscoped there; they are resolved against the session's peers here.
+        """
+        target = event.get("target")
+        if target and self.scope:
+            scoped = make_address(target, self.scope)
+            if scoped != target and self.event_bus.is_registered(scoped):
+                return evolve(event, {"target": scoped})
+        return event
+
+    async def _admit(self, link: _Link, frame: Dict[str, Any]):
+        if self.governor is not None:
+            await self.governor.acquire(frame.get("key"), frame.get("estimated_tokens", 0),
+                                        frame.get("priority", PRIORITY_NORMAL))
+            self._slots += 1
+        await link.send({"op": "granted", "id": frame["id"]})
+
+    def _release_slot(self, latency: Optional[float] = None, rate_limited: bool = False, hint: Optional[float] = None):
+        if self.governor is None or self._slots <= 0:
+            return
+        self._slots -= 1
+        self.governor.release(latency=latency, rate_limited=rate_limited, hint=hint)
+
+    async def _answer_request(self, link: _Link, frame: Dict[str, Any]):
+        reply = {"op": "reply", "id": frame["id"]}
+        try:
+            reply["result"] = await self.event_bus.request(frame["event"], timeout=frame.get("timeout"))
+        except asyncio.TimeoutError:
+            reply["timeout"] = True
+        except Exception as e:
+            reply["error"] = str(e)
+        await link.send(reply)
+
+    def _reap_process(self):
+        if self.process is None:
+            return
+        self.process.join(timeout=_STOP_TIMEOUT)
+        if self.process.is_alive():
+            logger.warning(f"Worker process of '{self.name}' did not exit; terminating.")
+            self.process.terminate()
+            self.process.join(timeout=_STOP_TIMEOUT)
+
+
+def _worker_main(sock: socket.socket, class_path: str, name: str, init_kwargs: Dict[str, Any], governed: bool = False):
+    """Entry point of the worker process."""
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_run_worker(sock, class_path, name, init_kwargs, governed))
+
+
+async def _run_worker(sock: socket.socket, class_path: str, name: str, init_kwargs: Dict[str, Any], governed: bool = False):
+    reader, writer = await asyncio.open_connection(sock=sock)
+    link = _Link(reader, writer)
+    bus = BridgedEventBus(link)
+    actor = resolve_actor_class(class_path)(name, bus, **init_kwargs)
+    governor = BridgedGovernor(link) if governed and hasattr(actor, "governor") else None
+    if governor is not None:
+        actor.governor = governor
+    actor_task = asyncio.create_task(actor.start(), name=f"ActorTask-{name}")
+
+    async def pump():
+        while True:
+            frame = await link.recv()
+            if frame is None or frame.get("op") == "stop":
+                actor.stop()
+                return
+            if frame["op"] == "deliver":
+                await actor.inbox.put(frame["event"])
+            elif frame["op"] == "granted":
+                if governor is not None:
+                    governor.granted(frame["id"])
+            elif frame["op"] == "reply":
+                if frame.get("timeout"):
+                    bus.reply(frame["id"], error=asyncio.TimeoutError())
+                elif "error" in frame:
+                    bus.reply(frame["id"], error=RuntimeError(frame["error"]))
+                else:
+                    bus.reply(frame["id"], frame.get("result"))
+
+    pump_task = asyncio.create_task(pump())
+    error = None
+    try:
+        await actor_task
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    finally:
+        pump_task.cancel()
+    try:
+        await link.send({"op": "exited", "error": error})
+    finally:
+        link.close()
@@ -3,6 +3,7 @@ import os
 import json
 import asyncio
 import time
+import uuid
 from pathlib import Path
 
 # Ensure backend acts as a package root
@@ -14,10 +15,13 @@ from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field, ConfigDict
 
 from grok_team.kernel import Kernel
-from grok_team.agent import Agent
-from grok_team.config import ALL_AGENT_NAMES, LEADER_NAME
+from grok_team.config import SSE_QUEUE_MAXSIZE, SSE_QUEUE_POLICY
 from grok_team.history import SQLiteHistoryStore, StoredMessage
+from grok_team.hydration import hydrate_session
 from grok_team.server_runtime import CANCELLED_REQUESTS
+from grok_team.mailbox import Mailbox, OverflowReporter, CONTROL_LANE, WORK_LANE
+from grok_team.events import TaskSubmitted
+from grok_team.session import display_name
 
 app = FastAPI(title="Grok Team API")
 KERNEL = Kernel()
@@ -54,13 +58,7 @@ async def startup_event():
     await history_store.initialize()
     await history_writer.start()
     
-    # Initialize Agents
-    for name in ALL_AGENT_NAMES:
-        # Check if already exists to avoid dupes on reload
-        if name not in KERNEL.actors:
-            agent = Agent(name, KERNEL.event_bus)
-            KERNEL.register_actor(agent)
-            
+    # Agent teams are created per conversation on first use (Kernel.open_session)
     await KERNEL.start()
 
 @app.on_event('shutdown')
@@ -70,6 +68,17 @@ async def shutdown_event():
 
 
 
+# The answer itself (streamed pieces and final message) must reach the client
+# whatever the SSE overflow policy: it goes to the mailbox's unbounded,
+# never-dropped lane. Progress events (thoughts, tool use) may be shed, and
+# the ones the final answer overtook are flushed before the stream ends.
+SSE_LOSSLESS_EVENT_TYPES = {"AssistantDelta", "TaskCompleted"}
+
+
+def _sse_lane(event: dict) -> int:
+    return CONTROL_LANE if event.get("type") in SSE_LOSSLESS_EVENT_TYPES else WORK_LANE
+
+
 class ChatRequest(BaseModel):
     model_config = ConfigDict(extra='forbid')
 
@@ -112,7 +121,8 @@ async def delete_conversation(conversation_id: str):
         deleted = await history_store.delete(conversation_id)
         if not deleted:
             raise HTTPException(status_code=404, detail='Conversation not found')
-        return {'status': 'deleted'}
+    await KERNEL.close_session(conversation_id)
+    return {'status': 'deleted'}
 
 
 @app.post('/api/chat')
@@ -121,46 +131,52 @@ async def chat_stream(req: ChatRequest):
 
     async with history_lock:
         conversation = await history_store.get_or_create(req.conversation_id)
-        # We might need to restore agent state from DB here in a real unified system
-        # For now, we assume agents are running in memory (Note: this is not stateless between requests in this simple integration)
-        # But we DO need to log the user message
-        # Use background writer
+        # Log the user message through the background writer
         await history_writer.add_message(conversation.id, StoredMessage(role='user', content=req.message))
 
     # Identify a "reply channel" for this request
-    request_id = f"req_{int(time.time()*1000)}"
+    # (unique even for concurrent requests: conversations now run in parallel)
+    request_id = f"req_{int(time.time()*1000)}_{uuid.uuid4().hex[:8]}"
     correlation_id = request_id
 
-    # Apply per-agent temperatures from the client request.
+    # Per-agent temperatures only apply to this request, in this conversation's session.
+    temperatures = {}
     for agent_name, value in req.temperatures.items():
-        agent = KERNEL.actors.get(agent_name)
-        if agent is None:
-            continue
         try:
-            agent.temperature = max(0.0, min(1.0, float(value)))
+            temperatures[agent_name] = max(0.0, min(1.0, float(value)))
         except (TypeError, ValueError):
             continue
+
+    session = await KERNEL.open_session(conversation.id)
+    # A resumed conversation (e.g. after a restart) starts from its stored history
+    await hydrate_session(session, history_store, conversation)
+    leader = session.leader
+    session.begin_request(correlation_id, {"temperatures": temperatures})
     
     def _sse(event: dict) -> str:
         return f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
 
     async def event_generator():
         assistant_tokens: list[str] = [] 
+        # Text of the leader's answer already forwarded from AssistantDelta events
+        streamed_text = ""
+        # Set once the final answer arrived; progress events still queued are then drained
+        answered = False
         assistant_thoughts: list[dict] = []
         start = time.perf_counter()
         
-        # Queue to capture events for this specific request
-        response_queue = asyncio.Queue()
+        # Bounded queue to capture events for this specific request
+        response_queue = Mailbox(maxsize=SSE_QUEUE_MAXSIZE, policy=SSE_QUEUE_POLICY, lane_of=_sse_lane)
+        response_queue.on_overflow = OverflowReporter(KERNEL.event_bus, request_id, response_queue)
         
         async def on_event(event):
-            # We filter for events relevant to this request via correlation_id
-            if event.get("correlation_id") == correlation_id:
-                 await response_queue.put(event)
-            # Fallback for legacy or direct targets (if target matches request_id)
-            elif event.get("target") == request_id:
+            # The bus only calls us for this request's correlation_id.
+            # Events addressed to request_id already arrive via inbox routing.
+            if event.get("target") != request_id:
                  await response_queue.put(event)
 
         topics = [
+            "AssistantDelta",
             "TaskCompleted",
             "TaskSubmitted",
             "TaskFailed",
@@ -172,52 +188,70 @@ async def chat_stream(req: ChatRequest):
             "AgentStopped",
             "ConversationTitleUpdated",
         ]
-        for topic in topics:
-            KERNEL.event_bus.subscribe(topic, on_event)
+        subscription = KERNEL.event_bus.subscribe(topics, on_event, correlation_id=correlation_id)
 
         KERNEL.event_bus.register_actor(request_id, response_queue)
 
-        # Inject User Message into Leader
+        # Inject User Message into the conversation's Leader
         # We tell the leader this message comes from "User" (or our request_id if we want routing back)
-        await KERNEL.actors[LEADER_NAME].inbox.put({
-            "type": "TaskSubmitted",
-            "from": request_id, 
-            "correlation_id": correlation_id,
-            "conversation_id": conversation.id,
-            "content": req.message
-        })
+        await leader.inbox.put(TaskSubmitted(
+            from_=request_id,
+            correlation_id=correlation_id,
+            conversation_id=conversation.id,
+            content=req.message
+        ))
         
         try:
             yield _sse({'type': 'conversation', 'conversation_id': conversation.id})
             yield _sse({'type': 'status', 'content': 'Thinking...'})
 
             while True:
-                # Wait for events with a timeout
-                try:
-                    event = await asyncio.wait_for(response_queue.get(), timeout=60.0) # 60s timeout for demo
-                except asyncio.TimeoutError:
-                    yield _sse({'type': 'error', 'content': 'Timeout waiting for response'})
-                    break
+                if answered:
+                    if response_queue.empty():
+                        break
+                    event = response_queue.get_nowait()
+                    if _sse_lane(event) == CONTROL_LANE:
+                        continue  # the answer is complete
+                else:
+                    # Wait for events with a timeout
+                    try:
+                        event = await asyncio.wait_for(response_queue.get(), timeout=60.0) # 60s timeout for demo
+                    except asyncio.TimeoutError:
+                        yield _sse({'type': 'error', 'content': 'Timeout waiting for response'})
+                        break
 
                 event_type = event.get("type")
-                sender = event.get("from", event.get("actor", "unknown"))
+                sender_address = event.get("from", event.get("actor", "unknown"))
+                sender = display_name(sender_address)
                 
-                if event_type == "TaskCompleted":
+                if event_type == "AssistantDelta":
+                    # The leader's answer, as it is being generated
+                    if sender_address == leader.name:
+                        streamed_text += event.get("content", "")
+                        yield _sse({'type': 'token', 'content': event.get("content", "")})
+
+                elif event_type == "TaskCompleted":
                     # If this is the final answer addressed to us
-                    if sender == LEADER_NAME or event.get("target") == request_id:
+                    if sender_address == leader.name or event.get("target") == request_id:
                         content = event.get("content")
                         if content:
-                             yield _sse({'type': 'token', 'content': content})
+                             # Only send what the deltas have not delivered already;
+                             # if they diverged, have the client replace its text
+                             if content.startswith(streamed_text):
+                                 if len(content) > len(streamed_text):
+                                     yield _sse({'type': 'token', 'content': content[len(streamed_text):]})
+                             else:
+                                 yield _sse({'type': 'replace', 'content': content})
                              assistant_tokens.append(content)
                              # End stream if response is addressed to this request.
-                             if sender == LEADER_NAME or event.get("target") == request_id:
-                                 break
+                             if sender_address == leader.name or event.get("target") == request_id:
+                                 answered = True
                              
                 elif event_type == "TaskSubmitted":
                     # Thought/Delegation -> chatroom_send
                     content = event.get("content")
-                    target = event.get("target", "unknown")
-                    if sender != request_id:
+                    target = display_name(event.get("target", "unknown"))
+                    if sender_address != request_id:
                         event_payload = {
                             'type': 'chatroom_send',
                             'agent': sender,
@@ -249,12 +283,12 @@ async def chat_stream(req: ChatRequest):
                      yield _sse(event_payload)
 
                 elif event_type == "AgentSpawned":
-                     event_payload = {'type': 'thought', 'agent': 'Kernel', 'content': f"✨ Spawned Agent: {event.get('actor')}"}
+                     event_payload = {'type': 'thought', 'agent': 'Kernel', 'content': f"✨ Spawned Agent: {display_name(event.get('actor'))}"}
                      assistant_thoughts.append(event_payload)
                      yield _sse(event_payload)
 
                 elif event_type == "AgentStopped":
-                     event_payload = {'type': 'thought', 'agent': 'Kernel', 'content': f"💀 Stopped Agent: {event.get('actor')}"}
+                     event_payload = {'type': 'thought', 'agent': 'Kernel', 'content': f"💀 Stopped Agent: {display_name(event.get('actor'))}"}
                      assistant_thoughts.append(event_payload)
                      yield _sse(event_payload)
 
@@ -293,9 +327,9 @@ async def chat_stream(req: ChatRequest):
             yield _sse({'type': 'done'})
         finally:
             CANCELLED_REQUESTS.add(correlation_id)
-            for topic in topics:
-                KERNEL.event_bus.unsubscribe(topic, on_event)
-            KERNEL.event_bus._actor_inboxes.pop(request_id, None)
+            session.end_request(correlation_id)
+            subscription.cancel()
+            KERNEL.event_bus.unregister_actor(request_id)
 
     return StreamingResponse(
         event_generator(),
@@ -310,10 +344,8 @@ async def chat_stream(req: ChatRequest):
 
 @app.get('/api/events')
 async def get_events(limit: int = 100):
-    """Retrieve recent system events from the log."""
-    events = KERNEL.event_logger.get_all_events()
-    # Return last N events
-    return {"events": events[-limit:]}
+    """Retrieve recent system events from the log (checkpoints archive, not discard, them)."""
+    return {"events": KERNEL.event_logger.recent_events(limit)}
 
 @app.get('/api/health')
 async def health():
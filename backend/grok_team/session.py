@@ -0,0 +1,91 @@
+"""
+Conversation-scoped agent sessions.
+
+Each conversation gets its own team of agents, created lazily by the Kernel.
+Session actors are addressed as "<name>@<conversation_id>" on the EventBus;
+inside a session, plain names ("Harper") resolve to the session's own actor,
+so prompts and tools keep using display names.
+"""
+import asyncio
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from grok_team.config import LEADER_NAME
+
+ADDRESS_SEPARATOR = "@"
+
+
+def make_address(name: str, scope: Optional[str]) -> str:
+    """Bus address of `name` inside `scope` (unscoped names are returned as is)."""
+    if not scope or ADDRESS_SEPARATOR in name:
+        return name
+    return f"{name}{ADDRESS_SEPARATOR}{scope}"
+
+
+def split_address(address: str) -> Tuple[str, Optional[str]]:
+    """'Harper@conv' -> ('Harper', 'conv'); 'Harper' -> ('Harper', None)."""
+    name, _, scope = address.partition(ADDRESS_SEPARATOR)
+    return name, scope or None
+
+
+def display_name(address: Optional[str]) -> Optional[str]:
+    """Address without its session scope, for prompts and the UI."""
+    if not address:
+        return address
+    return split_address(address)[0]
+
+
+class AgentSession:
+    """The agents serving one conversation, plus its in-flight request parameters."""
+
+    def __init__(self, conversation_id: str):
+        self.conversation_id = conversation_id
+        # display name -> actor
+        self.actors: Dict[str, Any] = {}
+        # correlation_id -> request-scoped parameters (e.g. temperatures)
+        self.requests: Dict[str, Dict[str, Any]] = {}
+        self.created_at = time.monotonic()
+        self.last_active = self.created_at
+        # Set once the leader's context was rebuilt from the stored conversation;
+        # `hydration` is the rebuild in progress, which concurrent requests await
+        self.hydrated = False
+        self.hydration: Optional[asyncio.Task] = None
+
+    def address(self, name: str) -> str:
+        return make_address(name, self.conversation_id)
+
+    @property
+    def leader(self):
+        return self.actors[LEADER_NAME]
+
+    def touch(self):
+        self.last_active = time.monotonic()
+
+    def begin_request(self, correlation_id: str, params: Optional[Dict[str, Any]] = None):
+        self.requests[correlation_id] = params or {}
+        self.touch()
+
+    def end_request(self, correlation_id: str):
+        self.requests.pop(correlation_id, None)
+        self.touch()
+
+    def temperature_for(self, name: str, correlation_id: Optional[str]) -> Optional[float]:
+        """Temperature override of the request being served, if any."""
+        params = self.requests.get(correlation_id) if correlation_id else None
+        if not params:
+            return None
+        return params.get("temperatures", {}).get(name)
+
+    def is_idle(self, idle_ttl: float) -> bool:
+        """No request in flight, no queued or running work, and quiet for `idle_ttl` seconds."""
+        if self.requests:
+            return False
+        if time.monotonic() - self.last_active < idle_ttl:
+            return False
+        for actor in self.actors.values():
+            if not actor.inbox.empty():
+                return False
+            task = getattr(actor, "_current_task", None)
+            if task is not None and not task.done():
+                return False
+        return True
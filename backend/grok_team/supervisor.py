@@ -0,0 +1,58 @@
+"""
+Restart policy for crashed actors.
+
+The Kernel asks the Supervisor what to do whenever an actor task dies with an
+exception. With the one-for-one strategy only the crashed actor is restarted,
+after an exponential backoff, from its last checkpoint (see
+`Actor.capture_checkpoint`); an actor crashing more than `max_restarts` times
+within `window` seconds is given up on.
+"""
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from grok_team.config import (
+    SUPERVISOR_STRATEGY,
+    SUPERVISOR_MAX_RESTARTS,
+    SUPERVISOR_RESTART_WINDOW,
+    SUPERVISOR_BACKOFF_BASE,
+    SUPERVISOR_BACKOFF_MAX,
+)
+
+ONE_FOR_ONE = "one_for_one"  # restart only the crashed actor
+TEMPORARY = "temporary"      # never restart
+STRATEGIES = (ONE_FOR_ONE, TEMPORARY)
+
+
+class Supervisor:
+    def __init__(self, strategy: str = SUPERVISOR_STRATEGY, max_restarts: int = SUPERVISOR_MAX_RESTARTS,
+                 window: float = SUPERVISOR_RESTART_WINDOW, backoff_base: float = SUPERVISOR_BACKOFF_BASE,
+                 backoff_max: float = SUPERVISOR_BACKOFF_MAX):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown supervision strategy: {strategy}")
+        self.strategy = strategy
+        self.max_restarts = max_restarts
+        self.window = window
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        # actor name -> restart times within the window
+        self._restarts: Dict[str, Deque[float]] = {}
+
+    def restart_delay(self, name: str) -> Optional[float]:
+        """
+        Records a crash of `name`. Returns the backoff before restarting it, or
+        None if it must not be restarted (strategy, or restart intensity exceeded).
+        """
+        if self.strategy == TEMPORARY:
+            return None
+        now = time.monotonic()
+        history = self._restarts.setdefault(name, deque())
+        while history and now - history[0] > self.window:
+            history.popleft()
+        if len(history) >= self.max_restarts:
+            return None
+        history.append(now)
+        return min(self.backoff_max, self.backoff_base * 2 ** (len(history) - 1))
+
+    def forget(self, name: str):
+        self._restarts.pop(name, None)
@@ -17,6 +17,8 @@ class MockActor(Actor):
             await self.event_bus.publish(response)
         elif message.get("type") == "Crash":
             raise ValueError("Intentional Crash")
+        elif message.get("type") == "Slow":
+            await asyncio.sleep(5)
 
 class TestActorSystem(unittest.IsolatedAsyncioTestCase):
     async def asyncSetUp(self):
@@ -87,6 +89,33 @@ class TestActorSystem(unittest.IsolatedAsyncioTestCase):
         # In a real actor, handle_interrupt would log or save state.
         # We can check logs if we captured them, but for now just ensure it's still alive or stopped gracefully.
         pass
+    async def test_control_signals_overtake_queued_work(self):
+        worker = MockActor("Busy", self.bus)
+        self.kernel.register_actor(worker)
+
+        await worker.inbox.put({"type": "Task", "from": "Nobody"})
+        await worker.inbox.put({"type": "BudgetUpdate", "amount": 5})
+        await self.kernel.start()
+        await asyncio.sleep(0.05)
+
+        self.assertEqual(worker.budget, 15)
+        self.assertEqual(len(worker.received_messages), 1)
+
+    async def test_preemptive_interrupt_cancels_running_step(self):
+        worker = MockActor("Sleeper", self.bus)
+        self.kernel.register_actor(worker)
+        await self.kernel.start()
+
+        await worker.inbox.put({"type": "Slow"})
+        await worker.inbox.put({"type": "Ping"})
+        await asyncio.sleep(0.05)
+
+        await self.kernel.interrupt_agent("Sleeper", "Stop now", preempt=True)
+        await asyncio.sleep(0.05)
+
+        self.assertEqual([m["type"] for m in worker.received_messages], ["Slow", "Ping"])
+        self.assertFalse(self.kernel.tasks["Sleeper"].done())
+
 
 if __name__ == "__main__":
     unittest.main()
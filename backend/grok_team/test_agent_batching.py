@@ -0,0 +1,87 @@
+import unittest
+import asyncio
+from grok_team.event_bus import EventBus
+from grok_team.agent import Agent
+from grok_team.mailbox import Mailbox
+
+
+class TestAgentBatching(unittest.IsolatedAsyncioTestCase):
+    def make_agent(self, batch_messages):
+        bus = EventBus()
+        agent = Agent("Leader", bus, system_prompt="lead", batch_messages=batch_messages)
+        agent.steps = []
+
+        async def mock_step(ctx=None):
+            # Record what the model would see and answer without tools
+            agent.steps.append([m["content"] for m in agent.messages if m["role"] == "user"])
+            await asyncio.sleep(0.02)
+            msg = {"role": "assistant", "content": "ok"}
+            agent.messages.append(msg)
+            return msg
+
+        agent.step = mock_step
+        return agent
+
+    async def fan_in(self, agent):
+        for sender in ("Harper", "Benjamin", "Lucas"):
+            await agent.inbox.put({"type": "TaskCompleted", "from": sender, "content": f"done by {sender}",
+                                   "correlation_id": "req-1"})
+        # Belongs to another request: never merged
+        await agent.inbox.put({"type": "TaskCompleted", "from": "Harper", "content": "other", "correlation_id": "req-2"})
+        task = asyncio.create_task(agent.start())
+        await asyncio.wait_for(agent.inbox.join(), timeout=1)
+        agent.stop()
+        await task
+
+    async def test_batching_merges_pending_replies_into_one_step(self):
+        agent = self.make_agent(batch_messages=True)
+        await self.fan_in(agent)
+
+        self.assertEqual(len(agent.steps), 2)
+        self.assertEqual(agent.steps[0], ["[Result from Harper]: done by Harper",
+                                          "[Result from Benjamin]: done by Benjamin",
+                                          "[Result from Lucas]: done by Lucas"])
+        self.assertEqual(agent.steps[1][-1], "[Result from Harper]: other")
+
+    async def test_tasks_from_other_senders_get_their_own_turn(self):
+        agent = self.make_agent(batch_messages=True)
+        bus = agent.event_bus
+        answers = {"req": asyncio.Queue(), "Harper": asyncio.Queue()}
+        for name, queue in answers.items():
+            bus.register_actor(name, queue)
+        for sender, content in (("req", "first"), ("req", "more detail"), ("Harper", "question")):
+            await agent.inbox.put({"type": "TaskSubmitted", "from": sender, "content": content,
+                                   "correlation_id": "req-1"})
+        task = asyncio.create_task(agent.start())
+        await asyncio.wait_for(agent.inbox.join(), timeout=1)
+        agent.stop()
+        await task
+
+        self.assertEqual(len(agent.steps), 2)
+        self.assertEqual(agent.steps[0][-2:], ["[Message from req]: first", "[Message from req]: more detail"])
+        for queue in answers.values():
+            self.assertEqual(queue.get_nowait()["type"], "TaskCompleted")
+
+    async def test_without_batching_every_reply_runs_a_step(self):
+        agent = self.make_agent(batch_messages=False)
+        await self.fan_in(agent)
+        self.assertEqual(len(agent.steps), 4)
+
+
+class TestTakeWork(unittest.IsolatedAsyncioTestCase):
+    async def test_take_work_keeps_order_and_capacity(self):
+        box = Mailbox(maxsize=3)
+        for n in range(3):
+            await box.put({"type": "Work", "n": n})
+        await box.put({"type": "BudgetUpdate", "amount": 1})
+
+        taken = box.take_work(lambda m: m["n"] != 1)
+        self.assertEqual([m["n"] for m in taken], [0, 2])
+        self.assertEqual(box.work_size(), 1)
+        self.assertFalse(box.full())
+        self.assertEqual((await box.get())["type"], "BudgetUpdate")
+        self.assertEqual((await box.get())["n"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
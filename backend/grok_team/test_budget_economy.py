@@ -1,5 +1,6 @@
 import unittest
 import asyncio
+from unittest.mock import patch
 from grok_team.event_bus import EventBus
 from grok_team.actor import Actor
 from grok_team.kernel import Kernel
@@ -51,10 +52,11 @@ class TestBudgetEconomy(unittest.IsolatedAsyncioTestCase):
         self.kernel.register_actor(actor)
         self.kernel._spawn_actor_task(actor)
 
-        # Send work (should fail/pause)
+        # Send work (should be parked)
         await actor.inbox.put({"type": "Work"})
         await asyncio.sleep(0.1)
         self.assertEqual(actor.processed_count, 0)
+        self.assertEqual(len(actor._parked), 1)
 
         # Allocate budget via Kernel/Bus
         await self.kernel._handle_system_call({
@@ -63,13 +65,99 @@ class TestBudgetEconomy(unittest.IsolatedAsyncioTestCase):
         })
         
         await asyncio.sleep(0.1)
-        # Budget should be 5
-        self.assertEqual(actor.budget, 5)
+        # Parked work was replayed with the new budget
+        self.assertEqual(actor.processed_count, 1)
+        self.assertEqual(actor.budget, 4)
         
-        # Resend work (since previous was dropped/failed)
         await actor.inbox.put({"type": "Work"})
         await asyncio.sleep(0.1)
-        self.assertEqual(actor.processed_count, 1)
+        self.assertEqual(actor.processed_count, 2)
+
+    async def test_parked_work_replays_in_order_with_one_exhaustion_event(self):
+        exhausted = []
+        self.bus.subscribe("BudgetExhausted", lambda e: _append(exhausted, e))
+
+        actor = OrderedActor("Parker", self.bus, budget=1)
+        self.kernel.register_actor(actor)
+        self.kernel._spawn_actor_task(actor)
+
+        for n in range(4):
+            await actor.inbox.put({"type": "Work", "n": n})
+        await asyncio.sleep(0.05)
+        self.assertEqual(actor.seen, [0])
+        self.assertEqual(len(exhausted), 1)
+        self.assertEqual(exhausted[0]["actor"], "Parker")
+
+        # Enough for one more: the rest is parked again in order, and a new episode is reported
+        await actor.inbox.put({"type": "BudgetUpdate", "amount": 1})
+        await asyncio.sleep(0.05)
+        self.assertEqual(actor.seen, [0, 1])
+        self.assertEqual(len(exhausted), 2)
+
+        await actor.inbox.put({"type": "BudgetUpdate", "amount": 5})
+        await asyncio.sleep(0.05)
+        self.assertEqual(actor.seen, [0, 1, 2, 3])
+
+    async def test_parking_is_bounded_and_expires(self):
+        failures = []
+        sender = MockActorWithBudget("Sender", self.bus, budget=1)
+        sender.handle_message = lambda message: _append(failures, message)
+        self.kernel.register_actor(sender)
+        self.kernel._spawn_actor_task(sender)
+
+        actor = OrderedActor("Full", self.bus, budget=0)
+        self.kernel.register_actor(actor)
+        self.kernel._spawn_actor_task(actor)
+
+        with patch("grok_team.actor.ACTOR_PARKING_MAXSIZE", 2):
+            for n in range(3):
+                await actor.inbox.put({"type": "Work", "n": n, "from": "Sender"})
+            await asyncio.sleep(0.05)
+        self.assertEqual([m["n"] for _, m in actor._parked], [1, 2])
+        self.assertEqual(len(failures), 1)
+        self.assertIn("full", failures[0]["error"])
+
+        with patch("grok_team.actor.ACTOR_PARKING_TTL", 0):
+            await actor.inbox.put({"type": "BudgetUpdate", "amount": 5})
+            await asyncio.sleep(0.05)
+        self.assertEqual(actor.seen, [])
+        self.assertEqual(len(failures), 3)
+        self.assertIn("expired", failures[-1]["error"])
+
+    async def test_parked_work_expires_without_further_traffic(self):
+        failures = []
+        sender = MockActorWithBudget("Sender", self.bus, budget=1)
+        sender.handle_message = lambda message: _append(failures, message)
+        self.kernel.register_actor(sender)
+        self.kernel._spawn_actor_task(sender)
+
+        actor = OrderedActor("Idle", self.bus, budget=0)
+        self.kernel.register_actor(actor)
+        self.kernel._spawn_actor_task(actor)
+        await actor.inbox.put({"type": "Work", "n": 0, "from": "Sender", "correlation_id": "c1"})
+        await asyncio.sleep(0.05)
+        self.assertEqual(len(actor._parked), 1)
+
+        # No BudgetUpdate or new work: the kernel's housekeeping sweep expires it
+        with patch("grok_team.actor.ACTOR_PARKING_TTL", 0):
+            self.assertEqual(await self.kernel.expire_parked_work(), 1)
+        await asyncio.sleep(0.05)
+        self.assertEqual(len(actor._parked), 0)
+        self.assertEqual([(f["type"], f["correlation_id"]) for f in failures], [("TaskFailed", "c1")])
+
+
+class OrderedActor(Actor):
+    def __init__(self, name, bus, budget):
+        super().__init__(name, bus, start_budget=budget)
+        self.seen = []
+
+    async def handle_message(self, message):
+        self.budget -= 1
+        self.seen.append(message["n"])
+
+
+async def _append(items, item):
+    items.append(item)
 
 if __name__ == "__main__":
     unittest.main()
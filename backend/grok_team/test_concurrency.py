@@ -62,5 +62,26 @@ class TestConcurrency(unittest.IsolatedAsyncioTestCase):
         self.assertTrue(duration < 1.0, f"Execution took {duration}s, expected < 1.0s (parallel)")
         self.assertEqual(len(agent.messages), 1 + 3) # System + 3 tool results
 
+    async def test_results_keep_call_order_and_nothing_is_dropped(self):
+        agent = Agent("OrderAgent", self.bus)
+        agent.tool_slots = asyncio.Semaphore(2)
+        running, peak = 0, 0
+
+        async def mock_exec(tool_call, correlation_id):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(tool_call["delay"])
+            running -= 1
+            agent.add_tool_call_result(tool_call["id"], tool_call["id"], "mock_tool")
+            # Like chatroom_send: ends the turn, but must not drop the other calls
+            return tool_call["id"] != "send"
+
+        agent._execute_tool = mock_exec
+        calls = [{"id": "slow", "delay": 0.1}, {"id": "send", "delay": 0.01}, {"id": "fast", "delay": 0.0}]
+        self.assertFalse(await agent._execute_tools(calls))
+        self.assertEqual([m["tool_call_id"] for m in agent.messages[1:]], ["slow", "send", "fast"])
+        self.assertEqual(peak, 2)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,138 @@
+import unittest
+import asyncio
+from grok_team.event_bus import EventBus, DELIVERY_ASYNC, DELIVERY_SYNC
+
+
+class TestEventBusDispatch(unittest.IsolatedAsyncioTestCase):
+    async def test_async_subscriber_does_not_block_publisher(self):
+        bus = EventBus()
+        release = asyncio.Event()
+        calls = []
+
+        async def slow_handler(event):
+            await release.wait()
+            calls.append(event["n"])
+
+        bus.subscribe("Ping", slow_handler, delivery=DELIVERY_ASYNC)
+
+        await asyncio.wait_for(bus.publish({"type": "Ping", "n": 1}), timeout=0.5)
+        self.assertEqual(calls, [])
+
+        release.set()
+        await bus.drain()
+        self.assertEqual(calls, [1])
+        await bus.shutdown()
+
+    async def test_async_delivery_preserves_order_across_topics(self):
+        bus = EventBus()
+        seen = []
+
+        async def handler(event):
+            await asyncio.sleep(0)
+            seen.append(event["n"])
+
+        bus.subscribe("A", handler, delivery=DELIVERY_ASYNC)
+        bus.subscribe("B", handler, delivery=DELIVERY_ASYNC)
+
+        for n in range(10):
+            await bus.publish({"type": "A" if n % 2 else "B", "n": n})
+
+        await bus.drain()
+        self.assertEqual(seen, list(range(10)))
+        await bus.shutdown()
+
+    async def test_failing_async_subscriber_is_isolated(self):
+        bus = EventBus()
+        seen = []
+
+        async def broken(event):
+            raise RuntimeError("boom")
+
+        async def healthy(event):
+            seen.append(event["type"])
+
+        bus.subscribe_globally(broken, delivery=DELIVERY_ASYNC)
+        bus.subscribe_globally(healthy, delivery=DELIVERY_ASYNC)
+
+        await bus.publish({"type": "One"})
+        await bus.publish({"type": "Two"})
+        await bus.drain()
+
+        self.assertEqual(seen, ["One", "Two"])
+        await bus.shutdown()
+
+    async def test_sync_subscriber_runs_before_publish_returns(self):
+        bus = EventBus(default_delivery=DELIVERY_ASYNC)
+        seen = []
+
+        async def handler(event):
+            seen.append(event)
+
+        bus.subscribe("Ping", handler, delivery=DELIVERY_SYNC)
+        await bus.publish({"type": "Ping"})
+        self.assertEqual(len(seen), 1)
+
+    async def test_unknown_delivery_mode_rejected(self):
+        bus = EventBus()
+
+        async def handler(event):
+            pass
+
+        with self.assertRaises(ValueError):
+            bus.subscribe("Ping", handler, delivery="later")
+
+
+class TestCorrelatedSubscriptions(unittest.IsolatedAsyncioTestCase):
+    async def test_only_matching_correlation_is_delivered(self):
+        bus = EventBus()
+        seen = {"a": [], "b": []}
+
+        async def on_a(event):
+            seen["a"].append(event["n"])
+
+        async def on_b(event):
+            seen["b"].append(event["n"])
+
+        bus.subscribe(["ToolUse", "TaskCompleted"], on_a, correlation_id="req_a")
+        bus.subscribe(None, on_b, correlation_id="req_b")
+
+        await bus.publish({"type": "ToolUse", "correlation_id": "req_a", "n": 1})
+        await bus.publish({"type": "Other", "correlation_id": "req_a", "n": 2})
+        await bus.publish({"type": "Other", "correlation_id": "req_b", "n": 3})
+        await bus.publish({"type": "ToolUse", "n": 4})
+
+        self.assertEqual(seen["a"], [1])
+        self.assertEqual(seen["b"], [3])
+
+    async def test_subscription_removed_on_exit(self):
+        bus = EventBus()
+        seen = []
+
+        async def handler(event):
+            seen.append(event)
+
+        with bus.subscribe("Ping", handler, correlation_id="req_1"):
+            await bus.publish({"type": "Ping", "correlation_id": "req_1"})
+
+        await bus.publish({"type": "Ping", "correlation_id": "req_1"})
+        self.assertEqual(len(seen), 1)
+        self.assertEqual(bus._correlated, {})
+
+    async def test_cancel_multi_topic_subscription(self):
+        bus = EventBus()
+        seen = []
+
+        async def handler(event):
+            seen.append(event)
+
+        subscription = bus.subscribe(["A", "B"], handler)
+        subscription.cancel()
+        subscription.cancel()
+
+        await bus.publish({"type": "A"})
+        await bus.publish({"type": "B"})
+        self.assertEqual(seen, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
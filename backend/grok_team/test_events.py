@@ -0,0 +1,104 @@
+import unittest
+import asyncio
+import json
+import pickle
+from grok_team.event_bus import EventBus
+from grok_team.actor import Actor
+from grok_team.events import (
+    TaskSubmitted,
+    TaskFailed,
+    SystemCall,
+    event_from_dict,
+    evolve,
+    encode_event,
+)
+
+
+class TestTypedEvents(unittest.TestCase):
+    def test_dict_compatible_read_access(self):
+        event = TaskSubmitted(from_="user", correlation_id="c1", content="hi")
+        self.assertEqual(event["type"], "TaskSubmitted")
+        self.assertEqual(event["from"], "user")
+        self.assertEqual(event.get("content"), "hi")
+        self.assertIsNone(event.get("target"))
+        self.assertNotIn("conversation_id", event)
+        self.assertIn("timestamp", event)
+        self.assertEqual({**event}["correlation_id"], "c1")
+
+    def test_events_are_immutable(self):
+        event = TaskFailed(error="boom")
+        with self.assertRaises(AttributeError):
+            event.error = "other"
+        with self.assertRaises(TypeError):
+            event["error"] = "other"
+        with self.assertRaises(TypeError):
+            TaskFailed(reason="unknown field")
+
+    def test_evolve_returns_new_envelope(self):
+        event = TaskSubmitted(content="hi")
+        routed = evolve(event, {"target": "bob", "from": "alice"})
+        self.assertIsInstance(routed, TaskSubmitted)
+        self.assertEqual(routed["target"], "bob")
+        self.assertEqual(routed["from"], "alice")
+        self.assertEqual(routed["timestamp"], event["timestamp"])
+        self.assertIsNone(event.get("target"))
+
+        # Unknown keys fall back to a plain dict copy
+        extended = evolve(event, {"extra": 1})
+        self.assertEqual(extended["extra"], 1)
+        self.assertNotIn("extra", event)
+
+    def test_encoding_is_cached_and_round_trips(self):
+        event = SystemCall(command="list_agents", args={}, sender="a", reply_to="r1")
+        encoded = encode_event(event)
+        self.assertIs(encode_event(event), encoded)
+        decoded = event_from_dict(json.loads(encoded))
+        self.assertIsInstance(decoded, SystemCall)
+        self.assertEqual(decoded.to_dict(), event.to_dict())
+        self.assertEqual(pickle.loads(pickle.dumps(event)).to_dict(), event.to_dict())
+
+    def test_unknown_shapes_stay_dicts(self):
+        self.assertEqual(event_from_dict({"type": "Custom", "x": 1}), {"type": "Custom", "x": 1})
+        self.assertIsInstance(event_from_dict({"type": "TaskFailed", "error": "e", "extra": 1}), dict)
+
+
+class Recorder(Actor):
+    def __init__(self, name, event_bus):
+        super().__init__(name, event_bus)
+        self.received = []
+
+    async def handle_message(self, message):
+        self.received.append(message)
+
+
+class TestSendDoesNotMutate(unittest.IsolatedAsyncioTestCase):
+    async def test_broadcast_reuses_one_envelope(self):
+        bus = EventBus()
+        sender = Actor("sender", bus)
+        receivers = [Recorder(f"r{i}", bus) for i in range(3)]
+        tasks = [asyncio.create_task(r.start()) for r in receivers]
+
+        payload = TaskSubmitted(content="hello", correlation_id="c1")
+        for receiver in receivers:
+            await sender.send(receiver.name, payload)
+        await asyncio.sleep(0.05)
+
+        self.assertIsNone(payload.get("target"))
+        for receiver in receivers:
+            self.assertEqual(len(receiver.received), 1)
+            message = receiver.received[0]
+            self.assertEqual(message["target"], receiver.name)
+            self.assertEqual(message["from"], "sender")
+
+        # Plain dict messages are copied, not modified in place
+        raw = {"type": "Note"}
+        await sender.send("r0", raw)
+        self.assertEqual(raw, {"type": "Note"})
+
+        for receiver in receivers:
+            receiver.stop()
+        await asyncio.gather(*tasks)
+
+
+if __name__ == "__main__":
+    unittest.main()
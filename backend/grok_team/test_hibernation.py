@@ -0,0 +1,95 @@
+import unittest
+import asyncio
+import json
+import tempfile
+from unittest.mock import patch
+from grok_team.agent import Agent
+from grok_team.kernel import Kernel
+from grok_team.hibernation import HibernationStore
+
+
+async def mock_step(self, ctx=None):
+    msg = {"role": "assistant", "content": f"answer from {self.name}"}
+    self.messages.append(msg)
+    return msg
+
+
+class TestHibernation(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.kernel = Kernel()
+        self.kernel.hibernation = HibernationStore(self.tmp.name)
+        # Woken agents are new instances, so the mock goes on the class
+        self.step_patch = patch.object(Agent, "step", mock_step)
+        self.step_patch.start()
+        await self.kernel.start()
+
+    async def asyncTearDown(self):
+        await self.kernel.stop()
+        self.step_patch.stop()
+        self.tmp.cleanup()
+
+    async def spawn_worker(self, name="Worker"):
+        ok, _ = await self.kernel.spawn_agent(name, "You are a worker.", temperature=0.3)
+        self.assertTrue(ok)
+        return self.kernel.actors[name]
+
+    async def test_hibernate_and_wake_on_message(self):
+        worker = await self.spawn_worker()
+        await worker.inbox.put({"type": "TaskSubmitted", "from": "Grok", "correlation_id": "c1", "content": "first"})
+        await asyncio.sleep(0.05)
+        worker.budget = 7
+        messages = list(worker.messages)
+
+        # Busy (recently active) agents stay awake
+        self.assertEqual(await self.kernel.hibernate_idle_agents(idle_for=60), [])
+        self.assertEqual(await self.kernel.hibernate_idle_agents(idle_for=0), ["Worker"])
+        self.assertNotIn("Worker", self.kernel.actors)
+        self.assertIn("Worker", self.kernel.dormant)
+        self.assertEqual(self.kernel.hibernation.names(), ["Worker"])
+        self.assertTrue(self.kernel.event_bus.is_registered("Worker"))
+        self.assertIn("Worker", json.loads(self.kernel._execute_inline_system_call("list_agents", {})))
+
+        await self.kernel.event_bus.publish({"type": "TaskSubmitted", "target": "Worker", "from": "Grok",
+                                             "correlation_id": "c2", "content": "second"})
+        await asyncio.sleep(0.05)
+        woken = self.kernel.actors["Worker"]
+        self.assertIsNot(woken, worker)
+        self.assertEqual(woken.messages[:len(messages)], messages)
+        self.assertEqual(woken.messages[-2]["content"], "[Message from Grok]: second")
+        self.assertEqual(woken.budget, 7)
+        self.assertEqual(woken.temperature, 0.3)
+        self.assertNotIn("Worker", self.kernel.dormant)
+        self.assertEqual(self.kernel.hibernation.names(), [])
+
+    async def test_concurrent_wakes_create_one_instance(self):
+        await self.spawn_worker()
+        await self.kernel.hibernate_agent("Worker")
+        inboxes = await asyncio.gather(*(self.kernel.wake_agent("Worker") for _ in range(5)))
+        self.assertEqual(len({id(inbox) for inbox in inboxes}), 1)
+        self.assertIs(inboxes[0], self.kernel.actors["Worker"].inbox)
+
+    async def test_kill_dormant_agent(self):
+        await self.spawn_worker()
+        await self.kernel.hibernate_agent("Worker")
+        ok, _ = await self.kernel.kill_agent("Worker")
+        self.assertTrue(ok)
+        self.assertFalse(self.kernel.event_bus.is_registered("Worker"))
+        self.assertEqual(self.kernel.hibernation.names(), [])
+
+    async def test_killed_agent_is_not_hibernated_and_can_respawn(self):
+        worker = await self.spawn_worker()
+        ok, _ = await self.kernel.kill_agent("Worker")
+        self.assertTrue(ok)
+        for registry in (self.kernel.actors, self.kernel.spawned, self.kernel.tasks):
+            self.assertNotIn("Worker", registry)
+        self.assertFalse(self.kernel.event_bus.is_registered("Worker"))
+
+        self.assertEqual(await self.kernel.hibernate_idle_agents(idle_for=0), [])
+        self.assertNotIn("Worker", self.kernel.dormant)
+        respawned = await self.spawn_worker()
+        self.assertIsNot(respawned, worker)
+
+
+if __name__ == "__main__":
+    unittest.main()
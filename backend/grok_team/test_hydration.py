@@ -0,0 +1,91 @@
+import unittest
+import asyncio
+import tempfile
+from pathlib import Path
+from grok_team.kernel import Kernel
+from grok_team.history import SQLiteHistoryStore, StoredMessage, ConversationSummary
+from grok_team.hydration import hydrate_session
+
+
+class TestHydration(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = SQLiteHistoryStore(Path(self.tmp.name) / "history.db")
+        await self.store.initialize()
+        self.kernel = Kernel()
+        conv = await self.store.create("test")
+        for i in range(6):
+            role = "user" if i % 2 == 0 else "assistant"
+            await self.store.add_message(conv.id, StoredMessage(role=role, content=f"m{i}"))
+        self.conversation = await self.store.get(conv.id)
+
+    async def asyncTearDown(self):
+        await self.kernel.stop()
+        self.tmp.cleanup()
+
+    async def open_leader(self, summaries):
+        session = await self.kernel.open_session(self.conversation.id)
+
+        async def summarize(transcript, previous_summary=""):
+            summaries.append((previous_summary, [m["content"] for m in transcript]))
+            return f"summary of {len(transcript)}"
+
+        session.leader.summarize_transcript = summarize
+        return session
+
+    async def test_leader_context_from_tail_and_summary(self):
+        calls = []
+        session = await self.open_leader(calls)
+        self.assertTrue(await hydrate_session(session, self.store, self.conversation, tail=2))
+        self.assertFalse(await hydrate_session(session, self.store, self.conversation, tail=2))
+
+        self.assertEqual(calls, [("", ["m0", "m1", "m2", "m3"])])
+        self.assertEqual(session.leader.messages[1:], [
+            {"role": "system", "content": "PREVIOUS CONTEXT (Summarized):\nsummary of 4"},
+            {"role": "user", "content": "m4"},
+            {"role": "assistant", "content": "m5"},
+        ])
+        cached = await self.store.get_summary(self.conversation.id)
+        self.assertEqual((cached.summary, cached.covered_messages), ("summary of 4", 4))
+
+    async def test_concurrent_requests_wait_for_the_rebuild(self):
+        calls = []
+        session = await self.open_leader(calls)
+
+        async def second_request():
+            await hydrate_session(session, self.store, self.conversation, tail=2)
+            return len(session.leader.messages)
+
+        hydrated, context = await asyncio.gather(
+            hydrate_session(session, self.store, self.conversation, tail=2), second_request())
+        # The second request reached the leader only once the context was in place
+        self.assertEqual((hydrated, context), (True, 4))
+        self.assertEqual(len(calls), 1)
+
+    async def test_resume_uses_cached_summary(self):
+        await self.store.save_summary(self.conversation.id, ConversationSummary(summary="earlier", covered_messages=4))
+        await self.kernel.close_session(self.conversation.id)
+        calls = []
+        session = await self.open_leader(calls)
+        await hydrate_session(session, self.store, self.conversation, tail=2)
+        self.assertEqual(calls, [])  # nothing new fell out of the tail
+        self.assertEqual(len(session.leader.messages), 4)
+
+        # Later messages extend the cached summary instead of redoing it
+        await self.kernel.close_session(self.conversation.id)
+        for i in range(6, 8):
+            await self.store.add_message(self.conversation.id, StoredMessage(role="user", content=f"m{i}"))
+        conversation = await self.store.get(self.conversation.id)
+        session = await self.open_leader(calls)
+        await hydrate_session(session, self.store, conversation, tail=2)
+        self.assertEqual(calls, [("earlier", ["m4", "m5"])])
+        self.assertEqual((await self.store.get_summary(conversation.id)).covered_messages, 6)
+
+    async def test_summary_is_deleted_with_conversation(self):
+        await self.store.save_summary(self.conversation.id, ConversationSummary(summary="s", covered_messages=1))
+        await self.store.delete(self.conversation.id)
+        self.assertIsNone(await self.store.get_summary(self.conversation.id))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+import unittest
+import asyncio
+import time
+from types import SimpleNamespace as NS
+from unittest.mock import patch
+from grok_team.llm_governor import (
+    LLMGovernor,
+    TokenBucket,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_NORMAL,
+    PRIORITY_BACKGROUND,
+)
+from grok_team.kernel import Kernel
+from grok_team.agent import Agent
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+class FakeUsage:
+    total_tokens = 10
+
+
+class FakeResponse:
+    usage = FakeUsage()
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_delay_and_debt(self):
+        bucket = TokenBucket(60)  # one unit per second
+        self.assertEqual(bucket.delay_for(60), 0)
+        bucket.consume(60)
+        self.assertAlmostEqual(bucket.delay_for(1), 1.0, places=1)
+        bucket.consume(-30)
+        self.assertEqual(bucket.delay_for(30), 0)
+        self.assertEqual(TokenBucket(0).delay_for(10 ** 9), 0)
+
+
+class TestLLMGovernor(unittest.IsolatedAsyncioTestCase):
+    async def test_concurrency_limit_and_fair_queue(self):
+        governor = LLMGovernor(initial_concurrency=1, max_concurrency=1)
+        order = []
+
+        def call(key, n):
+            async def fn():
+                order.append((key, n))
+                await asyncio.sleep(0.01)
+                return FakeResponse()
+            return governor.call(fn, key=key)
+
+        # "busy" floods the queue first; "quiet" must not wait behind all of it
+        tasks = [asyncio.create_task(call("busy", n)) for n in range(4)]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(call("quiet", 0)))
+        await asyncio.gather(*tasks)
+
+        self.assertEqual(order[:3], [("busy", 0), ("busy", 1), ("quiet", 0)])
+        self.assertEqual(governor.in_flight, 0)
+
+    async def test_weighted_fair_queueing_by_class(self):
+        governor = LLMGovernor(initial_concurrency=1, max_concurrency=1,
+                               weights={PRIORITY_INTERACTIVE: 8, PRIORITY_NORMAL: 4, PRIORITY_BACKGROUND: 1})
+        order = []
+
+        def call(priority, flow, n):
+            async def fn():
+                order.append((priority, flow, n))
+                await asyncio.sleep(0.005)
+            return governor.call(fn, key=flow, priority=priority)
+
+        blocker = asyncio.create_task(call(PRIORITY_NORMAL, "x", 0))
+        await asyncio.sleep(0)
+        tasks = [asyncio.create_task(call(PRIORITY_BACKGROUND, "critic", n)) for n in range(3)]
+        tasks += [asyncio.create_task(call(PRIORITY_NORMAL, "research", n)) for n in range(3)]
+        tasks += [asyncio.create_task(call(PRIORITY_NORMAL, "chat", 0))]
+        tasks += [asyncio.create_task(call(PRIORITY_INTERACTIVE, "chat", 1))]
+        await asyncio.sleep(0)
+        self.assertEqual(governor.snapshot()["queued"], {PRIORITY_BACKGROUND: 3, PRIORITY_NORMAL: 4, PRIORITY_INTERACTIVE: 1})
+        await asyncio.gather(blocker, *tasks)
+
+        served = order[1:]
+        self.assertEqual(served[0], (PRIORITY_INTERACTIVE, "chat", 1))
+        # The quick chat is not stuck behind the whole research backlog
+        self.assertLess(served.index((PRIORITY_NORMAL, "chat", 0)), served.index((PRIORITY_NORMAL, "research", 1)))
+        # Background work still progresses, but behind everything else
+        self.assertEqual([entry[0] for entry in served[-2:]], [PRIORITY_BACKGROUND, PRIORITY_BACKGROUND])
+
+        waits = governor.metrics.snapshot()["histograms"]["llm.wait_seconds"]
+        self.assertEqual(set(waits), {PRIORITY_INTERACTIVE, PRIORITY_NORMAL, PRIORITY_BACKGROUND})
+        self.assertGreater(waits[PRIORITY_BACKGROUND]["max"], waits[PRIORITY_INTERACTIVE]["max"])
+
+    async def test_aimd(self):
+        governor = LLMGovernor(initial_concurrency=8, max_concurrency=16, latency_target=10)
+        attempts = []
+
+        async def flaky():
+            attempts.append(time.monotonic())
+            if len(attempts) == 1:
+                raise RateLimitError("slow down")
+            return FakeResponse()
+
+        with patch("grok_team.llm_governor._BACKOFF_BASE", 0.05):
+            await governor.call(flaky, key="a")
+        self.assertEqual(len(attempts), 2)
+        self.assertGreaterEqual(attempts[1] - attempts[0], 0.05)
+        # Halved on the 429, then one additive step
+        self.assertAlmostEqual(governor.limit, 4 + 1 / 4)
+
+        # A call slower than the target shrinks the limit a little
+        await governor.acquire("a")
+        governor.release(latency=30)
+        self.assertAlmostEqual(governor.limit, (4 + 1 / 4) * 0.9)
+
+    async def test_gives_up_after_max_retries(self):
+        governor = LLMGovernor(max_retries=1)
+
+        async def always_limited():
+            raise RateLimitError("no")
+
+        with patch("grok_team.llm_governor._BACKOFF_BASE", 0.01):
+            with self.assertRaises(RateLimitError):
+                await governor.call(always_limited)
+        self.assertEqual(governor.in_flight, 0)
+        self.assertEqual(governor.limit, governor.min_concurrency)
+
+    async def test_requests_per_minute(self):
+        governor = LLMGovernor(rpm=600)  # capacity 600, refills 10/s
+        governor.requests.tokens = 0
+        started = time.monotonic()
+
+        async def fn():
+            return None
+
+        await governor.call(fn)
+        self.assertGreaterEqual(time.monotonic() - started, 0.09)
+
+    async def test_kernel_attaches_governor_to_agents(self):
+        kernel = Kernel()
+        agent = Agent("Grok", kernel.event_bus)
+        kernel.register_actor(agent)
+        self.assertIs(agent.governor, kernel.llm_governor)
+        self.assertEqual(agent.priority_class, PRIORITY_INTERACTIVE)
+        self.assertEqual(Agent("Harper", kernel.event_bus).priority_class, PRIORITY_NORMAL)
+        self.assertIn("llm_governor", kernel.metrics_snapshot())
+
+    async def test_summaries_run_in_the_background_class(self):
+        kernel = Kernel()
+        agent = Agent("Grok", kernel.event_bus)
+        kernel.register_actor(agent)
+        priorities = []
+
+        async def call(fn, key=None, estimated_tokens=0, priority=PRIORITY_NORMAL):
+            priorities.append(priority)
+            return NS(choices=[NS(message=NS(content="summary"))])
+        agent.governor.call = call
+
+        self.assertEqual(await agent.summarize_transcript([{"role": "user", "content": "hi"}]), "summary")
+        await agent._chat_completion(model=agent.model, messages=[])
+        self.assertEqual(priorities, [PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,9 +2,11 @@ import unittest
 import asyncio
 import os
 import shutil
+import json
 from grok_team.event_bus import EventBus
 from grok_team.kernel import Kernel
 from grok_team.event_logger import EventLogger
+from grok_team.events import TaskCompleted
 
 class TestEventLogger(unittest.IsolatedAsyncioTestCase):
     async def asyncSetUp(self):
@@ -37,5 +39,19 @@ class TestEventLogger(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(events[-1]["content"], "Hello Logger")
         self.assertIn("timestamp", events[-1])
 
+    async def test_typed_events_reuse_their_encoding(self):
+        event = TaskCompleted(from_="Grok", correlation_id="c1", content="done")
+        logger = self.kernel.event_logger
+        await logger.log_event(event)
+        await logger.log_event(event)
+
+        with open(logger.current_session_file, encoding="utf-8") as f:
+            lines = f.read().splitlines()[-2:]
+        # The cached JSON is spliced, not re-serialized
+        self.assertTrue(all(line.startswith(event.to_json()[:-1]) for line in lines))
+        first, second = (json.loads(line) for line in lines)
+        self.assertEqual(second["seq"], first["seq"] + 1)
+        self.assertEqual({k: v for k, v in first.items() if k != "seq"}, event.to_dict())
+
 if __name__ == "__main__":
     unittest.main()
@@ -3,6 +3,8 @@ import asyncio
 from grok_team.event_bus import EventBus
 from grok_team.actor import Actor
 from grok_team.kernel import Kernel
+from grok_team.agent import Agent
+from grok_team.loop_detector import LoopDetector
 
 class MockAgent(Actor):
     def __init__(self, name, bus):
@@ -53,5 +55,84 @@ class TestLoopDetection(unittest.IsolatedAsyncioTestCase):
 
         self.assertEqual(actor.interrupt_count, 1)
 
+    async def test_preemptive_interrupt_leaves_history_valid(self):
+        agent = Agent("Runner", self.bus)
+        self.kernel.register_actor(agent)
+        self.kernel._spawn_actor_task(agent)
+
+        async def mock_step(ctx=None):
+            msg = {
+                "role": "assistant",
+                "tool_calls": [{"id": "call_1", "type": "function",
+                                "function": {"name": "python_run", "arguments": "{}"}}]
+            }
+            agent.messages.append(msg)
+            return msg
+
+        async def slow_tool(tool_call, correlation_id=None):
+            await asyncio.sleep(5)
+            return True
+
+        agent.step = mock_step
+        agent._execute_tool = slow_tool
+
+        await agent.inbox.put({"type": "TaskSubmitted", "content": "go", "from": "Someone"})
+        await asyncio.sleep(0.05)
+        await self.kernel.interrupt_agent("Runner", "Loop Detected: stop", preempt=True)
+        await asyncio.sleep(0.05)
+
+        tool_msgs = [m for m in agent.messages if m.get("role") == "tool"]
+        self.assertEqual(len(tool_msgs), 1)
+        self.assertIn("Cancelled", tool_msgs[0]["content"])
+        self.assertEqual(agent.messages[-1], {"role": "system", "content": "INTERRUPT: Loop Detected: stop"})
+        self.assertFalse(self.kernel.tasks["Runner"].done())
+
+
+class TestLoopDetector(unittest.TestCase):
+    def setUp(self):
+        self.detector = LoopDetector(window=8, tool_thresholds={"wait": {"repeats": 0, "cycles": 0}})
+
+    def test_near_duplicates_count_as_repeats(self):
+        queries = ["latest python release", "Latest Python release!", "latest python releases"]
+        results = [self.detector.observe("A", "web_search", {"query": q}) for q in queries]
+        self.assertEqual(results[:2], [None, None])
+        self.assertIn("near-identical", results[2])
+        # Different queries and other agents are unaffected
+        self.assertIsNone(self.detector.observe("A", "web_search", {"query": "rust borrow checker"}))
+        self.assertIsNone(self.detector.observe("B", "web_search", {"query": "latest python release"}))
+
+    def test_shared_preamble_or_interleaved_calls_are_not_repeats(self):
+        preamble = "".join(f"import module_{i} as alias_{i}\nconfig_{i} = alias_{i}.load('settings_{i}.json')\n" for i in range(8))
+        for step in ("load the data", "clean the columns", "plot the results"):
+            self.assertIsNone(self.detector.observe("A", "python_run", {"code": preamble + f"print('{step}')"}))
+        for other in ("a", "b"):
+            self.assertIsNone(self.detector.observe("B", "web_search", {"query": "python release"}))
+            self.assertIsNone(self.detector.observe("B", "python_run", {"code": other}))
+        self.assertIsNone(self.detector.observe("B", "web_search", {"query": "python release"}))
+
+    def test_cycles(self):
+        calls = [("web_search", {"query": "foo"}), ("python_run", {"code": "print(1)"})] * 2
+        results = [self.detector.observe("A", tool, args) for tool, args in calls]
+        self.assertEqual(results[:3], [None, None, None])
+        self.assertIn("cycling through the same 2 calls (web_search, python_run)", results[3])
+
+    def test_paging_through_an_artifact_is_not_a_loop(self):
+        for start in range(0, 40000, 4000):
+            args = {"artifact_id": "art_1", "start": start, "length": 4000}
+            self.assertIsNone(self.detector.observe("A", "read_artifact", args))
+        # Reading the same page again still is
+        self.assertIsNone(self.detector.observe("A", "read_artifact", args))
+        self.assertIsNotNone(self.detector.observe("A", "read_artifact", args))
+
+    def test_per_tool_thresholds_and_export(self):
+        for _ in range(5):
+            self.assertIsNone(self.detector.observe("A", "wait", {"seconds": 1}))
+        self.assertEqual(self.detector.export("A")[-1], ("wait", "", '["1"]'))
+
+        restored = LoopDetector(window=8)
+        restored.restore("A", [("web_search", "foo")] * 2)
+        self.assertIsNotNone(restored.observe("A", "web_search", {"query": "foo"}))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,119 @@
+import unittest
+import asyncio
+from grok_team.event_bus import EventBus
+from grok_team.actor import Actor
+from grok_team.mailbox import (
+    Mailbox,
+    OVERFLOW_BLOCK,
+    OVERFLOW_DROP_OLDEST,
+    OVERFLOW_DROP_NEWEST,
+    OVERFLOW_COALESCE,
+)
+
+
+class TestMailboxPolicies(unittest.IsolatedAsyncioTestCase):
+    async def test_block_policy_applies_backpressure(self):
+        box = Mailbox(maxsize=1, policy=OVERFLOW_BLOCK)
+        await box.put({"type": "Work", "n": 1})
+
+        blocked = asyncio.create_task(box.put({"type": "Work", "n": 2}))
+        await asyncio.sleep(0.01)
+        self.assertFalse(blocked.done())
+
+        self.assertEqual((await box.get())["n"], 1)
+        await asyncio.wait_for(blocked, timeout=0.5)
+        self.assertEqual((await box.get())["n"], 2)
+
+    async def test_drop_oldest(self):
+        overflows = []
+        box = Mailbox(maxsize=2, policy=OVERFLOW_DROP_OLDEST,
+                      on_overflow=lambda msg, action: overflows.append((msg["n"], action)))
+        for n in range(4):
+            await box.put({"type": "Work", "n": n})
+
+        self.assertEqual([box.get_nowait()["n"], box.get_nowait()["n"]], [2, 3])
+        self.assertEqual(overflows, [(0, "dropped"), (1, "dropped")])
+
+    async def test_put_front_requeues_at_the_head(self):
+        box = Mailbox(maxsize=1, policy=OVERFLOW_DROP_NEWEST)
+        await box.put({"type": "Work", "n": 2})
+        box.put_front({"type": "Work", "n": 1})  # a redelivery is never refused
+        self.assertEqual([box.get_nowait()["n"], box.get_nowait()["n"]], [1, 2])
+
+    async def test_drop_newest(self):
+        box = Mailbox(maxsize=1, policy=OVERFLOW_DROP_NEWEST)
+        self.assertTrue(await box.put({"type": "Work", "n": 1}))
+        self.assertFalse(await box.put({"type": "Work", "n": 2}))
+        self.assertEqual(box.qsize(), 1)
+
+    async def test_coalesce_replaces_message_with_same_key(self):
+        box = Mailbox(maxsize=2, policy=OVERFLOW_COALESCE)
+        await box.put({"type": "Status", "coalesce_key": "a", "n": 1})
+        await box.put({"type": "Status", "coalesce_key": "b", "n": 2})
+        await box.put({"type": "Status", "coalesce_key": "a", "n": 3})
+
+        self.assertEqual([box.get_nowait()["n"], box.get_nowait()["n"]], [3, 2])
+
+    async def test_control_messages_bypass_capacity(self):
+        box = Mailbox(maxsize=1, policy=OVERFLOW_BLOCK)
+        await box.put({"type": "Work"})
+        box.put_nowait({"type": "PoisonPill"})
+        self.assertEqual(box.qsize(), 2)
+
+        with self.assertRaises(asyncio.QueueFull):
+            box.put_nowait({"type": "Work"})
+
+    async def test_join_accounts_for_dropped_messages(self):
+        box = Mailbox(maxsize=1, policy=OVERFLOW_DROP_OLDEST)
+        await box.put({"type": "Work"})
+        await box.put({"type": "Work"})
+        box.get_nowait()
+        box.task_done()
+        await asyncio.wait_for(box.join(), timeout=0.5)
+
+    async def test_control_lane_served_first(self):
+        box = Mailbox()
+        await box.put({"type": "Work", "n": 1})
+        await box.put({"type": "Work", "n": 2})
+        await box.put({"type": "InterruptSignal"})
+
+        self.assertEqual(box.get_nowait()["type"], "InterruptSignal")
+        self.assertEqual(box.get_nowait()["n"], 1)
+
+    async def test_get_control_skips_work(self):
+        box = Mailbox()
+        await box.put({"type": "Work"})
+        waiter = asyncio.create_task(box.get_control())
+        await asyncio.sleep(0.01)
+        self.assertFalse(waiter.done())
+
+        await box.put({"type": "BudgetUpdate", "amount": 1})
+        control = await asyncio.wait_for(waiter, timeout=0.5)
+        self.assertEqual(control["type"], "BudgetUpdate")
+        self.assertEqual(box.qsize(), 1)
+
+
+class TestInboxOverflowReporting(unittest.IsolatedAsyncioTestCase):
+    async def test_overflow_published_once_per_burst(self):
+        bus = EventBus()
+        actor = Actor("Hot", bus, inbox_maxsize=2, inbox_policy=OVERFLOW_DROP_OLDEST)
+        reports = []
+
+        async def on_overflow(event):
+            reports.append(event)
+
+        bus.subscribe("InboxOverflow", on_overflow)
+
+        for n in range(10):
+            await bus.publish({"type": "Work", "target": "Hot", "n": n})
+        await asyncio.sleep(0.01)
+
+        self.assertEqual(actor.inbox.qsize(), 2)
+        self.assertEqual(len(reports), 1)
+        self.assertEqual(reports[0]["actor"], "Hot")
+        self.assertEqual(reports[0]["counts"], {"dropped": 8})
+        self.assertEqual(reports[0]["policy"], OVERFLOW_DROP_OLDEST)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,6 +3,8 @@ import asyncio
 from grok_team.agent import Agent
 from grok_team.kernel import Kernel
 from grok_team.artifact_store import GLOBAL_ARTIFACT_STORE
+from grok_team.agent import StreamedCompletion, rolling_summary, compact_transcript
+from grok_team.tokens import approximate_tokens, counted, message_tokens, MESSAGE_OVERHEAD
 
 class TestMemoryAndArtifacts(unittest.IsolatedAsyncioTestCase):
     async def asyncSetUp(self):
@@ -47,6 +49,8 @@ class TestMemoryAndArtifacts(unittest.IsolatedAsyncioTestCase):
         # Add 25 messages
         for i in range(25):
             agent.add_message("user", f"Msg {i}")
+        # Compression is token based: make the history fill most of the prompt budget
+        agent.context_window -= agent.prompt_budget() - agent.context_tokens() - 10
             
         # We need to mock compress_memory or step's internal call
         original_compress = agent.compress_memory
@@ -83,7 +87,118 @@ class TestMemoryAndArtifacts(unittest.IsolatedAsyncioTestCase):
         agent.client = MockClient()
         
         await agent.step()
+        # Compression runs in the background, next to the step
+        await agent.compression_task
         self.assertTrue(called)
 
+    async def test_rolling_summary_folds_only_new_messages(self):
+        agent = Agent("Roller", self.bus)
+        for i in range(10):
+            agent.add_message("user", f"Msg {i}")
+        calls = []
+        release = asyncio.Event()
+
+        async def summarize(transcript, previous_summary=""):
+            calls.append(([m["content"] for m in transcript], previous_summary))
+            await release.wait()
+            return f"summary {len(calls)}"
+
+        agent.summarize_transcript = summarize
+        task = agent.schedule_compression()
+        self.assertIs(agent.schedule_compression(), task)  # one run at a time
+        await asyncio.sleep(0)
+        agent.add_message("user", "Msg 10")  # the agent keeps working meanwhile
+        release.set()
+        self.assertTrue(await task)
+
+        self.assertEqual(calls[0], ([f"Msg {i}" for i in range(5)], ""))
+        self.assertEqual(rolling_summary(agent.messages), "summary 1")
+        self.assertEqual([m["content"] for m in agent.messages[2:]], [f"Msg {i}" for i in range(5, 11)])
+
+        for i in range(11, 14):
+            agent.add_message("user", f"Msg {i}")
+        self.assertTrue(await agent.compress_memory())
+        self.assertEqual(calls[1], (["Msg 5", "Msg 6", "Msg 7", "Msg 8"], "summary 1"))
+        self.assertEqual(rolling_summary(agent.messages), "summary 2")
+
+    async def test_summary_is_discarded_if_history_changed(self):
+        agent = Agent("Rewinder", self.bus)
+        for i in range(10):
+            agent.add_message("user", f"Msg {i}")
+
+        async def summarize(transcript, previous_summary=""):
+            agent.messages = agent.messages[:3]  # e.g. restored from a checkpoint
+            return "stale"
+
+        agent.summarize_transcript = summarize
+        self.assertFalse(await agent.compress_memory())
+        self.assertIsNone(rolling_summary(agent.messages))
+
+    def test_compact_transcript(self):
+        transcript = compact_transcript([
+            {"role": "user", "content": "find x"},
+            {"role": "assistant", "content": None, "tool_calls": [
+                {"id": "1", "type": "function", "function": {"name": "web_search", "arguments": '{"query": "x"}'}}]},
+            {"role": "tool", "name": "web_search", "content": "y" * 2000},
+        ])
+        lines = transcript.split("\n")
+        self.assertEqual(lines[:2], ["user: find x", 'assistant: [calls web_search({"query": "x"})]'])
+        self.assertTrue(lines[2].startswith("tool web_search: yyy"))
+        self.assertTrue(lines[2].endswith(" [...]"))
+
+    async def test_overflowing_history_is_truncated_before_sending(self):
+        agent = Agent("Truncator", self.bus)
+        agent.add_message("user", "old question " * 200)
+        agent.messages.append({"role": "assistant", "tool_calls": [
+            {"id": "call_1", "type": "function", "function": {"name": "web_search", "arguments": "{}"}}]})
+        agent.add_tool_call_result("call_1", "old result " * 100, "web_search")
+        agent.add_message("user", "latest question")
+
+        # Room for the system prompt and the latest question only
+        agent.context_window -= agent.prompt_budget() - message_tokens(agent.messages[0]) - message_tokens(agent.messages[-1]) - 5
+        sent = []
+
+        async def no_compress():
+            pass
+
+        async def fake_completion(request):
+            sent.append(request["messages"])
+            return StreamedCompletion({"role": "assistant", "content": "ok"})
+
+        agent.compress_memory = no_compress
+        agent._streamed_completion = fake_completion
+        await agent.step()
+
+        # The tool call and its result are dropped together
+        self.assertEqual([m["role"] for m in sent[0]], ["system", "user"])
+        self.assertEqual(sent[0][1]["content"], "latest question")
+
+    async def test_truncation_never_leaves_an_orphaned_tool_result(self):
+        agent = Agent("Orphans", self.bus)
+        agent.messages.append({"role": "assistant", "tool_calls": [
+            {"id": "call_1", "type": "function", "function": {"name": "web_search", "arguments": "{}"}}]})
+        agent.add_tool_call_result("call_1", "result " * 100, "web_search")
+        agent.add_tool_call_result("call_1", "more " * 100, "web_search")
+
+        self.assertEqual(agent._truncate_to_fit(message_tokens(agent.messages[0])), 3)
+        self.assertEqual([m["role"] for m in agent.messages], ["system"])
+
+    async def test_overflow_does_not_spend_budget(self):
+        agent = Agent("Overflow", self.bus)
+        agent.add_message("user", "question " * 200)
+        agent.context_window -= agent.prompt_budget() - message_tokens(agent.messages[0])
+        budget = agent.budget
+
+        with self.assertRaises(ValueError):
+            await agent.step()
+        self.assertEqual(agent.budget, budget)
+
+    def test_token_estimates(self):
+        self.assertEqual(approximate_tokens("abcdefgh"), 2)
+        self.assertEqual(approximate_tokens("привет"), 3)  # non-Latin scripts are denser
+        message = counted({"role": "user", "content": "abcdefgh"})
+        self.assertEqual(message.tokens, MESSAGE_OVERHEAD + 2)
+        self.assertEqual(message, {"role": "user", "content": "abcdefgh"})
+
 if __name__ == "__main__":
     unittest.main()
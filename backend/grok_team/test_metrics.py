@@ -0,0 +1,85 @@
+import unittest
+import asyncio
+from grok_team.event_bus import EventBus, DELIVERY_ASYNC
+from grok_team.actor import Actor
+from grok_team.kernel import Kernel
+from grok_team.metrics import Histogram, MetricsRegistry
+
+
+class SlowActor(Actor):
+    async def handle_message(self, message):
+        await asyncio.sleep(0.02)
+
+
+class TestHistogram(unittest.TestCase):
+    def test_summary(self):
+        histogram = Histogram()
+        for value in (0.001, 0.002, 0.004, 1.0):
+            histogram.observe(value)
+        summary = histogram.summary()
+        self.assertEqual(summary["count"], 4)
+        self.assertAlmostEqual(summary["sum"], 1.007)
+        self.assertEqual(summary["max"], 1.0)
+        self.assertLessEqual(summary["p50"], 0.0032)
+        self.assertEqual(summary["p99"], 1.0)
+
+    def test_disabled_registry_records_nothing(self):
+        registry = MetricsRegistry(enabled=False)
+        registry.inc("bus.published", "X")
+        registry.observe("bus.handler_seconds", "h", 0.1)
+        snapshot = registry.snapshot()
+        self.assertEqual(snapshot["counters"], {})
+        self.assertEqual(snapshot["histograms"], {})
+
+
+class TestRuntimeMetrics(unittest.IsolatedAsyncioTestCase):
+    async def test_bus_metrics(self):
+        bus = EventBus()
+
+        async def observer(event):
+            await asyncio.sleep(0.005)
+
+        bus.subscribe("Ping", observer)
+        bus.subscribe("Ping", observer, delivery=DELIVERY_ASYNC)
+        for _ in range(3):
+            await bus.publish({"type": "Ping"})
+        await bus.drain()
+
+        snapshot = bus.metrics.snapshot()
+        self.assertEqual(snapshot["counters"]["bus.published"]["Ping"]["count"], 3)
+        self.assertGreater(snapshot["counters"]["bus.published"]["Ping"]["rate"], 0)
+        handler = next(iter(snapshot["histograms"]["bus.handler_seconds"].values()))
+        self.assertEqual(handler["count"], 6)
+        self.assertGreaterEqual(handler["min"], 0.004)
+        self.assertEqual(next(iter(snapshot["histograms"]["bus.delivery_lag_seconds"].values()))["count"], 3)
+        await bus.shutdown()
+
+    async def test_kernel_snapshot(self):
+        kernel = Kernel()
+        actor = SlowActor("Worker", kernel.event_bus)
+        kernel.register_actor(actor)
+        for _ in range(3):
+            await actor.inbox.put({"type": "Job"})
+
+        snapshot = kernel.metrics_snapshot()
+        self.assertEqual(snapshot["queue_depths"]["inbox:Worker"], 3)
+
+        await kernel.start()
+        await asyncio.wait_for(actor.inbox.join(), timeout=1)
+        snapshot = kernel.metrics_snapshot()
+        self.assertEqual(snapshot["queue_depths"]["inbox:Worker"], 0)
+        processing = snapshot["histograms"]["actor.processing_seconds"]["Worker/Job"]
+        self.assertEqual(processing["count"], 3)
+        self.assertGreaterEqual(processing["min"], 0.015)
+        wait = snapshot["histograms"]["actor.inbox_wait_seconds"]["Worker"]
+        self.assertEqual(wait["count"], 3)
+        # The last job waited for the two before it
+        self.assertGreaterEqual(wait["max"], 0.03)
+
+        actor.stop()
+        await asyncio.gather(*kernel.tasks.values(), return_exceptions=True)
+        await kernel.event_bus.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+import asyncio
+from unittest.mock import patch
+from grok_team.kernel import Kernel
+from grok_team.agent import Agent
+from grok_team.event_bus import EventBus
+from grok_team.pools import RolePool
+
+
+async def slow_step(self, ctx=None):
+    await asyncio.sleep(0.1)
+    msg = {"role": "assistant", "content": f"answer from {self.name}"}
+    self.messages.append(msg)
+    return msg
+
+
+class TestRolePools(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.step_patch = patch.object(Agent, "step", slow_step)
+        self.step_patch.start()
+        self.pools_patch = patch("grok_team.kernel.ROLE_POOLS", ["Harper"])
+        self.pools_patch.start()
+        self.kernel = Kernel()
+        await self.kernel.start()
+        self.replies = asyncio.Queue()
+        self.kernel.event_bus.register_actor("req", self.replies)
+
+    async def asyncTearDown(self):
+        await self.kernel.stop()
+        self.step_patch.stop()
+        self.pools_patch.stop()
+
+    async def test_burst_scales_out_and_shrinks_back(self):
+        session = await self.kernel.open_session("a")
+        pool = self.kernel.pools["Harper@a"]
+        self.assertEqual(pool.members, [session.actors["Harper"]])
+
+        for i in range(6):
+            await self.kernel.event_bus.publish({"type": "TaskSubmitted", "target": "Harper@a", "from": "req",
+                                                 "correlation_id": f"c{i}", "content": f"task {i}"})
+        self.assertEqual(len(pool.members), 3)
+        self.assertIn("Harper-2", session.actors)
+
+        replies = [await asyncio.wait_for(self.replies.get(), timeout=1) for _ in range(6)]
+        senders = {reply["from"] for reply in replies}
+        self.assertEqual(senders, {"Harper@a", "Harper-2@a", "Harper-3@a"})
+
+        # Clones are retired once idle; the role keeps its base agent
+        self.assertEqual(sorted(await self.kernel.shrink_pools(idle_for=0)), ["Harper-2@a", "Harper-3@a"])
+        self.assertEqual(pool.members, [session.actors["Harper"]])
+        self.assertNotIn("Harper-2@a", self.kernel.actors)
+        self.assertFalse(self.kernel.event_bus.is_registered("Harper-2@a"))
+
+    async def test_replies_are_not_balanced(self):
+        session = await self.kernel.open_session("a")
+        pool = self.kernel.pools["Harper@a"]
+        self.assertEqual(pool.dispatch({"type": "TaskCompleted"}), "Harper@a")
+        await self.kernel.close_session("a")
+        self.assertNotIn("Harper@a", self.kernel.pools)
+
+    async def test_pools_are_opt_in(self):
+        with patch("grok_team.kernel.ROLE_POOLS", []):
+            await self.kernel.open_session("b")
+        self.assertEqual(self.kernel.pools, {})
+
+
+class TestWorkStealing(unittest.IsolatedAsyncioTestCase):
+    async def test_idle_member_steals_newest_half(self):
+        bus = EventBus()
+        base = Agent("Harper", bus)
+        thief = Agent("Harper-2", bus)
+        pool = RolePool(base, lambda pool: thief)
+        pool.grow()
+        for i in range(5):
+            await base.inbox.put({"type": "TaskSubmitted", "content": f"t{i}"})
+        await base.inbox.put({"type": "TaskCompleted", "content": "reply"})
+
+        self.assertEqual(pool.steal_for(thief), 2)
+        self.assertEqual([m["content"] for m in thief.inbox.peek_work()], ["t3", "t4"])
+        self.assertEqual([m["content"] for m in base.inbox.peek_work()], ["t0", "t1", "t2", "reply"])
+
+
+if __name__ == "__main__":
+    unittest.main()
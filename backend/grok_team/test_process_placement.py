@@ -0,0 +1,114 @@
+import unittest
+import asyncio
+from grok_team.actor import Actor
+from grok_team.kernel import Kernel
+
+
+class EchoActor(Actor):
+    """Runs inside the worker process; must be importable by module path."""
+    def __init__(self, name, event_bus, system_prompt=None, **kwargs):
+        super().__init__(name, event_bus, **kwargs)
+        self.system_prompt = system_prompt
+
+    async def handle_message(self, message):
+        if message.get("type") == "Echo":
+            await self.send(message["from"], {"type": "EchoReply", "content": f"{self.system_prompt}: {message['content']}"})
+        elif message.get("type") == "Ask":
+            agents = await self.event_bus.request({
+                "type": "SystemCall", "command": "list_agents", "args": {}, "sender": self.name
+            }, timeout=5)
+            await self.send(message["from"], {"type": "EchoReply", "content": agents})
+        elif message.get("type") == "Notify":
+            await self.send("Collector", {"type": "EchoReply", "content": "to my session peer"})
+        elif message.get("type") == "Crash":
+            raise ValueError("remote boom")
+
+
+class GovernedActor(EchoActor):
+    """An actor that makes (fake) LLM calls through its governor."""
+    def __init__(self, name, event_bus, system_prompt=None, **kwargs):
+        super().__init__(name, event_bus, system_prompt, **kwargs)
+        self.governor = None
+
+    async def handle_message(self, message):
+        if message.get("type") == "Call":
+            result = await self.governor.call(lambda: asyncio.sleep(0.5, "ok"), key="conv", estimated_tokens=10)
+            await self.send(message["from"], {"type": "EchoReply", "content": f"{type(self.governor).__name__}: {result}"})
+
+
+class Collector(Actor):
+    def __init__(self, name, event_bus):
+        super().__init__(name, event_bus)
+        self.received = []
+
+    async def handle_message(self, message):
+        self.received.append(message)
+
+
+class TestProcessPlacement(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.kernel = Kernel()
+        self.collector = Collector("Collector", self.kernel.event_bus)
+        self.kernel.register_actor(self.collector)
+        await self.kernel.start()
+
+    async def asyncTearDown(self):
+        await self.kernel.stop()
+
+    async def _wait_for(self, predicate, timeout=15.0):
+        deadline = asyncio.get_running_loop().time() + timeout
+        while not predicate():
+            if asyncio.get_running_loop().time() > deadline:
+                self.fail("Timed out waiting for remote actor")
+            await asyncio.sleep(0.05)
+
+    async def test_messages_and_requests_cross_process(self):
+        ok, _ = await self.kernel.spawn_agent("Remote", "echo", agent_cls=EchoActor, placement="process")
+        self.assertTrue(ok)
+
+        await self.collector.send("Remote", {"type": "Echo", "content": "hi"})
+        await self._wait_for(lambda: len(self.collector.received) >= 1)
+        self.assertEqual(self.collector.received[0]["content"], "echo: hi")
+        self.assertEqual(self.collector.received[0]["from"], "Remote")
+
+        await self.collector.send("Remote", {"type": "Ask"})
+        await self._wait_for(lambda: len(self.collector.received) >= 2)
+        self.assertIn("Remote", self.collector.received[1]["content"])
+
+    async def test_plain_names_resolve_to_session_peers(self):
+        peer = asyncio.Queue()
+        self.kernel.event_bus.register_actor("Collector@s1", peer)
+        await self.kernel.spawn_agent("Remote@s1", "echo", agent_cls=EchoActor, placement="process")
+
+        await self.collector.send("Remote@s1", {"type": "Notify"})
+        reply = await asyncio.wait_for(peer.get(), timeout=15)
+        self.assertEqual(reply["content"], "to my session peer")
+        self.assertEqual(self.collector.received, [])
+
+    async def test_remote_crash_reaches_reaper(self):
+        crashes = []
+
+        async def on_crash(event):
+            crashes.append(event)
+
+        self.kernel.event_bus.subscribe("ActorCrashed", on_crash)
+        await self.kernel.spawn_agent("Fragile", "x", agent_cls=EchoActor, placement="process")
+        await self.collector.send("Fragile", {"type": "Crash"})
+
+        await self._wait_for(lambda: crashes)
+        self.assertIn("remote boom", crashes[0]["error"])
+
+    async def test_remote_llm_calls_are_admitted_by_the_kernel_governor(self):
+        governor = self.kernel.llm_governor
+        await self.kernel.spawn_agent("Governed", "x", agent_cls=GovernedActor, placement="process")
+        await self.collector.send("Governed", {"type": "Call"})
+
+        # The worker's call holds a slot of the parent's governor while it runs
+        await self._wait_for(lambda: governor.in_flight == 1)
+        await self._wait_for(lambda: self.collector.received)
+        self.assertEqual(self.collector.received[0]["content"], "BridgedGovernor: ok")
+        await self._wait_for(lambda: governor.in_flight == 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -42,5 +42,72 @@ class TestRecovery(unittest.IsolatedAsyncioTestCase):
         
         await kernel.stop()
 
+    async def test_replayed_spawn_is_scoped_and_not_logged_again(self):
+        await self.logger.log_event({
+            "type": "SystemCall",
+            "command": "spawn_agent",
+            "args": {"name": "Analyst", "system_prompt": "Analyze", "temperature": 0.2},
+            "sender": "Grok@conv-1"
+        })
+        kernel = Kernel()
+        kernel.event_logger = self.logger
+        await kernel.recover_session()
+        await kernel.start()
+        await kernel.event_bus.drain()
+
+        self.assertIn("Analyst@conv-1", kernel.actors)
+        self.assertNotIn("Analyst", kernel.actors)
+        self.assertIn("Analyst@conv-1", kernel.spawned)
+        self.assertEqual([e["type"] for e in self.logger.get_all_events()], ["SystemCall"])
+        await kernel.stop()
+
+    async def test_snapshot_compaction_and_tail_replay(self):
+        kernel = Kernel()
+        kernel.event_logger = self.logger
+        await kernel.start()
+        ok, _ = await kernel.spawn_agent("Phoenix", "Rise", temperature=0.8)
+        self.assertTrue(ok)
+        phoenix = kernel.actors["Phoenix"]
+        phoenix.budget = 4
+        phoenix.add_message("user", "before the snapshot")
+        await kernel.event_bus.publish({"type": "ToolUse", "actor": "Phoenix", "tool": "search", "args": {"q": "x"}})
+
+        seq = await kernel.checkpoint()
+        self.assertGreater(seq, 0)
+        self.assertEqual(self.logger.get_all_events(), [])  # covered events are compacted away
+        self.assertEqual(self.logger.recent_events(1)[0]["type"], "ToolUse")  # ... into the archive
+
+        # The tail: a request answered after the snapshot
+        await self.logger.log_event({"type": "TaskSubmitted", "target": "Phoenix", "from": "Grok", "content": "after"})
+        await self.logger.log_event({"type": "TaskCompleted", "target": "Grok", "from": "Phoenix", "content": "done"})
+        await kernel.stop()
+
+        restored = Kernel()
+        restored.event_logger = EventLogger(storage_dir=self.test_dir)
+        await restored.recover_session()
+        agent = restored.actors["Phoenix"]
+        self.assertIsInstance(agent, Agent)
+        self.assertIsNot(agent, phoenix)
+        self.assertEqual(agent.temperature, 0.8)
+        self.assertEqual(agent.budget, 4)
+        self.assertEqual(agent.messages[-3:], [
+            {"role": "user", "content": "before the snapshot"},
+            {"role": "user", "content": "[Message from Grok]: after"},
+            {"role": "assistant", "content": "done"},
+        ])
+        self.assertEqual(restored.loop_detector.export("Phoenix"), [("search", "x", "[]")])
+        self.assertIn("Phoenix", restored.spawned)
+        await restored.stop()
+
+    async def test_sequence_survives_restart(self):
+        await self.logger.log_event({"type": "A"})
+        await self.logger.log_event({"type": "B"})
+        await self.logger.compact(1)
+        reopened = EventLogger(storage_dir=self.test_dir)
+        self.assertEqual(reopened.sequence, 2)
+        self.assertEqual([e["type"] for e in reopened.iter_events()], ["B"])
+        self.assertEqual(list(reopened.iter_events(after_seq=2)), [])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,122 @@
+import unittest
+import asyncio
+import json
+import time
+from grok_team.kernel import Kernel
+from grok_team.config import ALL_AGENT_NAMES
+from grok_team.session import make_address, split_address, display_name
+
+
+def mock_steps(agent, delay=0.05):
+    agent.calls = []
+
+    async def mock_step(ctx=None):
+        agent.calls.append(agent.current_temperature())
+        await asyncio.sleep(delay)
+        msg = {"role": "assistant", "content": f"answer from {agent.name}"}
+        agent.messages.append(msg)
+        return msg
+
+    agent.step = mock_step
+
+
+class TestAddresses(unittest.TestCase):
+    def test_helpers(self):
+        self.assertEqual(make_address("Harper", "c1"), "Harper@c1")
+        self.assertEqual(make_address("Harper", None), "Harper")
+        self.assertEqual(make_address("Harper@c2", "c1"), "Harper@c2")
+        self.assertEqual(split_address("Harper@c1"), ("Harper", "c1"))
+        self.assertEqual(split_address("Harper"), ("Harper", None))
+        self.assertEqual(display_name("Grok@c1"), "Grok")
+
+
+class TestSessions(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.kernel = Kernel()
+        await self.kernel.start()
+
+    async def asyncTearDown(self):
+        await self.kernel.stop()
+
+    async def test_sessions_are_isolated_and_run_concurrently(self):
+        a = await self.kernel.open_session("a")
+        b = await self.kernel.open_session("b")
+        self.assertIs(await self.kernel.open_session("a"), a)
+        self.assertEqual(set(a.actors), set(ALL_AGENT_NAMES))
+        self.assertEqual(a.leader.name, "Grok@a")
+        self.assertEqual(a.leader.display_name, "Grok")
+
+        replies = {}
+        for session in (a, b):
+            mock_steps(session.leader, delay=0.2)
+            self.kernel.event_bus.register_actor(f"req-{session.conversation_id}", asyncio.Queue())
+            session.begin_request(session.conversation_id)
+
+        started = time.monotonic()
+        for session in (a, b):
+            await session.leader.inbox.put({"type": "TaskSubmitted", "from": f"req-{session.conversation_id}",
+                                            "correlation_id": session.conversation_id, "content": "hi"})
+        for session in (a, b):
+            queue = self.kernel.event_bus._actor_inboxes[f"req-{session.conversation_id}"]
+            replies[session.conversation_id] = await asyncio.wait_for(queue.get(), timeout=1)
+        self.assertLess(time.monotonic() - started, 0.35)
+
+        self.assertEqual(replies["a"]["content"], "answer from Grok@a")
+        self.assertEqual(replies["b"]["content"], "answer from Grok@b")
+        self.assertEqual(len(a.leader.messages), 3)
+        self.assertEqual(len(b.leader.messages), 3)
+
+    async def test_plain_names_resolve_within_the_session(self):
+        a = await self.kernel.open_session("a")
+        await self.kernel.open_session("b")
+        harper = a.actors["Harper"]
+        mock_steps(harper)
+        mock_steps(a.leader)
+
+        await a.leader.send("Harper", {"type": "TaskSubmitted", "content": "help", "correlation_id": "x"})
+        await asyncio.sleep(0.1)
+        self.assertIn({"role": "user", "content": "[Message from Grok]: help"}, harper.messages)
+        self.assertEqual(len(self.kernel.sessions["b"].actors["Harper"].messages), 1)
+
+        listed = self.kernel._execute_inline_system_call("list_agents", {}, sender="Grok@a")
+        self.assertEqual(sorted(json.loads(listed)), sorted(ALL_AGENT_NAMES))
+        result = self.kernel._execute_inline_system_call("allocate_budget", {"agent_name": "Harper", "amount": 3}, sender="Grok@a")
+        self.assertEqual(result, "Allocated 3 budget to Harper")
+        await asyncio.sleep(0.01)
+        self.assertEqual(harper.budget, 13)
+
+    async def test_request_scoped_temperature(self):
+        session = await self.kernel.open_session("a")
+        leader = session.leader
+        mock_steps(leader)
+        default = leader.temperature
+
+        session.begin_request("r1", {"temperatures": {"Grok": 0.1}})
+        await leader.inbox.put({"type": "TaskSubmitted", "correlation_id": "r1", "content": "one"})
+        await asyncio.sleep(0.1)
+        session.end_request("r1")
+        await leader.inbox.put({"type": "TaskSubmitted", "correlation_id": "r2", "content": "two"})
+        await asyncio.sleep(0.1)
+
+        self.assertEqual(leader.calls, [0.1, default])
+        self.assertEqual(leader.temperature, default)
+
+    async def test_idle_sessions_are_evicted(self):
+        session = await self.kernel.open_session("a")
+        session.begin_request("r1")
+        self.assertEqual(await self.kernel.evict_idle_sessions(idle_ttl=0), [])
+
+        session.end_request("r1")
+        self.assertEqual(await self.kernel.evict_idle_sessions(idle_ttl=0), ["a"])
+        self.assertNotIn("a", self.kernel.sessions)
+        self.assertNotIn("Grok@a", self.kernel.actors)
+        self.assertFalse(self.kernel.event_bus.is_registered("Grok@a"))
+
+        # Re-opening builds a fresh team
+        fresh = await self.kernel.open_session("a")
+        self.assertIsNot(fresh, session)
+        self.assertTrue(self.kernel.event_bus.is_registered("Grok@a"))
+
+
+if __name__ == "__main__":
+    unittest.main()
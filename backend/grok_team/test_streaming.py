@@ -0,0 +1,134 @@
+import unittest
+import asyncio
+from types import SimpleNamespace as NS
+from grok_team.agent import Agent
+from grok_team.event_bus import EventBus
+from grok_team.kernel import Kernel
+from grok_team.mailbox import Mailbox
+from grok_team.server import _sse_lane
+
+
+def chunk(content=None, tool_calls=None):
+    return NS(choices=[NS(delta=NS(content=content, tool_calls=tool_calls))])
+
+
+def tool_piece(index, id=None, name=None, arguments=None):
+    return NS(index=index, id=id, function=NS(name=name, arguments=arguments))
+
+
+class FakeStream:
+    def __init__(self, chunks, delay=0):
+        self.chunks = chunks
+        self.delay = delay
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        for item in self.chunks:
+            await asyncio.sleep(self.delay)
+            yield item
+
+
+class FakeClient:
+    def __init__(self, chunks, delay=0):
+        self.requests = []
+        self.chat = NS(completions=NS(create=self.create))
+        self.chunks = chunks
+        self.delay = delay
+
+    async def create(self, **request):
+        self.requests.append(request)
+        return FakeStream(self.chunks, self.delay)
+
+
+class TestStreamingCompletions(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.bus = EventBus()
+        self.agent = Agent("Grok", self.bus, system_prompt="test")
+        self.agent.step_correlation_id = "req_1"
+        self.deltas = []
+
+        async def on_delta(event):
+            self.deltas.append(event["content"])
+        self.bus.subscribe("AssistantDelta", on_delta, correlation_id="req_1")
+
+    async def test_content_and_tool_calls_are_assembled(self):
+        self.agent.client = FakeClient([
+            chunk("Let me "),
+            chunk("check."),
+            chunk(tool_calls=[tool_piece(0, id="call_a", name="web_search", arguments='{"qu')]),
+            chunk(tool_calls=[tool_piece(1, id="call_b", name="python_run", arguments="{}")]),
+            chunk(tool_calls=[tool_piece(0, arguments='ery": "x"}')]),
+        ])
+        message = await self.agent.step()
+        await self.bus.drain()
+
+        self.assertTrue(self.agent.client.requests[0]["stream"])
+        self.assertEqual(self.agent.client.requests[0]["stream_options"], {"include_usage": True})
+        self.assertEqual(self.deltas, ["Let me ", "check."])
+        self.assertEqual(message["content"], "Let me check.")
+        self.assertEqual(message["tool_calls"], [
+            {"id": "call_a", "type": "function", "function": {"name": "web_search", "arguments": '{"query": "x"}'}},
+            {"id": "call_b", "type": "function", "function": {"name": "python_run", "arguments": "{}"}},
+        ])
+        self.assertIs(self.agent.messages[-1], message)
+
+    async def test_complete_calls_start_while_streaming(self):
+        self.agent.client = FakeClient([
+            chunk(tool_calls=[tool_piece(0, id="call_a", name="web_search", arguments='{"query": "a }')]),
+            chunk(tool_calls=[tool_piece(0, arguments='{"}')]),
+            chunk(tool_calls=[tool_piece(1, id="call_b", name="web_search", arguments='{"query": ')]),
+            chunk(tool_calls=[tool_piece(1, arguments='"b"}')]),
+            chunk("done"),
+        ], delay=0.05)
+        started = {}
+
+        async def fake_tool(tool_call, correlation_id):
+            started[tool_call["id"]] = asyncio.get_running_loop().time()
+            self.agent.add_tool_call_result(tool_call["id"], tool_call["function"]["arguments"], "web_search")
+            return True
+
+        self.agent._execute_tool = fake_tool
+        message = await self.agent.step()
+        finished = asyncio.get_running_loop().time()
+        # The first call ran before the model had produced the rest of the response
+        self.assertEqual(set(started), {"call_a", "call_b"})
+        self.assertLess(started["call_a"], finished - 0.1)
+
+        self.assertTrue(await self.agent._execute_tools(message["tool_calls"], "req_1"))
+        self.assertEqual(len(started), 2)  # not executed a second time
+        results = [(m["tool_call_id"], m["content"]) for m in self.agent.messages if m["role"] == "tool"]
+        self.assertEqual(results, [("call_a", '{"query": "a }{"}'), ("call_b", '{"query": "b"}')])
+
+    async def test_usage_from_the_final_chunk_is_reported(self):
+        self.agent.client = FakeClient([chunk("hi"), NS(choices=[], usage=NS(total_tokens=42))])
+        completion = await self.agent._streamed_completion({"stream": True})
+        self.assertEqual(completion.message, {"role": "assistant", "content": "hi"})
+        self.assertEqual(completion.usage.total_tokens, 42)
+
+    async def test_answer_is_never_shed_by_the_sse_queue(self):
+        queue = Mailbox(maxsize=2, policy="drop_oldest", lane_of=_sse_lane)
+        for i in range(5):
+            await queue.put({"type": "ToolUse", "tool": f"t{i}"})
+            await queue.put({"type": "AssistantDelta", "content": f"d{i}"})
+        await queue.put({"type": "TaskCompleted", "content": "d0d1d2d3d4"})
+        received = [queue.get_nowait() for _ in range(queue.qsize())]
+        self.assertEqual([e["content"] for e in received if e["type"] != "ToolUse"],
+                         ["d0", "d1", "d2", "d3", "d4", "d0d1d2d3d4"])
+        self.assertEqual(len([e for e in received if e["type"] == "ToolUse"]), 2)
+
+    async def test_deltas_are_not_logged(self):
+        kernel = Kernel()
+        logged = []
+
+        async def log_event(event):
+            logged.append(event["type"])
+        kernel.event_logger.log_event = log_event
+        await kernel._handle_global_logging({"type": "AssistantDelta", "content": "x"})
+        await kernel._handle_global_logging({"type": "TaskCompleted", "content": "x"})
+        self.assertEqual(logged, ["TaskCompleted"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+import asyncio
+import time
+from unittest.mock import patch
+from grok_team.kernel import Kernel
+from grok_team.agent import Agent
+from grok_team.supervisor import Supervisor, TEMPORARY
+
+
+class FlakyAgent(Agent):
+    """Crashes on the first `crashes` messages after scribbling on its memory."""
+
+    def __init__(self, *args, crashes=1, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.crashes = crashes
+
+    async def handle_message(self, message):
+        self.messages.append({"role": "user", "content": "half-done"})
+        self.budget -= 1
+        if self.crashes > 0:
+            self.crashes -= 1
+            raise RuntimeError("boom")
+        self.messages[-1] = {"role": "user", "content": message["content"]}
+        await self.send(message["from"], {"type": "TaskCompleted", "content": "ok",
+                                          "correlation_id": message.get("correlation_id")})
+
+
+class TestSupervisorPolicy(unittest.TestCase):
+    def test_backoff_and_restart_intensity(self):
+        supervisor = Supervisor(max_restarts=3, window=60, backoff_base=0.1, backoff_max=0.3)
+        self.assertEqual([supervisor.restart_delay("a") for _ in range(4)], [0.1, 0.2, 0.3, None])
+        self.assertEqual(supervisor.restart_delay("b"), 0.1)
+        with patch("grok_team.supervisor.time.monotonic", return_value=time.monotonic() + 61):
+            self.assertEqual(supervisor.restart_delay("a"), 0.1)
+        self.assertIsNone(Supervisor(strategy=TEMPORARY).restart_delay("a"))
+
+
+class TestSupervisedRestart(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.kernel = Kernel()
+        self.requester = asyncio.Queue()
+        self.kernel.event_bus.register_actor("req", self.requester)
+
+    async def asyncTearDown(self):
+        await self.kernel.stop()
+
+    async def start_agent(self, crashes):
+        agent = FlakyAgent("Flaky", self.kernel.event_bus, crashes=crashes)
+        self.kernel.register_actor(agent)
+        await self.kernel.start()
+        await asyncio.sleep(0)
+        return agent
+
+    async def test_restart_from_checkpoint_and_redeliver(self):
+        agent = await self.start_agent(crashes=1)
+        before = list(agent.messages)
+        budget = agent.budget
+
+        started = time.monotonic()
+        await agent.inbox.put({"type": "TaskSubmitted", "from": "req", "correlation_id": "c1", "content": "hello"})
+        reply = await asyncio.wait_for(self.requester.get(), timeout=1)
+        self.assertLess(time.monotonic() - started, 0.5)
+
+        self.assertEqual(reply["type"], "TaskCompleted")
+        # The crashed attempt left no trace; the redelivered one did its work once
+        self.assertEqual(agent.messages, before + [{"role": "user", "content": "hello"}])
+        self.assertEqual(agent.budget, budget - 1)
+        self.assertIs(self.kernel.actors["Flaky"], agent)
+        self.assertFalse(self.kernel.tasks["Flaky"].done())
+
+    async def test_poison_message_fails_instead_of_hanging(self):
+        agent = await self.start_agent(crashes=2)
+        await agent.inbox.put({"type": "TaskSubmitted", "from": "req", "correlation_id": "c1", "content": "hello"})
+        reply = await asyncio.wait_for(self.requester.get(), timeout=1)
+        self.assertEqual(reply["type"], "TaskFailed")
+        self.assertEqual(reply["correlation_id"], "c1")
+
+        # The actor itself is back and serves the next message
+        await agent.inbox.put({"type": "TaskSubmitted", "from": "req", "correlation_id": "c2", "content": "again"})
+        reply = await asyncio.wait_for(self.requester.get(), timeout=1)
+        self.assertEqual(reply["type"], "TaskCompleted")
+
+    async def test_redelivery_keeps_its_place_in_the_queue(self):
+        agent = await self.start_agent(crashes=1)
+        await agent.inbox.put({"type": "TaskSubmitted", "from": "req", "correlation_id": "c1", "content": "first"})
+        await agent.inbox.put({"type": "TaskSubmitted", "from": "req", "correlation_id": "c2", "content": "second"})
+        replies = [await asyncio.wait_for(self.requester.get(), timeout=1) for _ in range(2)]
+        self.assertEqual([reply["correlation_id"] for reply in replies], ["c1", "c2"])
+
+    async def test_removed_actor_starts_with_a_fresh_restart_budget(self):
+        agent = await self.start_agent(crashes=1)
+        await agent.inbox.put({"type": "TaskSubmitted", "from": "req", "correlation_id": "c1", "content": "hello"})
+        await asyncio.wait_for(self.requester.get(), timeout=1)
+        self.assertIn("Flaky", self.kernel.supervisor._restarts)
+
+        await self.kernel._remove_actor(agent)
+        self.assertNotIn("Flaky", self.kernel.supervisor._restarts)
+
+
+if __name__ == "__main__":
+    unittest.main()
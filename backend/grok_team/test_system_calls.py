@@ -64,5 +64,67 @@ class TestSystemCalls(unittest.IsolatedAsyncioTestCase):
         agent = self.kernel.actors["DynamicAgent"]
         self.assertEqual(agent.temperature, 0.5)
 
+    async def test_inline_system_call_skips_bus(self):
+        seen = []
+
+        async def on_system_call(event):
+            seen.append(event)
+
+        self.bus.subscribe("SystemCall", on_system_call)
+        manager = Agent("Manager", self.bus)
+        self.kernel.register_actor(manager)
+
+        result = await self.bus.request({
+            "type": "SystemCall",
+            "command": "list_agents",
+            "args": {},
+            "sender": "Manager",
+        }, timeout=1)
+
+        self.assertEqual(result, '["Manager"]')
+        self.assertEqual(seen, [])
+
+    async def test_request_reply_for_spawn(self):
+        result = await self.bus.request({
+            "type": "SystemCall",
+            "command": "spawn_agent",
+            "args": {"name": "Replied", "system_prompt": "Hi"},
+            "sender": "Manager",
+        }, timeout=1)
+
+        self.assertEqual(result, "Spawned")
+        self.assertIn("Replied", self.kernel.actors)
+
+    async def test_agent_continues_same_loop_after_system_call(self):
+        agent = Agent("Leader", self.bus)
+        self.kernel.register_actor(agent)
+        steps = []
+
+        async def mock_step(ctx=None):
+            steps.append(len(agent.messages))
+            if len(steps) == 1:
+                msg = {"role": "assistant", "tool_calls": [
+                    {"id": "call_1", "type": "function",
+                     "function": {"name": "list_agents", "arguments": "{}"}}
+                ]}
+            else:
+                msg = {"role": "assistant", "content": "done"}
+            agent.messages.append(msg)
+            return msg
+
+        agent.step = mock_step
+        await agent._run_step_loop(None)
+
+        self.assertEqual(len(steps), 2)
+        self.assertEqual(agent.messages[2]["role"], "tool")
+        self.assertEqual(agent.messages[2]["content"], '["Leader"]')
+
+    async def test_request_times_out_without_reply(self):
+        bus = EventBus()
+        with self.assertRaises(asyncio.TimeoutError):
+            await bus.request({"type": "Nobody"}, timeout=0.05)
+        self.assertEqual(bus._pending_replies, {})
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+import asyncio
+import sys
+import time
+from grok_team.kernel import Kernel
+from grok_team.timers import TimerWheel
+from grok_team.tools import start_process, stop_process
+
+
+class TestTimerWheel(unittest.IsolatedAsyncioTestCase):
+    async def test_fires_in_order_and_cancels(self):
+        wheel = TimerWheel(tick=0.01, slots=8)  # 0.08s per revolution
+        fired = []
+        started = time.monotonic()
+        wheel.call_later(0.15, lambda: fired.append(("late", time.monotonic() - started)))
+        wheel.call_later(0.02, lambda: fired.append(("early", time.monotonic() - started)))
+        wheel.call_later(0.05, fired.append, "cancelled").cancel()
+        self.assertEqual(len(wheel), 3)
+
+        await asyncio.sleep(0.25)
+        self.assertEqual([name for name, _ in fired], ["early", "late"])
+        self.assertGreaterEqual(fired[1][1], 0.15)  # multi-round timers wait out their rounds
+        self.assertEqual(len(wheel), 0)
+        wheel.stop()
+
+
+class TestWakeUps(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.kernel = Kernel()
+        self.inbox = asyncio.Queue()
+        self.kernel.event_bus.register_actor("Watcher", self.inbox)
+        self.pids = []
+
+    async def asyncTearDown(self):
+        for pid in self.pids:
+            await stop_process(pid)
+        await self.kernel.stop()
+
+    async def start(self, code):
+        result = await start_process(f'exec {sys.executable} -u -c "{code}"')
+        pid = int(result.rsplit(" ", 1)[1])
+        self.pids.append(pid)
+        return pid
+
+    async def test_timer_wakeup(self):
+        reply = self.kernel.schedule_wakeup("Watcher", {"seconds": 0.05, "reply_to": "Grok"}, "c1")
+        self.assertEqual(reply, "Sleeping for 0.05s.")
+        wake = await asyncio.wait_for(self.inbox.get(), timeout=1)
+        self.assertEqual((wake["type"], wake["reason"], wake["reply_to"], wake["correlation_id"]),
+                         ("WakeUp", "timer", "Grok", "c1"))
+
+    async def test_wait_system_call_keeps_the_correlation_id(self):
+        await self.kernel._handle_system_call({"type": "SystemCall", "command": "wait", "args": {"seconds": 0.05},
+                                               "sender": "Watcher", "correlation_id": "c2"})
+        events = [await asyncio.wait_for(self.inbox.get(), timeout=1) for _ in range(2)]
+        wake = next(event for event in events if event["type"] == "WakeUp")
+        self.assertEqual(wake["correlation_id"], "c2")
+
+    async def test_wake_on_log_pattern_then_exit(self):
+        pid = await self.start("import time; time.sleep(0.2); print('listening on 8000'); time.sleep(0.2)")
+        self.assertIn("Watching", self.kernel.schedule_wakeup("Watcher", {"pid": pid, "pattern": r"listening on \d+"}))
+        wake = await asyncio.wait_for(self.inbox.get(), timeout=2)
+        self.assertEqual(wake["reason"], "pattern matched")
+        self.assertIn("listening on 8000", wake["content"])
+
+        self.kernel.schedule_wakeup("Watcher", {"pid": pid})
+        wake = await asyncio.wait_for(self.inbox.get(), timeout=2)
+        self.assertEqual(wake["reason"], "process exited")
+        self.assertIn("exited with code 0", wake["content"])
+
+    async def test_watch_timeout(self):
+        pid = await self.start("import time; time.sleep(5)")
+        self.kernel.schedule_wakeup("Watcher", {"pid": pid, "pattern": "never", "timeout": 0.1})
+        wake = await asyncio.wait_for(self.inbox.get(), timeout=1)
+        self.assertEqual(wake["reason"], "timeout")
+        self.assertTrue(self.inbox.empty())
+
+    async def test_invalid_requests(self):
+        self.assertTrue(self.kernel.schedule_wakeup("Watcher", {}).startswith("Error"))
+        self.assertEqual(self.kernel.schedule_wakeup("Watcher", {"pid": -1}), "Error: PID not found.")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+"""
+Hashed timer wheel for kernel wake-ups.
+
+Timers are bucketed by tick into a fixed ring of slots; a single driver task
+advances one slot per tick and fires the due timers, so scheduling and
+cancelling are O(1) however many agents are sleeping. Timers further away
+than one revolution wait out the extra `rounds`. The driver only runs while
+timers are pending.
+"""
+import asyncio
+import logging
+import math
+from typing import Any, Callable, List, Optional
+
+from grok_team.config import TIMER_TICK, TIMER_SLOTS
+
+logger = logging.getLogger(__name__)
+
+
+class TimerHandle:
+    __slots__ = ("callback", "args", "rounds", "cancelled")
+
+    def __init__(self, callback: Callable[..., Any], args: tuple, rounds: int):
+        self.callback = callback
+        self.args = args
+        self.rounds = rounds
+        self.cancelled = False
+
+    def cancel(self):
+        """Cancelled timers are dropped lazily when their slot comes around."""
+        self.cancelled = True
+
+
+class TimerWheel:
+    def __init__(self, tick: float = TIMER_TICK, slots: int = TIMER_SLOTS):
+        self.tick = tick
+        self._slots: List[List[TimerHandle]] = [[] for _ in range(slots)]
+        self._cursor = 0
+        self._pending = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return self._pending
+
+    def call_later(self, delay: float, callback: Callable[..., Any], *args: Any) -> TimerHandle:
+        """Calls `callback(*args)` after `delay` seconds (rounded up to the next tick)."""
+        ticks = max(1, math.ceil(delay / self.tick))
+        slots = len(self._slots)
+        handle = TimerHandle(callback, args, (ticks - 1) // slots)
+        self._slots[(self._cursor + ticks) % slots].append(handle)
+        self._pending += 1
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="TimerWheel")
+        return handle
+
+    def stop(self):
+        """Cancels the driver and every pending timer."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for slot in self._slots:
+            slot.clear()
+        self._pending = 0
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time() + self.tick
+        while self._pending:
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+            # Catch up on every tick that elapsed (the loop may have been busy)
+            while next_tick <= loop.time() and self._pending:
+                next_tick += self.tick
+                self._advance()
+
+    def _advance(self):
+        self._cursor = (self._cursor + 1) % len(self._slots)
+        due, waiting = [], []
+        for handle in self._slots[self._cursor]:
+            if handle.cancelled:
+                self._pending -= 1
+            elif handle.rounds > 0:
+                handle.rounds -= 1
+                waiting.append(handle)
+            else:
+                self._pending -= 1
+                due.append(handle)
+        self._slots[self._cursor] = waiting
+        for handle in due:
+            try:
+                handle.callback(*handle.args)
+            except Exception as e:
+                logger.error(f"Timer callback failed: {e}")
@@ -0,0 +1,115 @@
+"""
+Token accounting for agent contexts.
+
+Messages are counted once: `counted()` wraps a message in a `CountedMessage`,
+a plain dict to the API and to JSON that also remembers its token estimate.
+The tokenizer is pluggable (`set_tokenizer`, or TOKENIZER=tiktoken when that
+package is installed); the default is an offline approximation. Counts cached
+before a tokenizer change keep their old value.
+"""
+import json
+import logging
+from typing import Any, Callable, Dict, Iterable, Mapping
+
+from grok_team.config import TOKENIZER, MODEL_CONTEXT_WINDOW, OPENAI_MODEL_NAME
+
+logger = logging.getLogger(__name__)
+
+# Per-message framing (role, separators) added by chat formats
+MESSAGE_OVERHEAD = 4
+
+# Context windows by model name prefix (longest match wins)
+CONTEXT_WINDOWS: Dict[str, int] = {
+    "gpt-3.5-turbo": 16385,
+    "gpt-4": 8192,
+    "gpt-4-32k": 32768,
+    "gpt-4-turbo": 128000,
+    "gpt-4-1106": 128000,
+    "gpt-4-0125": 128000,
+    "gpt-4o": 128000,
+    "gpt-4.1": 1047576,
+    "o1": 200000,
+    "o3": 200000,
+    "o4": 200000,
+    "grok": 131072,
+}
+DEFAULT_CONTEXT_WINDOW = 128000
+
+
+def approximate_tokens(text: str) -> int:
+    """Offline estimate: ~4 characters per token for ASCII text, ~2 for other scripts."""
+    if not text:
+        return 0
+    non_ascii = len(text) - len(text.encode("ascii", "ignore"))
+    return (len(text) - non_ascii + 3) // 4 + (non_ascii + 1) // 2
+
+
+def _tiktoken_counter() -> Callable[[str], int]:
+    try:
+        import tiktoken
+    except ImportError:
+        logger.warning("TOKENIZER=tiktoken but tiktoken is not installed; using the approximation.")
+        return approximate_tokens
+    try:
+        encoding = tiktoken.encoding_for_model(OPENAI_MODEL_NAME)
+    except KeyError:
+        encoding = tiktoken.get_encoding("cl100k_base")
+    return lambda text: len(encoding.encode(text, disallowed_special=())) if text else 0
+
+
+_count_text: Callable[[str], int] = _tiktoken_counter() if TOKENIZER == "tiktoken" else approximate_tokens
+
+
+def set_tokenizer(counter: Callable[[str], int]):
+    """Replaces the text token counter (e.g. with a provider's tokenizer)."""
+    global _count_text
+    _count_text = counter
+
+
+def count_tokens(text: str) -> int:
+    return _count_text(text)
+
+
+def context_window(model: str = OPENAI_MODEL_NAME) -> int:
+    """Context window of `model`: MODEL_CONTEXT_WINDOW if set, else by name."""
+    if MODEL_CONTEXT_WINDOW:
+        return MODEL_CONTEXT_WINDOW
+    matches = [prefix for prefix in CONTEXT_WINDOWS if model.startswith(prefix)]
+    return CONTEXT_WINDOWS[max(matches, key=len)] if matches else DEFAULT_CONTEXT_WINDOW
+
+
+class CountedMessage(dict):
+    """A chat message that remembers its token count. Must not be mutated once counted."""
+    __slots__ = ("tokens",)
+
+
+def _measure(message: Mapping[str, Any]) -> int:
+    tokens = MESSAGE_OVERHEAD + count_tokens(str(message.get("content") or ""))
+    for call in message.get("tool_calls") or []:
+        function = call.get("function", {})
+        tokens += MESSAGE_OVERHEAD + count_tokens(function.get("name") or "") + count_tokens(function.get("arguments") or "")
+    return tokens
+
+
+def counted(message: Mapping[str, Any]) -> CountedMessage:
+    """`message` as a CountedMessage, counting it if it is not one already."""
+    if isinstance(message, CountedMessage):
+        return message
+    wrapped = CountedMessage(message)
+    wrapped.tokens = _measure(wrapped)
+    return wrapped
+
+
+def message_tokens(message: Mapping[str, Any]) -> int:
+    if isinstance(message, CountedMessage):
+        return message.tokens
+    return _measure(message)
+
+
+def messages_tokens(messages: Iterable[Mapping[str, Any]]) -> int:
+    return sum(message_tokens(m) for m in messages)
+
+
+def json_tokens(value: Any) -> int:
+    """Tokens of a JSON payload such as a tool schema."""
+    return count_tokens(json.dumps(value, ensure_ascii=False, default=str))
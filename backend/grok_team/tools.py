@@ -1,13 +1,16 @@
 
 import asyncio
 import json
+import logging
 import pkgutil
 import subprocess
 import sys
-from typing import List, Union, Dict, Any
+from typing import Any, Callable, Dict, List, Optional, Union
 
 import aiohttp
 
+logger = logging.getLogger(__name__)
+
 # Tool Definitions as Dictionaries (compatible with OpenAI function calling)
 # Correct format: {"type": "function", "function": {...}}
 
@@ -36,10 +39,20 @@ CHATROOM_SEND_FUNCTION = {
 
 WAIT_FUNCTION = {
     "name": "wait",
-    "description": "No-op waiting signal. Use when you are waiting for teammate replies; it does not execute work.",
+    "description": (
+        "Pause without spending steps. Without arguments: end your turn and wait for teammate replies. "
+        "With `seconds`: sleep that long. With `pid`: sleep until the background process exits or, with "
+        "`pattern`, until it prints a line matching the regex (`timeout` caps the wait). "
+        "You are woken up with the relevant output; do not poll read_process_logs instead."
+    ),
     "parameters": {
         "type": "object",
-        "properties": {},
+        "properties": {
+            "seconds": {"type": "number", "description": "Sleep for this many seconds."},
+            "pid": {"type": "integer", "description": "Background process to watch (from start_process)."},
+            "pattern": {"type": "string", "description": "Regex; wake up when a log line of `pid` matches it."},
+            "timeout": {"type": "number", "description": "Give up waiting on `pid` after this many seconds."}
+        },
         "additionalProperties": False
     }
 }
@@ -192,7 +205,7 @@ ALL_TOOLS = [
 ]
 
 # Background Process Registry
-# Format: {pid: {"proc": Process, "logs": List[str], "task": Task, "command": str}}
+# Format: {pid: {"proc": Process, "logs": List[str], "task": Task, "command": str, "watchers": List[Callable]}}
 PROCESS_REGISTRY: Dict[int, Dict[str, Any]] = {}
 
 START_PROCESS_FUNCTION = {
@@ -235,7 +248,8 @@ STOP_PROCESS_FUNCTION = {
 ALL_TOOLS.extend([
     {"type": "function", "function": START_PROCESS_FUNCTION},
     {"type": "function", "function": READ_LOGS_FUNCTION},
-    {"type": "function", "function": STOP_PROCESS_FUNCTION}
+    {"type": "function", "function": STOP_PROCESS_FUNCTION},
+    {"type": "function", "function": WAIT_FUNCTION}
 ])
 
 SYSTEM_TOOL_NAMES = {"spawn_agent", "kill_agent", "list_agents", "allocate_budget"}
@@ -283,6 +297,7 @@ async def _log_reader(pid: int):
             decoded = line.decode().strip()
             if decoded:
                 entry["logs"].append(f"[{prefix}] {decoded}")
+                _notify_watchers(entry, "line", decoded)
                 # Keep log size manageable
                 if len(entry["logs"]) > 1000:
                     entry["logs"] = entry["logs"][-1000:]
@@ -293,6 +308,32 @@ async def _log_reader(pid: int):
     )
     await proc.wait()
     entry["logs"].append(f"[SYSTEM] Process exited with code {proc.returncode}")
+    _notify_watchers(entry, "exit", str(proc.returncode))
+
+
+def _notify_watchers(entry: Dict[str, Any], kind: str, text: str):
+    for watcher in list(entry["watchers"]):
+        try:
+            watcher(kind, text)
+        except Exception as e:
+            logger.error(f"Process watcher failed: {e}")
+
+
+def watch_process(pid: int, watcher: Callable[[str, str], Any]) -> Optional[Callable[[], None]]:
+    """
+    Calls `watcher("line", text)` for every new log line of `pid` and
+    `watcher("exit", returncode)` when it exits. Returns a function that removes
+    the watcher, or None if the PID is unknown.
+    """
+    entry = PROCESS_REGISTRY.get(pid)
+    if entry is None:
+        return None
+    entry["watchers"].append(watcher)
+
+    def unwatch():
+        if watcher in entry["watchers"]:
+            entry["watchers"].remove(watcher)
+    return unwatch
 
 async def start_process(command: str) -> str:
     """Starts a background process."""
@@ -308,6 +349,7 @@ async def start_process(command: str) -> str:
             "proc": proc,
             "logs": [],
             "command": command,
+            "watchers": [],
             "task": None # Set below
         }
         
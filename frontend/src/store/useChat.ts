@@ -8,6 +8,7 @@ export type StreamEventType =
   | "wait"
   | "guard_prompt"
   | "token"
+  | "replace"
   | "error"
   | "conversation"
   | "conversation_title"
@@ -240,6 +241,11 @@ const useChat = create<ChatState>((set, get) => ({
       return;
     }
 
+    if (type === "replace") {
+      set({ currentResponse: String(event.content ?? "") });
+      return;
+    }
+
     if (type === "error") {
       set({
         lastError: String(event.content ?? "Неизвестная ошибка потока"),